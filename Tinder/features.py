@@ -1,11 +1,14 @@
 # coding=utf-8
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
 from random import random
 from time import sleep
 
 import config
 import tinder_api as api
+from match_store import MatchStore
 
 
 '''
@@ -14,16 +17,60 @@ allows you to sort them by last_activity_date, age,
 gender, message count, and their average successRate.
 '''
 
+# Number of concurrent get_person lookups when enriching matches
+MAX_WORKERS = 8
+
+# Number of runs a match that fails to be stored is attempted before being skipped
+MAX_MATCH_ATTEMPTS = 3
+
+# Person profiles already fetched, keyed by person id
+person_cache = {}
+
+# Matches, messages and the /updates cursor are kept here between runs
+STORE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'matches.db')
+
+store = None
+
+
+def get_store():
+    '''
+    Returns the MatchStore, opening STORE_FILE on first use
+    '''
+    global store
+    if store is None:
+        store = MatchStore(STORE_FILE)
+    return store
+
 
 def get_match_info():
-    matches = api.get_updates()['matches']
-    now = datetime.utcnow()
-    match_info = {}
+    '''
+    Only the activity since the stored last_activity_date is requested from
+    /updates and merged into the local match store.
+    The stored cursor does not move past a match that failed to be stored,
+    so it is requested again on the next run. A match that still fails after
+    MAX_MATCH_ATTEMPTS runs is skipped and no longer holds the cursor back.
+    '''
+    store = get_store()
+    cursor = store.get_cursor()
+    updates = api.get_updates(cursor)
+    matches = updates.get('matches', [])
+    person_by_match_id = store.person_by_match_id()
+    distances = get_distances(
+        match['person']['_id'] for match in matches
+        if '_id' in match.get('person', {}) and 'distance_mi' not in match['person']
+        and match['id'] not in person_by_match_id
+    )
+    stored, stored_ids, failed = [], [], []
     for match in matches[:len(matches)]:
         try:
+            if match['id'] in person_by_match_id:
+                store.merge_match(match)
+                stored.append(match.get('last_activity_date') or '')
+                stored_ids.append(match['id'])
+                continue
             person = match['person']
             person_id = person['_id']  # This ID for looking up person
-            match_info[person_id] = {
+            store.save_match(person_id, {
                 "name": person['name'],
                 "match_id": match['id'],  # This ID for messaging
                 "message_count": match['message_count'],
@@ -33,27 +80,73 @@ def get_match_info():
                 "avg_successRate": get_avg_successRate(person),
                 "messages": match['messages'],
                 "age": calculate_age(match['person']['birth_date']),
-                "distance": api.get_person(person_id)['results']['distance_mi'],
+                "distance": person.get('distance_mi', distances.get(person_id)),
                 "last_activity_date": match['last_activity_date'],
-            }
+            })
+            stored.append(match.get('last_activity_date') or '')
+            stored_ids.append(match['id'])
         except Exception as ex:
             template = "An exception of type {0} occurred. Arguments:\n{1!r}"
             message = template.format(type(ex).__name__, ex.args)
             print(message)
-            # continue
+            last_activity_date = match.get('last_activity_date')
+            if 'id' not in match or not last_activity_date:
+                continue
+            if store.record_failure(match['id']) < MAX_MATCH_ATTEMPTS:
+                failed.append(last_activity_date)
+            else:
+                print("Skipping match %s after %d failed attempts" % (
+                    match['id'], MAX_MATCH_ATTEMPTS))
+    store.clear_failures(stored_ids)
+    for match_id in updates.get('blocks', []):
+        store.remove_match(match_id)
+    if failed:
+        first_failed = min(failed)
+        cursor = max([cursor] + [date for date in stored if date < first_failed])
+    else:
+        cursor = max([cursor] + stored + [updates.get('last_activity_date') or ''])
+    store.set_cursor(cursor)
     print("All data stored in variable: match_info")
-    return match_info
+    return store.match_info()
+
+
+def get_person_cached(person_id):
+    '''
+    Returns a person's profile, fetching it only once per session.
+    A failed lookup returns None, whatever the error.
+    '''
+    if person_id not in person_cache:
+        try:
+            person = api.get_person(person_id)
+            if not person or not isinstance(person.get('results'), dict):
+                return None
+        except Exception as ex:
+            print("Could not look up person %s: %r" % (person_id, ex))
+            return None
+        person_cache[person_id] = person['results']
+    return person_cache[person_id]
+
+
+def get_distances(person_ids, max_workers=MAX_WORKERS):
+    '''
+    Returns a dict of person_id -> distance_mi.
+    Each distinct person is fetched once, concurrently on a bounded
+    thread pool, and reused from person_cache afterwards.
+    '''
+    person_ids = set(person_ids)
+    if not person_ids:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(person_ids))) as pool:
+        people = dict(zip(person_ids, pool.map(get_person_cached, person_ids)))
+    return {person_id: person.get('distance_mi')
+            for person_id, person in people.items() if person}
 
 
 def get_match_id_by_name(name):
     '''
     Returns a list_of_ids that have the same name as your input
     '''
-    global match_info
-    list_of_ids = []
-    for match in match_info:
-        if match_info[match]['name'] == name:
-            list_of_ids.append(match_info[match]['match_id'])
+    list_of_ids = get_store().match_ids_by_name(name)
     if len(list_of_ids) > 0:
         return list_of_ids
     return {"error": "No matches by name of %s" % name}
@@ -99,10 +192,10 @@ def get_avg_successRate(person):
 def sort_by_value(sortType):
     '''
     Sort options are:
-        'age', 'message_count', 'gender'
+        'age', 'message_count', 'gender', 'last_activity_date',
+        'distance', 'avg_successRate', 'name'
     '''
-    global match_info
-    return sorted(match_info.items(), key=lambda x: x[1][sortType], reverse=True)
+    return get_store().sorted_by(sortType)
 
 
 def see_friends_profiles(name=None):
@@ -137,12 +230,9 @@ def get_last_activity_date(now, ping_time):
 
 
 def how_long_has_it_been():
-    global match_info
     now = datetime.utcnow()
     times = {}
-    for person in match_info:
-        name = match_info[person]['name']
-        ping_time = match_info[person]['last_activity_date']
+    for name, ping_time in get_store().last_activity_dates():
         since = get_last_activity_date(now, ping_time)
         times[name] = since
         print(name, "----->", since)
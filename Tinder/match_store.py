@@ -0,0 +1,179 @@
+# coding=utf-8
+
+import json
+import sqlite3
+
+
+'''
+This file keeps your matches, their persons and messages in a local
+sqlite database, so the data collected by features.py survives restarts
+and the usual queries (by name, sorted by age, message_count, ...) are
+answered from indexes instead of rescanning every match.
+'''
+
+# Columns that sort_by_value and MatchStore.sorted_by accept
+SORT_COLUMNS = ('name', 'age', 'gender', 'message_count',
+                'last_activity_date', 'distance', 'avg_successRate')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS matches (
+    person_id TEXT PRIMARY KEY,
+    match_id TEXT NOT NULL UNIQUE,
+    name TEXT,
+    age INTEGER,
+    gender INTEGER,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    last_activity_date TEXT,
+    distance REAL,
+    avg_successRate REAL,
+    bio TEXT,
+    photos TEXT NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS matches_name ON matches (name);
+CREATE INDEX IF NOT EXISTS matches_age ON matches (age);
+CREATE INDEX IF NOT EXISTS matches_gender ON matches (gender);
+CREATE INDEX IF NOT EXISTS matches_message_count ON matches (message_count);
+CREATE INDEX IF NOT EXISTS matches_last_activity_date ON matches (last_activity_date);
+CREATE TABLE IF NOT EXISTS messages (
+    message_id TEXT PRIMARY KEY,
+    match_id TEXT NOT NULL,
+    sent_date TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_match_id ON messages (match_id, sent_date);
+CREATE TABLE IF NOT EXISTS failures (
+    match_id TEXT PRIMARY KEY,
+    attempts INTEGER NOT NULL
+);
+'''
+
+MATCH_COLUMNS = ('person_id', 'match_id', 'name', 'age', 'gender', 'message_count',
+                 'last_activity_date', 'distance', 'avg_successRate', 'bio', 'photos')
+
+
+class MatchStore(object):
+    '''
+    sqlite store of matches (one row per person) and their messages
+    '''
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def get_cursor(self):
+        '''
+        Returns the last_activity_date to request /updates from
+        '''
+        row = self.db.execute(
+            "SELECT value FROM state WHERE key = 'last_activity_date'").fetchone()
+        return row['value'] if row else ''
+
+    def set_cursor(self, last_activity_date):
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO state VALUES ('last_activity_date', ?)",
+                (last_activity_date,))
+
+    def person_by_match_id(self):
+        '''
+        Returns a dict of match_id -> person_id for every stored match
+        '''
+        return dict(self.db.execute('SELECT match_id, person_id FROM matches'))
+
+    def save_match(self, person_id, info):
+        '''
+        Inserts or replaces a match, info has the shape of a match_info entry
+        '''
+        row = dict(info, person_id=person_id, photos=json.dumps(info.get('photos', [])))
+        with self.db:
+            self.db.execute(
+                'INSERT OR REPLACE INTO matches VALUES (%s)' % ', '.join('?' * len(MATCH_COLUMNS)),
+                [row.get(column) for column in MATCH_COLUMNS])
+            self._add_messages(info['match_id'], info.get('messages', []))
+
+    def merge_match(self, match):
+        '''
+        Merges an already known match from an /updates delta
+        '''
+        with self.db:
+            self._add_messages(match['id'], match.get('messages', []))
+            (stored,) = self.db.execute('SELECT COUNT(*) FROM messages WHERE match_id = ?',
+                                        (match['id'],)).fetchone()
+            self.db.execute(
+                'UPDATE matches SET message_count = ?, last_activity_date = ? WHERE match_id = ?',
+                (match.get('message_count', stored), match['last_activity_date'], match['id']))
+
+    def _add_messages(self, match_id, messages):
+        self.db.executemany(
+            'INSERT OR IGNORE INTO messages VALUES (?, ?, ?, ?)',
+            [(message['_id'], match_id, message.get('sent_date'), json.dumps(message))
+             for message in messages if '_id' in message])
+
+    def remove_match(self, match_id):
+        with self.db:
+            self.db.execute('DELETE FROM matches WHERE match_id = ?', (match_id,))
+            self.db.execute('DELETE FROM messages WHERE match_id = ?', (match_id,))
+            self.db.execute('DELETE FROM failures WHERE match_id = ?', (match_id,))
+
+    def record_failure(self, match_id):
+        '''
+        Counts a failed attempt to store a match, returns the number of attempts
+        '''
+        with self.db:
+            self.db.execute('INSERT OR IGNORE INTO failures VALUES (?, 0)', (match_id,))
+            self.db.execute(
+                'UPDATE failures SET attempts = attempts + 1 WHERE match_id = ?', (match_id,))
+        (attempts,) = self.db.execute(
+            'SELECT attempts FROM failures WHERE match_id = ?', (match_id,)).fetchone()
+        return attempts
+
+    def clear_failures(self, match_ids):
+        with self.db:
+            self.db.executemany('DELETE FROM failures WHERE match_id = ?',
+                                [(match_id,) for match_id in match_ids])
+
+    def get_messages(self, match_id):
+        return [json.loads(row['data']) for row in self.db.execute(
+            'SELECT data FROM messages WHERE match_id = ? ORDER BY sent_date', (match_id,))]
+
+    def _info(self, row):
+        info = dict(row)
+        person_id = info.pop('person_id')
+        info['photos'] = json.loads(info['photos'])
+        info['messages'] = self.get_messages(info['match_id'])
+        return person_id, info
+
+    def match_info(self):
+        '''
+        Returns every stored match as the person_id -> info dict of features.py
+        '''
+        return dict(self._info(row) for row in self.db.execute('SELECT * FROM matches'))
+
+    def match_ids_by_name(self, name):
+        return [row['match_id'] for row in self.db.execute(
+            'SELECT match_id FROM matches WHERE name = ?', (name,))]
+
+    def sorted_by(self, column, reverse=True):
+        '''
+        Returns (person_id, info) pairs ordered by one of SORT_COLUMNS
+        '''
+        if column not in SORT_COLUMNS:
+            raise ValueError('Cannot sort by %r, options are %s' % (column, SORT_COLUMNS))
+        rows = self.db.execute('SELECT * FROM matches ORDER BY %s %s' % (
+            column, 'DESC' if reverse else 'ASC')).fetchall()
+        return [self._info(row) for row in rows]
+
+    def last_activity_dates(self):
+        '''
+        Returns (name, last_activity_date) pairs, most recent first
+        '''
+        return [(row['name'], row['last_activity_date']) for row in self.db.execute(
+            'SELECT name, last_activity_date FROM matches ORDER BY last_activity_date DESC')]
@@ -0,0 +1,4 @@
+"""
+Offline benchmarks for the Tinder clients
+Run against benchmarks.mock_server, so no token or network access is needed.
+"""
@@ -0,0 +1,129 @@
+"""
+Client benchmark
+Measures throughput and p50/p99 latency of modules.api, AsyncTinderAPI and
+tinder.Client against the mock server.
+
+Run with: python -m benchmarks.bench_clients --requests 500 --concurrency 10
+"""
+
+import argparse
+import asyncio
+import logging
+from typing import List, Optional
+
+from .harness import Result, report, run_async, run_sync
+from .mock_server import MockTinderServer
+
+TOKEN = "benchmark-token"
+
+
+def bench_modules_api(url: str, requests: int, concurrency: int) -> List[Result]:
+    from modules import api
+    from modules.auth import set_auth_token
+    from modules.ratelimit import RateLimiter
+    from modules.transport import Transport, get_transport, set_transport
+
+    set_auth_token(TOKEN)
+    unlimited = RateLimiter(route_limits={})
+    previous = get_transport()
+    set_transport(Transport(base_url=url, rate_limiter=unlimited, backoff_base=0.01))
+    try:
+        return [
+            run_sync("modules.api get_profile", api.get_profile, requests, concurrency),
+            run_sync("modules.api recs", api.get_recommendations, requests, concurrency),
+            run_sync("modules.api like", lambda: api.like("5a1b2c3d"), requests, concurrency),
+        ]
+    finally:
+        set_transport(previous)
+
+
+async def bench_async_api(
+    url: str, requests: int, concurrency: int, http2: bool = False
+) -> List[Result]:
+    from modules.api_async import AsyncTinderAPI
+    from modules.ratelimit import RateLimiter
+
+    unlimited = RateLimiter(route_limits={})
+    async with AsyncTinderAPI(TOKEN, rate_limiter=unlimited, base_url=url, http2=http2) as client:
+        return [
+            await run_async(
+                "AsyncTinderAPI get_profile", client.get_profile, requests, concurrency
+            ),
+            await run_async(
+                "AsyncTinderAPI recs", client.get_recommendations, requests, concurrency
+            ),
+            await run_async(
+                "AsyncTinderAPI like", lambda: client.like("5a1b2c3d"), requests, concurrency
+            ),
+        ]
+
+
+async def bench_tinder_client(url: str, requests: int, concurrency: int) -> List[Result]:
+    from tinder.client import Client
+    from tinder.http import Route
+    from tinder.ratelimit import RateLimiter
+
+    base, Route.BASE = Route.BASE, url
+    client = Client(ratelimiter=RateLimiter(routes={}))
+    await client.login(TOKEN)
+    try:
+        return [
+            await run_async("tinder.Client profile", client.fetch_profile, requests, concurrency),
+            await run_async("tinder.Client recs", client.fetch_recs, requests, concurrency),
+            await run_async(
+                "tinder.Client like", lambda: client.http.like("5a1b2c3d"), requests, concurrency
+            ),
+        ]
+    finally:
+        await client.close()
+        Route.BASE = base
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the Tinder clients offline")
+    parser.add_argument("--requests", type=int, default=200, help="Calls per benchmark")
+    parser.add_argument("--concurrency", type=int, default=10, help="Calls in flight")
+    parser.add_argument("--latency", type=float, default=0.0, help="Server latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum extra latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of a 503")
+    parser.add_argument("--ratelimit-rate", type=float, default=0.0, help="Probability of a 429")
+    parser.add_argument(
+        "--http2", action="store_true", help="Let AsyncTinderAPI negotiate HTTP/2 (needs h2)"
+    )
+    parser.add_argument(
+        "--client",
+        action="append",
+        choices=["modules", "async", "tinder"],
+        help="Client to benchmark, may be repeated (default: all)",
+    )
+    args = parser.parse_args(argv)
+    clients = args.client or ["modules", "async", "tinder"]
+    # modules.api configures INFO logging, which would log every request
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    server = MockTinderServer(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        ratelimit_rate=args.ratelimit_rate,
+        retry_after=0.05,
+        seed=0,
+    )
+    url = server.start_in_thread()
+    results: List[Result] = []
+    try:
+        if "modules" in clients:
+            results += bench_modules_api(url, args.requests, args.concurrency)
+        if "async" in clients:
+            results += asyncio.run(
+                bench_async_api(url, args.requests, args.concurrency, args.http2)
+            )
+        if "tinder" in clients:
+            results += asyncio.run(bench_tinder_client(url, args.requests, args.concurrency))
+    finally:
+        server.stop_thread()
+    report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Gateway compression benchmark
+Compares bytes on the wire and CPU time of the keepalive gateway traffic
+without compression and with permessage-deflate at several window sizes.
+
+Frames are compressed the way permessage-deflate does it: raw deflate with a
+sync flush per message, the trailing 00 00 ff ff stripped, and the window
+shared across messages unless context takeover is disabled.
+
+Run with: python -m benchmarks.bench_gateway --frames 5000
+"""
+
+import argparse
+import random
+import time
+import zlib
+from typing import Callable, List, Optional, Tuple
+
+from tinder.gateway import HEARTBEAT, NewMatch, NewMessage, Typing, encode_event
+
+SYNC_FLUSH_TAIL = b"\x00\x00\xff\xff"
+
+
+def traffic(frames: int, matches: int = 20, seed: int = 0) -> List[bytes]:
+    """
+    Generate a gateway frame stream: mostly heartbeat acknowledgements and
+    message/typing notifications on a few active conversations
+
+    Args:
+        frames: Number of frames
+        matches: Number of active matches
+        seed: Random seed
+
+    Returns:
+        Encoded frames
+    """
+    rng = random.Random(seed)
+    me = "%024x" % rng.getrandbits(96)
+    people = ["%024x" % rng.getrandbits(96) for _ in range(matches)]
+    timestamp = 1_700_000_000_000
+    stream = []
+    for _ in range(frames):
+        timestamp += rng.randint(50, 5000)
+        person = rng.choice(people)
+        match_id = me + person
+        kind = rng.random()
+        if kind < 0.4:
+            stream.append(HEARTBEAT)
+        elif kind < 0.7:
+            stream.append(
+                encode_event(NewMessage(match_id, "%024x" % rng.getrandbits(96), timestamp))
+            )
+        elif kind < 0.95:
+            stream.append(encode_event(Typing(match_id, person, timestamp)))
+        else:
+            people.append("%024x" % rng.getrandbits(96))
+            stream.append(encode_event(NewMatch(me + people[-1], people[-1], timestamp)))
+    return stream
+
+
+def frame_header(size: int) -> int:
+    """Size of an unmasked server to client websocket frame header"""
+    return 2 if size < 126 else 4 if size < 1 << 16 else 10
+
+
+def deflater(wbits: int, takeover: bool) -> Callable[[bytes], bytes]:
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -wbits)
+
+    def deflate(data: bytes) -> bytes:
+        nonlocal compressor
+        if not takeover:
+            compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -wbits)
+        return (compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH))[:-4]
+
+    return deflate
+
+
+def inflater(wbits: int, takeover: bool) -> Callable[[bytes], bytes]:
+    decompressor = zlib.decompressobj(-wbits)
+
+    def inflate(data: bytes) -> bytes:
+        nonlocal decompressor
+        if not takeover:
+            decompressor = zlib.decompressobj(-wbits)
+        return decompressor.decompress(data + SYNC_FLUSH_TAIL)
+
+    return inflate
+
+
+def bench_mode(stream: List[bytes], wbits: int, takeover: bool = True) -> Tuple[int, float, float]:
+    """
+    Replay a frame stream through one compression setting
+
+    Args:
+        stream: Encoded frames
+        wbits: Window bits, 0 for no compression
+        takeover: Share the compression context across messages
+
+    Returns:
+        Bytes on the wire, deflate and inflate seconds per frame
+    """
+    if not wbits:
+        return sum(frame_header(len(frame)) + len(frame) for frame in stream), 0.0, 0.0
+    deflate, inflate = deflater(wbits, takeover), inflater(wbits, takeover)
+    started = time.perf_counter()
+    payloads = [deflate(frame) for frame in stream]
+    deflate_time = time.perf_counter() - started
+    started = time.perf_counter()
+    decoded = [inflate(payload) for payload in payloads]
+    inflate_time = time.perf_counter() - started
+    assert decoded == stream
+    wire = sum(frame_header(len(payload)) + len(payload) for payload in payloads)
+    return wire, deflate_time / len(stream), inflate_time / len(stream)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark gateway permessage-deflate")
+    parser.add_argument("--frames", type=int, default=5000, help="Frames in the replayed stream")
+    parser.add_argument("--matches", type=int, default=20, help="Active matches in the stream")
+    args = parser.parse_args(argv)
+
+    stream = traffic(args.frames, args.matches)
+    raw, _, _ = bench_mode(stream, 0)
+    print(f"{args.frames} frames, {sum(map(len, stream))} payload bytes")
+    print(f"{'mode':<28} {'wire bytes':>11} {'ratio':>7} {'deflate us':>11} {'inflate us':>11}")
+    print("-" * 72)
+    print(f"{'uncompressed':<28} {raw:>11} {1:>7.2f} {0:>11.2f} {0:>11.2f}")
+    for wbits, takeover in [(15, True), (12, True), (9, True), (15, False)]:
+        wire, deflate_time, inflate_time = bench_mode(stream, wbits, takeover)
+        name = f"deflate wbits={wbits}" + ("" if takeover else " no takeover")
+        print(
+            f"{name:<28} {wire:>11} {wire / raw:>7.2f} "
+            f"{deflate_time * 1e6:>11.2f} {inflate_time * 1e6:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+JSON codec benchmark
+Compares the available JSON codecs (stdlib json, orjson, msgspec) decoding and
+encoding v2 recommendation pages shaped like real /v2/recs/core responses.
+
+Run with: python -m benchmarks.bench_json --users 30 --repeat 2000
+"""
+
+import argparse
+from typing import Any, Dict, List, Optional
+
+from .harness import Result, report, run_sync
+from .mock_server import MockTinderServer
+
+
+def rec(server: MockTinderServer) -> Dict[str, Any]:
+    """Generate a v2 recommendation with the extra fields of a real response"""
+    user = server.user()
+    user.update(
+        {
+            "badges": [],
+            "jobs": [{"title": {"name": "Engineer"}, "company": {"name": "Mock Inc."}}],
+            "schools": [{"name": "Mock University"}],
+            "city": {"name": "Lisbon"},
+            "is_traveling": False,
+            "show_gender_on_profile": True,
+        }
+    )
+    return {
+        "type": "user",
+        "user": user,
+        "facebook": {"common_connections": [], "connection_count": 0, "common_interests": []},
+        "spotify": {"spotify_connected": False, "spotify_theme_track": None},
+        "distance_mi": user["distance_mi"],
+        "content_hash": server._id(),
+        "s_number": server.random.getrandbits(40),
+        "teaser": {"type": "school", "string": "Mock University"},
+        "teasers": [{"type": "school", "string": "Mock University"}],
+        "experiment_info": {"user_interests": {"selected_interests": []}},
+        "is_superlike_upsell": False,
+    }
+
+
+def rec_page(server: MockTinderServer, users: int) -> Dict[str, Any]:
+    """Generate a /v2/recs/core response body"""
+    return {"meta": {"status": 200}, "data": {"results": [rec(server) for _ in range(users)]}}
+
+
+def bench_codecs(page: Dict[str, Any], repeat: int) -> List[Result]:
+    from modules import codec
+
+    results = []
+    for name in codec.available_codecs():
+        selected = codec.set_codec(name)
+        body = selected.dumps(page)
+        results.append(run_sync(f"{name} decode", lambda: selected.loads(body), repeat))
+        results.append(run_sync(f"{name} encode", lambda: selected.dumps(page), repeat))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark JSON codecs on recommendation pages")
+    parser.add_argument("--users", type=int, default=30, help="Recommendations per page")
+    parser.add_argument("--repeat", type=int, default=2000, help="Pages decoded/encoded per codec")
+    args = parser.parse_args(argv)
+
+    from modules import codec
+
+    default = codec.get_codec()
+    page = rec_page(MockTinderServer(seed=0), args.users)
+    print(f"Page size: {len(codec.dumps(page))} bytes, {args.users} recommendations")
+    try:
+        report(bench_codecs(page, args.repeat))
+    finally:
+        codec.set_codec(default)
+
+
+if __name__ == "__main__":
+    main()
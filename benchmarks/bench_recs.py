@@ -0,0 +1,110 @@
+"""
+Recommendations benchmark
+Compares tinder.Client.fetch_recs (v1) with fetch_recs2 (v2 parser), both for
+model building alone and end to end against the mock server, and decoding a
+page into dicts against decoding it into typed payloads (CPU and peak memory).
+
+Run with: python -m benchmarks.bench_recs --users 30 --repeat 2000
+"""
+
+import argparse
+import asyncio
+import tracemalloc
+from typing import Callable, List, Optional
+
+from .bench_json import rec_page
+from .harness import Result, report, run_async, run_sync
+from .mock_server import MockTinderServer
+
+TOKEN = "benchmark-token"
+
+
+def bench_parsers(server: MockTinderServer, users: int, repeat: int) -> List[Result]:
+    from tinder.models import User
+    from tinder.state import ConnectionState
+
+    state = ConnectionState(dispatch=None, handlers={}, http=None, loop=None)
+    v1 = [server.user() for _ in range(users)]
+    v2 = [{"type": "user", "user": user, "distance_mi": user["distance_mi"]} for user in v1]
+    return [
+        run_sync("User(data) v1 page", lambda: [User(state, data=u) for u in v1], repeat),
+        run_sync("User(data) v2 page", lambda: [User(state, data=r["user"]) for r in v2], repeat),
+        run_sync("User._from_rec v2 page", lambda: [User._from_rec(state, r) for r in v2], repeat),
+    ]
+
+
+def peak_memory(call: Callable[[], object]) -> int:
+    """Peak bytes allocated by one call"""
+    tracemalloc.start()
+    try:
+        result = call()  # noqa: F841 - kept alive until the peak is read
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_decoding(server: MockTinderServer, users: int, repeat: int) -> List[Result]:
+    from tinder import codec, types
+    from tinder.models import User
+    from tinder.state import ConnectionState
+
+    state = ConnectionState(dispatch=None, handlers={}, http=None, loop=None)
+    body = codec.dumps(rec_page(server, users))
+
+    def dicts() -> List[User]:
+        results = codec.loads(body)["data"]["results"]
+        return [User._from_rec(state, rec) for rec in results]
+
+    def typed() -> List[User]:
+        page = types.decode(types.RecsPayload, body)
+        return [User._from_payload(state, rec.user, rec.distance_mi) for rec in page.data.results]
+
+    backend = "msgspec" if types.HAS_MSGSPEC else "fallback (Client keeps the dicts)"
+    print(f"{len(body)} byte page, payloads decoded with {backend}, codec {codec.get_codec().name}")
+    print(f"  peak memory dict tree:     {peak_memory(dicts) / 1024:8.1f} KiB")
+    print(f"  peak memory typed payload: {peak_memory(typed) / 1024:8.1f} KiB")
+    return [
+        run_sync("bytes -> dicts -> User", dicts, repeat),
+        run_sync("bytes -> payloads -> User", typed, repeat),
+    ]
+
+
+async def bench_fetch(url: str, requests: int, concurrency: int) -> List[Result]:
+    from tinder.client import Client
+    from tinder.http import Route
+    from tinder.ratelimit import RateLimiter
+
+    base, Route.BASE = Route.BASE, url
+    client = Client(ratelimiter=RateLimiter(routes={}))
+    await client.login(TOKEN)
+    try:
+        return [
+            await run_async("Client.fetch_recs", client.fetch_recs, requests, concurrency),
+            await run_async("Client.fetch_recs2", client.fetch_recs2, requests, concurrency),
+        ]
+    finally:
+        await client.close()
+        Route.BASE = base
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark v1 and v2 recommendations parsing")
+    parser.add_argument("--users", type=int, default=30, help="Users per page")
+    parser.add_argument("--repeat", type=int, default=2000, help="Parsed pages per parser")
+    parser.add_argument("--requests", type=int, default=200, help="Fetches per endpoint")
+    parser.add_argument("--concurrency", type=int, default=10, help="Fetches in flight")
+    args = parser.parse_args(argv)
+
+    server = MockTinderServer(recs_count=args.users, seed=0)
+    results = bench_parsers(server, args.users, args.repeat)
+    results += bench_decoding(server, args.users, args.repeat)
+    url = server.start_in_thread()
+    try:
+        results += asyncio.run(bench_fetch(url, args.requests, args.concurrency))
+    finally:
+        server.stop_thread()
+    report(results)
+
+
+if __name__ == "__main__":
+    main()
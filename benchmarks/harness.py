@@ -0,0 +1,125 @@
+"""
+Benchmark harness
+Timing helpers reporting throughput and latency percentiles.
+"""
+
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, List
+
+
+@dataclass
+class Result:
+    """Latencies collected by one benchmark"""
+
+    name: str
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    wall: float = 0.0
+
+    def percentile(self, pct: float) -> float:
+        """Latency in seconds below which pct percent of the calls completed"""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    @property
+    def throughput(self) -> float:
+        """Completed calls per second"""
+        return len(self.latencies) / self.wall if self.wall else 0.0
+
+    def row(self) -> str:
+        return (
+            f"{self.name:<32} {len(self.latencies):>7} {self.errors:>6} "
+            f"{self.throughput:>10.1f} {self.percentile(50) * 1000:>9.2f} "
+            f"{self.percentile(99) * 1000:>9.2f} "
+            f"{statistics.fmean(self.latencies) * 1000 if self.latencies else 0:>9.2f}"
+        )
+
+
+HEADER = (
+    f"{'benchmark':<32} {'calls':>7} {'errors':>6} {'req/s':>10} "
+    f"{'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9}"
+)
+
+
+def report(results: List[Result]) -> None:
+    """Print a result table"""
+    print(HEADER)
+    print("-" * len(HEADER))
+    for result in results:
+        print(result.row())
+
+
+def run_sync(name: str, call: Callable[[], object], requests: int, concurrency: int = 1) -> Result:
+    """
+    Time a blocking call
+
+    Args:
+        name: Benchmark name
+        call: Function performing one request
+        requests: Number of calls
+        concurrency: Number of worker threads
+
+    Returns:
+        Collected latencies
+    """
+    result = Result(name)
+
+    def timed(_):
+        started = time.perf_counter()
+        try:
+            call()
+        except Exception:
+            result.errors += 1
+            return
+        result.latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    if concurrency == 1:
+        for index in range(requests):
+            timed(index)
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(timed, range(requests)))
+    result.wall = time.perf_counter() - started
+    return result
+
+
+async def run_async(
+    name: str, call: Callable[[], Awaitable[object]], requests: int, concurrency: int = 1
+) -> Result:
+    """
+    Time a coroutine function
+
+    Args:
+        name: Benchmark name
+        call: Coroutine function performing one request
+        requests: Number of calls
+        concurrency: Number of calls in flight
+
+    Returns:
+        Collected latencies
+    """
+    result = Result(name)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed():
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await call()
+            except Exception:
+                result.errors += 1
+                return
+            result.latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(timed() for _ in range(requests)))
+    result.wall = time.perf_counter() - started
+    return result
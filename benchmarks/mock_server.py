@@ -0,0 +1,442 @@
+"""
+Mock Tinder API server
+Offline aiohttp stand-in for api.gotinder.com with the recs, swipe, matches,
+updates, profile and meta routes, the keepalive websocket and asset downloads.
+Latency, server errors and 429 responses can be injected to exercise retries,
+rate limiting and benchmarks without a token or network access.
+
+Run standalone with: python -m benchmarks.mock_server --port 8080
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import threading
+from collections import Counter, deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from aiohttp import WSMsgType, web
+
+logger = logging.getLogger(__name__)
+
+# Keepalive frame sent by the websocket clients
+PING_FRAME = bytes.fromhex("2a00")
+
+
+def _iso(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{moment.microsecond // 1000:03d}Z"
+
+
+class MockTinderServer:
+    """
+    Local server emulating the Tinder API
+
+    Every HTTP route passes through a middleware that applies the configured
+    latency and randomly (or, via inject(), deterministically) answers with a
+    server error or a 429 Too Many Requests.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        ratelimit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        recs_count: int = 10,
+        matches_count: int = 20,
+        asset_size: int = 64 * 1024,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize the mock server
+
+        Args:
+            host: Interface to bind
+            port: Port to bind, 0 picks a free one
+            latency: Delay in seconds added to every HTTP response
+            jitter: Maximum random delay in seconds added on top of latency
+            error_rate: Probability of answering with error_status
+            error_status: Status returned by injected errors
+            ratelimit_rate: Probability of answering 429 Too Many Requests
+            retry_after: Retry-After value in seconds sent with 429 responses
+            recs_count: Number of users per recommendations page
+            matches_count: Number of matches returned by /v2/matches and /updates
+            asset_size: Size in bytes of downloaded assets
+            seed: Optional seed making generated data and injected faults reproducible
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.ratelimit_rate = ratelimit_rate
+        self.retry_after = retry_after
+        self.recs_count = recs_count
+        self.matches_count = matches_count
+        self.asset_size = asset_size
+        self.random = random.Random(seed)
+        self.hits: Counter = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.faults: Deque[Tuple[int, Optional[float]]] = deque()
+        self.websockets: Set[web.WebSocketResponse] = set()
+        # Cleared to simulate a stalled gateway that stops answering heartbeats
+        self.ack_heartbeats = True
+        self.started = datetime.now(timezone.utc)
+        self._runner: Optional[web.AppRunner] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self.app = self._build_app()
+
+    @property
+    def url(self) -> str:
+        """Base URL of the HTTP API"""
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def ws_url(self) -> str:
+        """URL of the keepalive websocket"""
+        return f"ws://{self.host}:{self.port}/ws"
+
+    def inject(self, status: int, count: int = 1, retry_after: Optional[float] = None) -> None:
+        """
+        Answer the next requests with an error status
+
+        Args:
+            status: Status code to return
+            count: Number of requests to fail
+            retry_after: Retry-After header value, defaults to the configured one for 429
+        """
+        for _ in range(count):
+            self.faults.append((status, retry_after))
+
+    def _build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        routes = [
+            ("GET", "/user/recs", self.recs),
+            ("GET", "/v2/recs/core", self.recs_v2),
+            ("GET", "/like/{user_id}", self.like),
+            ("POST", "/like/{user_id}", self.like),
+            ("POST", "/like/{user_id}/super", self.like),
+            ("GET", "/pass/{user_id}", self.skip),
+            ("POST", "/pass/{user_id}", self.skip),
+            ("GET", "/v2/matches", self.matches),
+            ("GET", "/v2/matches/{match_id}/messages", self.messages),
+            ("GET", "/matches/{match_id}", self.match_info),
+            ("GET", "/updates", self.updates),
+            ("POST", "/updates", self.updates),
+            ("GET", "/profile", self.profile),
+            ("POST", "/profile", self.profile),
+            ("GET", "/user/{user_id}", self.user_info),
+            ("GET", "/meta", self.meta),
+            ("GET", "/v2/meta", self.meta),
+            ("POST", "/v2/meta", self.meta),
+            ("GET", "/v2/fast-match/teasers", self.teasers),
+            ("GET", "/ws/generate", self.gateway_token),
+            ("GET", "/ws", self.websocket),
+            ("GET", "/assets/{name}", self.asset),
+        ]
+        for method, path, handler in routes:
+            app.router.add_route(method, path, handler)
+        return app
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        route = request.match_info.route.resource
+        self.hits[route.canonical if route is not None else request.path] += 1
+        if request.path == "/ws":
+            return await handler(request)
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return await self._respond(request, handler)
+        finally:
+            self.in_flight -= 1
+
+    async def _respond(self, request: web.Request, handler) -> web.StreamResponse:
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self.faults:
+            status, retry_after = self.faults.popleft()
+        elif self.ratelimit_rate and self.random.random() < self.ratelimit_rate:
+            status, retry_after = 429, None
+        elif self.error_rate and self.random.random() < self.error_rate:
+            status, retry_after = self.error_status, None
+        else:
+            return await handler(request)
+
+        headers = {}
+        if status == 429:
+            retry_after = self.retry_after if retry_after is None else retry_after
+            headers["Retry-After"] = f"{retry_after:g}"
+        return web.json_response(
+            {"status": status, "error": "injected fault"}, status=status, headers=headers
+        )
+
+    # Generated payloads
+
+    def _id(self) -> str:
+        return "%024x" % self.random.getrandbits(96)
+
+    def photo(self) -> Dict[str, Any]:
+        """Generate a photo with its processed sizes"""
+        photo_id = self._id()
+        url = f"{self.url}/assets/{photo_id}.jpg"
+        return {
+            "id": photo_id,
+            "url": url,
+            "successRate": round(self.random.random(), 3),
+            "processedFiles": [
+                {"url": f"{url}?w={width}", "width": width, "height": int(width * 1.25)}
+                for width in (640, 320, 172, 84)
+            ],
+        }
+
+    def user(self, user_id: Optional[str] = None) -> Dict[str, Any]:
+        """Generate a user profile"""
+        birth = self.started - timedelta(days=365 * self.random.randint(18, 45))
+        return {
+            "_id": user_id or self._id(),
+            "name": self.random.choice(["Alex", "Sam", "Jamie", "Robin", "Charlie", "Kai"]),
+            "bio": "Mock profile",
+            "birth_date": _iso(birth),
+            "gender": self.random.randint(0, 1),
+            "distance_mi": self.random.randint(1, 50),
+            "ping_time": _iso(self.started),
+            "photos": [self.photo() for _ in range(self.random.randint(1, 4))],
+        }
+
+    def match(self) -> Dict[str, Any]:
+        """Generate a match with a few messages"""
+        match_id = self._id()
+        sent = self.started - timedelta(minutes=self.random.randint(1, 10000))
+        messages = [
+            {
+                "_id": self._id(),
+                "match_id": match_id,
+                "message": f"Message {index}",
+                "sent_date": _iso(sent + timedelta(minutes=index)),
+            }
+            for index in range(self.random.randint(0, 5))
+        ]
+        return {
+            "_id": match_id,
+            "id": match_id,
+            "person": self.user(),
+            "message_count": len(messages),
+            "messages": messages,
+            "last_activity_date": messages[-1]["sent_date"] if messages else _iso(sent),
+        }
+
+    # Handlers
+
+    async def recs(self, request: web.Request) -> web.Response:
+        users = [self.user() for _ in range(self.recs_count)]
+        return web.json_response({"status": 200, "results": users})
+
+    async def recs_v2(self, request: web.Request) -> web.Response:
+        results = [
+            {"type": "user", "user": user, "distance_mi": user["distance_mi"]}
+            for user in (self.user() for _ in range(self.recs_count))
+        ]
+        return web.json_response({"meta": {"status": 200}, "data": {"results": results}})
+
+    async def like(self, request: web.Request) -> web.Response:
+        return web.json_response({"match": False, "likes_remaining": 100})
+
+    async def skip(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": 200})
+
+    async def matches(self, request: web.Request) -> web.Response:
+        count = min(int(request.query.get("count", self.matches_count)), self.matches_count)
+        matches = [self.match() for _ in range(count)]
+        return web.json_response({"meta": {"status": 200}, "data": {"matches": matches}})
+
+    async def match_info(self, request: web.Request) -> web.Response:
+        match = dict(self.match(), _id=request.match_info["match_id"])
+        return web.json_response({"status": 200, "results": match})
+
+    async def messages(self, request: web.Request) -> web.Response:
+        messages = self.match()["messages"]
+        return web.json_response({"meta": {"status": 200}, "data": {"messages": messages}})
+
+    async def updates(self, request: web.Request) -> web.Response:
+        since = ""
+        if request.method == "POST" and request.can_read_body:
+            since = (await request.json()).get("last_activity_date") or ""
+        # A cursor means the client already has the matches: only new activity
+        matches = [] if since else [self.match() for _ in range(self.matches_count)]
+        return web.json_response(
+            {
+                "matches": matches,
+                "blocks": [],
+                "last_activity_date": max([since] + [m["last_activity_date"] for m in matches]),
+            }
+        )
+
+    async def profile(self, request: web.Request) -> web.Response:
+        profile = self.user(user_id="me")
+        profile.update(
+            create_date=_iso(self.started - timedelta(days=400)),
+            distance_filter=50,
+            gender_filter=-1,
+            email="me@example.com",
+        )
+        return web.json_response(profile)
+
+    async def user_info(self, request: web.Request) -> web.Response:
+        user = self.user(request.match_info["user_id"])
+        return web.json_response({"status": 200, "results": user})
+
+    async def meta(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {"status": 200, "rating": {"likes_remaining": 100, "super_likes": {"remaining": 5}}}
+        )
+
+    async def teasers(self, request: web.Request) -> web.Response:
+        results = [{"user": {"photos": [self.photo()]}} for _ in range(self.recs_count)]
+        return web.json_response({"meta": {"status": 200}, "data": {"results": results}})
+
+    async def gateway_token(self, request: web.Request) -> web.Response:
+        return web.json_response({"token": self._id()})
+
+    async def websocket(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.websockets.add(ws)
+        try:
+            async for message in ws:
+                if message.type == WSMsgType.BINARY and message.data == PING_FRAME:
+                    if self.ack_heartbeats:
+                        await ws.send_bytes(PING_FRAME)
+        finally:
+            self.websockets.discard(ws)
+        return ws
+
+    async def push(self, frame: bytes) -> None:
+        """
+        Send a binary frame to every connected websocket
+
+        Args:
+            frame: Raw frame
+        """
+        for ws in list(self.websockets):
+            await ws.send_bytes(frame)
+
+    async def disconnect(self) -> None:
+        """Close every connected websocket, as a gateway restart would"""
+        for ws in list(self.websockets):
+            await ws.close()
+
+    async def asset(self, request: web.Request) -> web.Response:
+        seed = request.match_info["name"].encode()
+        body = (seed * (self.asset_size // max(len(seed), 1) + 1))[: self.asset_size]
+        return web.Response(body=body, content_type="image/jpeg")
+
+    # Lifecycle
+
+    async def start(self) -> str:
+        """
+        Start serving on the current event loop
+
+        Returns:
+            Base URL of the server
+        """
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        logger.info(f"Mock Tinder API listening on {self.url}")
+        return self.url
+
+    async def close(self) -> None:
+        """Stop serving and close the websockets"""
+        for ws in list(self.websockets):
+            await ws.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def start_in_thread(self) -> str:
+        """
+        Start serving on an event loop in a background thread, for synchronous clients
+
+        Returns:
+            Base URL of the server
+        """
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start())
+            ready.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.close())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="mock-tinder-api", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self.url
+
+    def stop_thread(self) -> None:
+        """Stop a server started with start_in_thread()"""
+        if self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._thread = None
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Offline mock of the Tinder API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to responses")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum random extra delay")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of a 503")
+    parser.add_argument("--ratelimit-rate", type=float, default=0.0, help="Probability of a 429")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    server = MockTinderServer(
+        args.host,
+        args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        ratelimit_rate=args.ratelimit_rate,
+        retry_after=args.retry_after,
+    )
+
+    async def serve():
+        async with server:
+            while True:
+                await asyncio.sleep(3600)
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
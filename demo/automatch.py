@@ -12,15 +12,26 @@ class Client(tinder.Client):
             await asyncio.sleep(60)
 
     async def get_recs(self):
+        seen = set()
         while True:
-            users = await self.fetch_recs()
-            print(f"fetched {len(users)} users")
-            for user in users:
+            # The next page is fetched while the current one is being liked
+            async for user in self.iter_recs(seen=seen):
                 photo_ids = {photo.id for photo in user.photos}
                 if not self.teaser_ids.isdisjoint(photo_ids):
                     await user.like()
+            print(f"seen {len(seen)} users")
             await asyncio.sleep(60)
 
+    # Pushed by the gateway: the scheduler only fetches what changed
+    async def on_updates(self, updates):
+        for match in updates.matches:
+            name = match.person.name if match.person else match.id
+            print(f"activity with {name}: {len(match.messages)} new messages")
+
+    async def on_messages(self, match_id, messages):
+        if messages:
+            print(f"{match_id}: {messages[-1].message}")
+
     async def main(self):
         await asyncio.gather(self.get_teasers(), self.get_recs())
 
@@ -4,7 +4,6 @@ Demonstrates how to use the separated modules for different functionality.
 """
 
 import asyncio
-import time
 
 from modules.api_async import AsyncTinderAPI
 from modules.api_modular import (TinderAPIError, dislike, get_recommendations,
@@ -48,8 +47,6 @@ def sync_example():
             else:
                 print(f"  - {name} doesn't match criteria")
 
-            time.sleep(1)  # Rate limiting
-
         print("\nCompleted synchronous example!")
 
     except TinderAPIError as e:
@@ -86,8 +83,6 @@ async def async_example():
                 # Check for specific interests
                 if "music" in bio:
                     print(f"  ✓ {name} likes music! Swiping right...")
-                    # Add delay to avoid rate limiting
-                    await asyncio.sleep(i * 0.5)
                     tasks.append(api.like(user_id))
                 else:
                     print(f"  - {name} doesn't mention music")
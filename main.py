@@ -4,10 +4,13 @@ Demonstrates how to use the Tinder API to like users with specific interests.
 """
 
 import os
-import time
 from typing import Optional
 
-from modules.api import TinderAPIError, get_recommendations, like
+from modules.api import TinderAPIError, like
+from modules.recs import iter_recommendations
+
+# Number of recommendation pages to review per run
+MAX_PAGES = 3
 
 
 def check_environment() -> bool:
@@ -29,23 +32,17 @@ def main() -> None:
         return
 
     try:
-        # Get user recommendations
+        # Stream user recommendations, the next page is fetched while
+        # the current one is reviewed
         print("[INFO] Fetching user recommendations...")
-        users = get_recommendations()
-
-        if not users:
-            print("[INFO] No recommendations available at the moment.")
-            return
-
-        print(f"[INFO] Found {len(users)} users to review")
-
-        # Process each user
-        for i, user in enumerate(users, 1):
+        reviewed = 0
+        for user in iter_recommendations(max_pages=MAX_PAGES):
+            reviewed += 1
             user_id: Optional[str] = user.get("_id")
             name = user.get("name", "Unknown")
             bio = user.get("bio", "").lower()
 
-            print(f"\n[{i}/{len(users)}] Reviewing {name}...")
+            print(f"\n[{reviewed}] Reviewing {name}...")
 
             # Check if user has 'music' in their bio
             if "music" in bio and user_id:
@@ -61,10 +58,11 @@ def main() -> None:
             else:
                 print(f"  - {name} doesn't mention music in bio")
 
-            # Add a small delay to avoid rate limiting
-            time.sleep(1)
+        if not reviewed:
+            print("[INFO] No recommendations available at the moment.")
+            return
 
-        print(f"\n[INFO] Completed review of {len(users)} users")
+        print(f"\n[INFO] Completed review of {reviewed} users")
 
     except TinderAPIError as e:
         print(f"[ERROR] API Error: {e}")
@@ -14,6 +14,15 @@ from .api_modular import like as modular_like
 from .api_modular import reset_location as modular_reset_location
 from .api_modular import set_location as modular_set_location
 from .api_modular import superlike as modular_superlike
+from .auth import HeaderProvider, set_auth_token
+from .cache import ResponseCache
+from .codec import get_codec, set_codec
+from .ratelimit import RateLimiter, configure_rate_limits, get_rate_limiter
+from .recs import iter_recommendations
+from .session import close_session, configure_session, get_session
+from .sync import AsyncUpdatesSync, SyncState, UpdatesSync
+from .transport import (AsyncTransport, RequestEvent, Transport,
+                        get_transport, set_transport)
 
 __all__ = [
     # Main API
@@ -36,6 +45,7 @@ __all__ = [
     "get_updates",
     "get_meta",
     "get_meta_v2",
+    "iter_recommendations",
     # Modular API
     "ModularTinderAPIError",
     "modular_get_recommendations",
@@ -44,4 +54,30 @@ __all__ = [
     "modular_superlike",
     "modular_set_location",
     "modular_reset_location",
+    # Auth
+    "HeaderProvider",
+    "set_auth_token",
+    # Response cache
+    "ResponseCache",
+    # JSON codec
+    "get_codec",
+    "set_codec",
+    # Rate limiting
+    "RateLimiter",
+    "configure_rate_limits",
+    "get_rate_limiter",
+    # Session
+    "configure_session",
+    "get_session",
+    "close_session",
+    # Updates sync
+    "UpdatesSync",
+    "AsyncUpdatesSync",
+    "SyncState",
+    # Transport
+    "Transport",
+    "AsyncTransport",
+    "RequestEvent",
+    "get_transport",
+    "set_transport",
 ]
@@ -5,13 +5,13 @@ authentication.
 """
 
 import logging
-import os
-import time
 from typing import Any, Dict, List, Optional
 
-import requests
 from dotenv import load_dotenv
 
+from .auth import API_HOST, DEFAULT_HEADERS, TinderAPIError  # noqa: F401
+from .transport import get_transport
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -22,43 +22,6 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
-# API Configuration
-API_HOST = "https://api.gotinder.com"
-DEFAULT_HEADERS = {
-    "app_version": "6.9.4",
-    "platform": "ios",
-    "User-agent": "Tinder/7.5.3 (iPhone; iOS 10.3.2; Scale/2.00)",
-    "Accept": "application/json",
-}
-
-
-class TinderAPIError(Exception):
-    """Custom exception for Tinder API errors"""
-
-    pass
-
-
-def _get_auth_token() -> str:
-    """Get authentication token from environment variable"""
-    token = os.getenv("TINDER_AUTH_TOKEN")
-    if not token:
-        raise TinderAPIError("TINDER_AUTH_TOKEN not found in environment variables")
-    return token
-
-
-def _get_headers() -> Dict[str, str]:
-    """Get headers with authentication token"""
-    headers = DEFAULT_HEADERS.copy()
-    headers["X-Auth-Token"] = _get_auth_token()
-    return headers
-
-
-def _get_json_headers() -> Dict[str, str]:
-    """Get headers with authentication token and JSON content type"""
-    headers = _get_headers()
-    headers["content-type"] = "application/json"
-    return headers
-
 
 def _make_request(
     method: str,
@@ -83,55 +46,9 @@ def _make_request(
     Raises:
         TinderAPIError: If request fails after all retries
     """
-    url = f"{API_HOST}{endpoint}"
-    headers = _get_json_headers() if json_data else _get_headers()
-
-    for attempt in range(max_retries + 1):
-        try:
-            logger.debug(f"Making {method} request to {endpoint} (attempt {attempt + 1})")
-
-            if method.upper() == "GET":
-                response = requests.get(url, headers=headers, timeout=30)
-            elif method.upper() == "POST":
-                if json_data:
-                    response = requests.post(url, headers=headers, json=json_data, timeout=30)
-                else:
-                    response = requests.post(url, headers=headers, data=data, timeout=30)
-            elif method.upper() == "PUT":
-                response = requests.put(url, headers=headers, json=json_data, timeout=30)
-            elif method.upper() == "DELETE":
-                response = requests.delete(url, headers=headers, timeout=30)
-            else:
-                raise TinderAPIError(f"Unsupported HTTP method: {method}")
-
-            response.raise_for_status()
-            logger.debug(f"Request successful: {response.status_code}")
-            return response.json()
-
-        except requests.exceptions.Timeout as e:
-            logger.warning(f"Request timeout (attempt {attempt + 1}): {e}")
-            if attempt == max_retries:
-                raise TinderAPIError(f"Request timeout after {max_retries + 1} attempts")
-            time.sleep(2**attempt)  # Exponential backoff
-
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code >= 500 and attempt < max_retries:
-                logger.warning(
-                    f"Server error {e.response.status_code} (attempt {attempt + 1}): {e}"
-                )
-                time.sleep(2**attempt)  # Exponential backoff
-                continue
-            else:
-                logger.error(f"HTTP error {e.response.status_code}: {e}")
-                raise TinderAPIError(f"HTTP error {e.response.status_code}: {str(e)}")
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Request failed: {e}")
-            if attempt == max_retries:
-                raise TinderAPIError(
-                    f"API request failed after {max_retries + 1} attempts: {str(e)}"
-                )
-            time.sleep(2**attempt)  # Exponential backoff
+    return get_transport().request(
+        method, endpoint, data=data, json_data=json_data, max_retries=max_retries
+    )
 
 
 def get_recommendations() -> List[Dict[str, Any]]:
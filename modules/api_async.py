@@ -3,53 +3,206 @@ Async Tinder API Client
 Clean async implementation of Tinder API endpoints using httpx.
 """
 
+import asyncio
+import atexit
+import functools
+import importlib.util
+import logging
 import os
-from typing import Any, Dict, List, Optional
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 import httpx
 from dotenv import load_dotenv
 
+from .auth import API_HOST, DEFAULT_HEADERS, HeaderProvider, TinderAPIError  # noqa: F401
+from .cache import ResponseCache
+from .ratelimit import RateLimiter, get_rate_limiter
+from .recs import DEFAULT_PREFETCH_PAGES, RECS_V2_ENDPOINT, RecsPager, parse_recs_v2
+from .transport import DEFAULT_MAX_RETRIES, AsyncHTTPXBackend, AsyncTransport, RetryBudget
+
 # Load environment variables
 load_dotenv()
 
-# API Configuration
-API_HOST = "https://api.gotinder.com"
-DEFAULT_HEADERS = {
-    "app_version": "6.9.4",
-    "platform": "ios",
-    "User-agent": "Tinder/7.5.3 (iPhone; iOS 10.3.2; Scale/2.00)",
-    "Accept": "application/json",
+logger = logging.getLogger(__name__)
+
+# Connection Pool Configuration
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 5.0
+
+# Pool of the shared client used by the convenience functions
+SHARED_POOL_OPTIONS: Dict[str, Any] = {
+    "max_connections": 20,
+    "max_keepalive_connections": 10,
+    "keepalive_expiry": 30.0,
 }
 
 
-class TinderAPIError(Exception):
-    """Custom exception for Tinder API errors"""
+# Batch Configuration
+DEFAULT_BATCH_CONCURRENCY = 8
+
+
+def http2_available() -> bool:
+    """Check if the h2 package needed for HTTP/2 is installed"""
+    return importlib.util.find_spec("h2") is not None
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one item of a batch"""
+
+    key: Any
+    result: Any = None
+    error: Optional[Exception] = None
 
-    pass
+    @property
+    def ok(self) -> bool:
+        """True if the item succeeded"""
+        return self.error is None
+
+
+async def _run_batch(
+    calls: Iterable[Tuple[Any, Callable[[], Awaitable[Any]]]], concurrency: int
+) -> AsyncIterator[BatchResult]:
+    """
+    Run calls with bounded concurrency, yielding results as they complete
+
+    The calls iterable is consumed lazily, so at most concurrency calls are
+    in flight and large batches are not materialized up front. Pending calls
+    are cancelled if the consumer stops iterating.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    async def run(key, call) -> BatchResult:
+        try:
+            return BatchResult(key, await call())
+        except Exception as e:
+            return BatchResult(key, error=e)
+
+    calls = iter(calls)
+    pending = set()
+    try:
+        while True:
+            for key, call in calls:
+                pending.add(asyncio.ensure_future(run(key, call)))
+                if len(pending) >= concurrency:
+                    break
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
 
 
 class AsyncTinderAPI:
     """Async Tinder API client"""
 
-    def __init__(self, auth_token: Optional[str] = None):
+    def __init__(
+        self,
+        auth_token: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+        base_url: str = API_HOST,
+        http2: bool = False,
+        max_connections: Optional[int] = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: Optional[int] = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        retry_budget: Optional[RetryBudget] = None,
+        **client_options: Any,
+    ):
         """
         Initialize the async Tinder API client
 
         Args:
             auth_token: Optional auth token. If not provided, will load from env
+            rate_limiter: Optional rate limiter. Defaults to the shared limiter
+            cache: Optional response cache for read-only endpoints
+            base_url: API host, e.g. a local mock server
+            http2: Multiplex concurrent requests over one HTTP/2 connection.
+                Requires the h2 package (pip install "httpx[http2]")
+            max_connections: Maximum number of open connections, None for no limit
+            max_keepalive_connections: Maximum number of idle connections kept open
+            keepalive_expiry: Seconds an idle connection is kept open
+            max_retries: Retries for timeouts, connection errors, 5xx and 429
+            retry_budget: Bound on the share of retried requests. Defaults to a
+                new budget for this client
+            **client_options: Extra httpx.AsyncClient options
+
+        Raises:
+            TinderAPIError: If http2 is requested but h2 is not installed
         """
+        if http2 and not http2_available():
+            raise TinderAPIError('HTTP/2 requires the h2 package: pip install "httpx[http2]"')
         self.auth_token = auth_token or self._get_auth_token()
+        self._headers = HeaderProvider(self.auth_token)
+        self._rate_limiter = rate_limiter
+        self.cache = cache
+        self.base_url = base_url
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.max_retries = max_retries
+        self.retry_budget = retry_budget or RetryBudget()
+        self.client_options = client_options
         self.client = None
+        self.transport: Optional[AsyncTransport] = None
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """Rate limiter pacing this client (the shared one by default)"""
+        return self._rate_limiter or get_rate_limiter()
+
+    def _open(self) -> None:
+        """Create the HTTP client if it is not open yet"""
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                headers=self._headers.headers(),
+                timeout=30.0,
+                http2=self.http2,
+                limits=self.limits,
+                **self.client_options,
+            )
+            self.transport = AsyncTransport(
+                AsyncHTTPXBackend(self.client),
+                base_url=self.base_url,
+                max_retries=self.max_retries,
+                rate_limiter=self._rate_limiter,
+                cache=self.cache,
+                retry_budget=self.retry_budget,
+            )
 
     async def __aenter__(self):
         """Async context manager entry"""
-        self.client = httpx.AsyncClient(headers=self._get_headers(), timeout=30.0)
+        self._open()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.client:
-            await self.client.aclose()
+        await self.close()
 
     def _get_auth_token(self) -> str:
         """Get authentication token from environment variable"""
@@ -58,17 +211,17 @@ class AsyncTinderAPI:
             raise TinderAPIError("TINDER_AUTH_TOKEN not found in environment variables")
         return token
 
-    def _get_headers(self) -> Dict[str, str]:
-        """Get headers with authentication token"""
-        headers = DEFAULT_HEADERS.copy()
-        headers["X-Auth-Token"] = self.auth_token
-        return headers
+    def set_auth_token(self, auth_token: str) -> None:
+        """
+        Rotate the auth token used by this client
 
-    def _get_json_headers(self) -> Dict[str, str]:
-        """Get headers with authentication token and JSON content type"""
-        headers = self._get_headers()
-        headers["content-type"] = "application/json"
-        return headers
+        Args:
+            auth_token: New auth token
+        """
+        self.auth_token = auth_token
+        self._headers.set_token(auth_token)
+        if self.client:
+            self.client.headers["X-Auth-Token"] = auth_token
 
     async def _make_request(
         self,
@@ -80,6 +233,10 @@ class AsyncTinderAPI:
         """
         Make async HTTP request to Tinder API
 
+        Timeouts, connection errors, 5xx and 429 responses are retried with
+        jittered exponential backoff (429 waits for Retry-After) while the
+        retry budget allows it.
+
         Args:
             method: HTTP method (GET, POST, PUT, DELETE)
             endpoint: API endpoint (without host)
@@ -90,35 +247,20 @@ class AsyncTinderAPI:
             API response as dictionary
 
         Raises:
-            TinderAPIError: If request fails
+            TinderAPIError: If request fails after all retries
         """
-        url = f"{API_HOST}{endpoint}"
-        headers = self._get_json_headers() if json_data else self._get_headers()
-
-        try:
-            if method.upper() == "GET":
-                response = await self.client.get(url, headers=headers)
-            elif method.upper() == "POST":
-                if json_data:
-                    response = await self.client.post(url, headers=headers, json=json_data)
-                else:
-                    response = await self.client.post(url, headers=headers, data=data)
-            elif method.upper() == "PUT":
-                response = await self.client.put(url, headers=headers, json=json_data)
-            elif method.upper() == "DELETE":
-                response = await self.client.delete(url, headers=headers)
-            else:
-                raise TinderAPIError(f"Unsupported HTTP method: {method}")
-
-            response.raise_for_status()
-            return response.json()
-
-        except httpx.RequestError as e:
-            raise TinderAPIError(f"API request failed: {str(e)}")
+        if self.transport is None:
+            raise TinderAPIError("Client is not open, use 'async with AsyncTinderAPI()'")
+        headers = self._headers.json_headers() if json_data else self._headers.headers()
+        return await self.transport.request(
+            method, endpoint, data=data, json_data=json_data, headers=headers
+        )
 
     async def close(self):
         """Close the HTTP client"""
-        await self.client.aclose()
+        if self.client:
+            client, self.client, self.transport = self.client, None, None
+            await client.aclose()
 
     async def get_recommendations(self) -> List[Dict[str, Any]]:
         """
@@ -140,6 +282,53 @@ class AsyncTinderAPI:
         response = await self._make_request("GET", "/v2/recs/core?locale=en-US")
         return response.get("results", [])
 
+    async def iter_recommendations(
+        self,
+        prefetch: int = DEFAULT_PREFETCH_PAGES,
+        max_pages: Optional[int] = None,
+        seen: Optional[Set[str]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream v2 recommendations page by page, prefetching ahead of the consumer
+
+        Once the caller has consumed most of a page, the next one is requested
+        in the background (see RecsPager). Users already yielded are skipped,
+        and the stream ends on an empty page or after MAX_STALE_PAGES pages in
+        a row without new users.
+
+        Args:
+            prefetch: Maximum number of pages requested ahead of the one being consumed
+            max_pages: Optional maximum number of pages to request
+            seen: Optional set of user IDs already seen, updated in place
+
+        Returns:
+            Async iterator of user profiles
+        """
+        pager = RecsPager(prefetch, max_pages, seen)
+        pending: Deque[asyncio.Task] = deque()
+
+        async def fetch_page(previous: Optional[asyncio.Task]) -> List[Dict[str, Any]]:
+            # Pages are requested one after another, like a user scrolling
+            if previous is not None:
+                await asyncio.wait({previous})
+            return parse_recs_v2(await self._make_request("GET", RECS_V2_ENDPOINT))
+
+        try:
+            while not pager.done:
+                while pager.wants_page(len(pending)):
+                    previous = pending[-1] if pending else None
+                    pending.append(asyncio.ensure_future(fetch_page(previous)))
+                if not pending:
+                    return
+                for user in pager.fresh(await pending.popleft()):
+                    yield user
+                    while pager.wants_page(len(pending)):
+                        previous = pending[-1] if pending else None
+                        pending.append(asyncio.ensure_future(fetch_page(previous)))
+        finally:
+            for task in pending:
+                task.cancel()
+
     async def like(self, user_id: str) -> Dict[str, Any]:
         """
         Like a user (swipe right)
@@ -333,33 +522,170 @@ class AsyncTinderAPI:
         """
         return await self._make_request("GET", "/v2/meta")
 
+    def map(
+        self, requests: Iterable[Sequence[Any]], concurrency: int = DEFAULT_BATCH_CONCURRENCY
+    ) -> AsyncIterator[BatchResult]:
+        """
+        Send many requests with bounded concurrency
+
+        Every request goes through the rate limiter and retry policy. Results
+        are yielded in completion order and a failed request yields a result
+        with its error instead of aborting the batch.
+
+        Args:
+            requests: (method, endpoint) or (method, endpoint, json_data) tuples
+            concurrency: Maximum number of requests in flight
+
+        Returns:
+            Async iterator of BatchResult keyed by the request tuple
+        """
+
+        def call(method: str, endpoint: str, json_data: Optional[Dict] = None):
+            return functools.partial(self._make_request, method, endpoint, json_data=json_data)
+
+        calls = ((request, call(*request)) for request in requests)
+        return _run_batch(calls, concurrency)
+
+    def get_user_infos(
+        self, user_ids: Iterable[str], concurrency: int = DEFAULT_BATCH_CONCURRENCY
+    ) -> AsyncIterator[BatchResult]:
+        """
+        Get information about many users
+
+        Args:
+            user_ids: Tinder user IDs
+            concurrency: Maximum number of requests in flight
+
+        Returns:
+            Async iterator of BatchResult keyed by user ID, in completion order
+        """
+        calls = ((user_id, functools.partial(self.get_user_info, user_id)) for user_id in user_ids)
+        return _run_batch(calls, concurrency)
+
+    def get_match_infos(
+        self, match_ids: Iterable[str], concurrency: int = DEFAULT_BATCH_CONCURRENCY
+    ) -> AsyncIterator[BatchResult]:
+        """
+        Get information about many matches
+
+        Args:
+            match_ids: Match IDs
+            concurrency: Maximum number of requests in flight
+
+        Returns:
+            Async iterator of BatchResult keyed by match ID, in completion order
+        """
+        calls = (
+            (match_id, functools.partial(self.get_match_info, match_id)) for match_id in match_ids
+        )
+        return _run_batch(calls, concurrency)
+
+
+# Shared client for the convenience functions. httpx clients are bound to the
+# event loop they were first used on, so there is one instance per loop.
+_shared_apis: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncTinderAPI]" = (
+    weakref.WeakKeyDictionary()
+)
+# Tasks closing each shared client when its event loop shuts down
+_shared_closers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Task]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def _close_on_shutdown(loop: asyncio.AbstractEventLoop, api: AsyncTinderAPI) -> None:
+    """
+    Wait until cancelled, then close the shared client of the loop
+
+    asyncio.run cancels the remaining tasks before closing the loop, so the
+    client is closed while its connections can still be shut down.
+
+    Args:
+        loop: Event loop of the client
+        api: Shared client
+    """
+    try:
+        await loop.create_future()
+    finally:
+        if _shared_apis.get(loop) is api:
+            del _shared_apis[loop]
+        _shared_closers.pop(loop, None)
+        await api.close()
+
+
+def get_shared_api() -> AsyncTinderAPI:
+    """
+    Get the shared client of the running event loop, creating it on first use
+
+    The client keeps its connection pool open between calls and uses HTTP/2
+    when the h2 package is installed. It is closed when the loop shuts down.
+
+    Returns:
+        Shared async API client
+    """
+    loop = asyncio.get_running_loop()
+    for closed in [other for other in _shared_apis if other.is_closed()]:
+        # The loop was closed without cancelling its tasks, the client can't
+        # be closed anymore but must not keep the loop alive
+        del _shared_apis[closed]
+        _shared_closers.pop(closed, None)
+        logger.debug("Dropped the shared async API client of a closed event loop")
+    api = _shared_apis.get(loop)
+    if api is None:
+        api = AsyncTinderAPI(http2=http2_available(), **SHARED_POOL_OPTIONS)
+        api._open()
+        _shared_apis[loop] = api
+        _shared_closers[loop] = loop.create_task(_close_on_shutdown(loop, api))
+        logger.debug("Created shared async API client")
+    return api
+
+
+async def close_shared_api() -> None:
+    """Close the shared client of the running event loop"""
+    loop = asyncio.get_running_loop()
+    api = _shared_apis.pop(loop, None)
+    closer = _shared_closers.pop(loop, None)
+    if closer is not None:
+        closer.cancel()
+    if api is not None:
+        await api.close()
+
+
+def _close_shared_apis() -> None:
+    """Close the shared clients whose event loop can still run at exit"""
+    for loop, api in list(_shared_apis.items()):
+        if not loop.is_closed() and not loop.is_running():
+            try:
+                loop.run_until_complete(api.close())
+            except Exception:
+                logger.debug("Failed to close shared async API client", exc_info=True)
+    _shared_apis.clear()
+    _shared_closers.clear()
+
+
+atexit.register(_close_shared_apis)
+
 
 # Convenience functions for backward compatibility
 async def get_recommendations() -> List[Dict[str, Any]]:
     """Get user recommendations (async)"""
-    async with AsyncTinderAPI() as api:
-        return await api.get_recommendations()
+    return await get_shared_api().get_recommendations()
 
 
 async def like(user_id: str) -> Dict[str, Any]:
     """Like a user (async)"""
-    async with AsyncTinderAPI() as api:
-        return await api.like(user_id)
+    return await get_shared_api().like(user_id)
 
 
 async def dislike(user_id: str) -> Dict[str, Any]:
     """Dislike a user (async)"""
-    async with AsyncTinderAPI() as api:
-        return await api.dislike(user_id)
+    return await get_shared_api().dislike(user_id)
 
 
 async def get_matches(limit: int = 60) -> List[Dict[str, Any]]:
     """Get matches (async)"""
-    async with AsyncTinderAPI() as api:
-        return await api.get_matches(limit)
+    return await get_shared_api().get_matches(limit)
 
 
 async def set_location(lat: float, lon: float) -> Dict[str, Any]:
     """Set location (async)"""
-    async with AsyncTinderAPI() as api:
-        return await api.set_location(lat, lon)
+    return await get_shared_api().set_location(lat, lon)
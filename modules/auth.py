@@ -4,7 +4,9 @@ Handles token management and authentication headers.
 """
 
 import os
-from typing import Dict
+import threading
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
 
 from dotenv import load_dotenv
 
@@ -35,15 +37,99 @@ def get_auth_token() -> str:
     return token
 
 
-def get_headers() -> Dict[str, str]:
+class HeaderProvider:
+    """
+    Thread-safe provider of precomputed authentication header sets
+
+    The plain and JSON header sets are built once, stored as read-only
+    mappings and reused by every request until the token is rotated.
+    """
+
+    def __init__(
+        self, token: Optional[str] = None, base_headers: Mapping[str, str] = DEFAULT_HEADERS
+    ):
+        """
+        Initialize the header provider
+
+        Args:
+            token: Optional auth token. If not provided, will load from env
+            base_headers: Headers sent with every request
+        """
+        self._token = token
+        self._base_headers = dict(base_headers)
+        self._lock = threading.Lock()
+        self._header_sets: Optional[Tuple[Mapping[str, str], Mapping[str, str]]] = None
+
+    @property
+    def token(self) -> str:
+        """Current auth token"""
+        return self._get_header_sets()[0]["X-Auth-Token"]
+
+    def set_token(self, token: str) -> None:
+        """
+        Rotate the auth token, rebuilding the header sets on next use
+
+        Args:
+            token: New auth token
+        """
+        with self._lock:
+            if token != self._token:
+                self._token = token
+                self._header_sets = None
+
+    def invalidate(self) -> None:
+        """Drop the cached header sets (an env token is re-read on next use)"""
+        with self._lock:
+            self._header_sets = None
+
+    def _get_header_sets(self) -> Tuple[Mapping[str, str], Mapping[str, str]]:
+        header_sets = self._header_sets
+        if header_sets is None:
+            with self._lock:
+                if self._header_sets is None:
+                    headers = dict(self._base_headers)
+                    headers["X-Auth-Token"] = self._token or get_auth_token()
+                    json_headers = dict(headers)
+                    json_headers["content-type"] = "application/json"
+                    self._header_sets = (
+                        MappingProxyType(headers),
+                        MappingProxyType(json_headers),
+                    )
+                header_sets = self._header_sets
+        return header_sets
+
+    def headers(self) -> Mapping[str, str]:
+        """Get headers with authentication token"""
+        return self._get_header_sets()[0]
+
+    def json_headers(self) -> Mapping[str, str]:
+        """Get headers with authentication token and JSON content type"""
+        return self._get_header_sets()[1]
+
+
+_header_provider = HeaderProvider()
+
+
+def get_header_provider() -> HeaderProvider:
+    """Get the process-wide header provider used by the synchronous modules"""
+    return _header_provider
+
+
+def set_auth_token(token: str) -> None:
+    """
+    Rotate the auth token used by the synchronous modules
+
+    Args:
+        token: New auth token
+    """
+    _header_provider.set_token(token)
+
+
+def get_headers() -> Mapping[str, str]:
     """Get headers with authentication token"""
-    headers = DEFAULT_HEADERS.copy()
-    headers["X-Auth-Token"] = get_auth_token()
-    return headers
+    return _header_provider.headers()
 
 
-def get_json_headers() -> Dict[str, str]:
+def get_json_headers() -> Mapping[str, str]:
     """Get headers with authentication token and JSON content type"""
-    headers = get_headers()
-    headers["content-type"] = "application/json"
-    return headers
+    return _header_provider.json_headers()
@@ -0,0 +1,323 @@
+"""
+Response cache module for Tinder API
+Opt-in cache for read-only endpoints with per-route TTLs, ETag/Last-Modified
+revalidation, LRU eviction by size and an optional sqlite backend that keeps
+the cache warm across script runs.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Tuple
+
+from .ratelimit import route_key
+
+logger = logging.getLogger(__name__)
+
+# Cache Configuration
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+DEFAULT_TTLS: Dict[str, float] = {
+    "GET /profile": 300.0,
+    "GET /meta": 600.0,
+    "GET /v2/meta": 600.0,
+    "GET /user/{id}": 3600.0,
+}
+
+
+@dataclass
+class CacheEntry:
+    """Cached response body and its validators"""
+
+    content: bytes
+    stored_at: float
+    ttl: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def size(self) -> int:
+        """Approximate size of the entry in bytes"""
+        return len(self.content)
+
+    def is_fresh(self, now: float) -> bool:
+        """Check if the entry can be served without contacting the server"""
+        return now - self.stored_at < self.ttl
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers turning a refetch into a conditional request"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class MemoryBackend:
+    """In-memory LRU storage bounded by total body size"""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the backend
+
+        Args:
+            max_bytes: Maximum total size of cached bodies
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Get an entry and mark it as recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry, evicting the least recently used ones if needed"""
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old.size
+            self._entries[key] = entry
+            self._size += entry.size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+
+    def clear(self) -> None:
+        """Remove every entry"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def close(self) -> None:
+        """Release backend resources"""
+        pass
+
+
+class SqliteBackend:
+    """On-disk LRU storage bounded by total body size"""
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the backend
+
+        Args:
+            path: Path of the sqlite database file
+            max_bytes: Maximum total size of cached bodies
+        """
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        path = os.path.expanduser(path)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                content BLOB NOT NULL,
+                stored_at REAL NOT NULL,
+                ttl REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                size INTEGER NOT NULL,
+                accessed REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+            """
+        )
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Get an entry and mark it as recently used"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT content, stored_at, ttl, etag, last_modified FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            with self._db:
+                self._db.execute(
+                    "UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key)
+                )
+        return CacheEntry(*row)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry, evicting the least recently used ones if needed"""
+        if entry.size > self.max_bytes:
+            return
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.content,
+                    entry.stored_at,
+                    entry.ttl,
+                    entry.etag,
+                    entry.last_modified,
+                    entry.size,
+                    time.time(),
+                ),
+            )
+            (total,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+            while total > self.max_bytes:
+                evicted = self._db.execute(
+                    "SELECT key, size FROM responses ORDER BY accessed LIMIT 1"
+                ).fetchone()
+                self._db.execute("DELETE FROM responses WHERE key = ?", (evicted[0],))
+                total -= evicted[1]
+
+    def clear(self) -> None:
+        """Remove every entry"""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        """Close the database"""
+        with self._lock:
+            self._db.close()
+
+
+class ResponseCache:
+    """
+    Cache of read-only GET responses
+
+    Only routes listed in ttls are cached, so write endpoints and swipes are
+    never served from the cache.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Mapping[str, float]] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        path: Optional[str] = None,
+    ):
+        """
+        Initialize the response cache
+
+        Args:
+            ttls: Mapping of route key (e.g. "GET /user/{id}") to TTL in seconds
+            max_bytes: Maximum total size of cached bodies
+            path: Optional sqlite file. If not provided, the cache is in memory
+        """
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        if path:
+            self.backend = SqliteBackend(path, max_bytes)
+        else:
+            self.backend = MemoryBackend(max_bytes)
+
+    @staticmethod
+    def _key(endpoint: str, token: Optional[str]) -> str:
+        """Cache key of an endpoint, scoped to a fingerprint of the auth token"""
+        if not token:
+            return endpoint
+        return f"{hashlib.sha256(token.encode()).hexdigest()[:16]} {endpoint}"
+
+    def _ttl(self, method: str, endpoint: str) -> float:
+        if method.upper() != "GET":
+            return 0.0
+        return self.ttls.get(route_key(method, endpoint), 0.0)
+
+    def lookup(
+        self, method: str, endpoint: str, token: Optional[str] = None
+    ) -> Tuple[Optional[bytes], Dict[str, str]]:
+        """
+        Look up a request in the cache
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint (without host)
+            token: Auth token of the request, entries of other tokens are not served
+
+        Returns:
+            Fresh cached body (or None) and the conditional headers to send
+            when the request has to reach the server
+        """
+        if not self._ttl(method, endpoint):
+            return None, {}
+        entry = self.backend.get(self._key(endpoint, token))
+        if entry is None:
+            return None, {}
+        if entry.is_fresh(time.time()):
+            logger.debug(f"Cache hit for {endpoint}")
+            return entry.content, {}
+        return None, entry.conditional_headers()
+
+    def store(
+        self,
+        method: str,
+        endpoint: str,
+        content: bytes,
+        headers: Mapping[str, str],
+        token: Optional[str] = None,
+    ) -> None:
+        """
+        Store a successful response
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint (without host)
+            content: Raw response body
+            headers: Response headers
+            token: Auth token of the request
+        """
+        ttl = self._ttl(method, endpoint)
+        if not ttl or "no-store" in headers.get("Cache-Control", ""):
+            return
+        entry = CacheEntry(
+            content, time.time(), ttl, headers.get("ETag"), headers.get("Last-Modified")
+        )
+        self.backend.set(self._key(endpoint, token), entry)
+
+    def revalidate(
+        self,
+        method: str,
+        endpoint: str,
+        headers: Mapping[str, str],
+        token: Optional[str] = None,
+    ) -> Optional[bytes]:
+        """
+        Refresh an entry after a 304 Not Modified response
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint (without host)
+            headers: Response headers
+            token: Auth token of the request
+
+        Returns:
+            Cached body, or None if the entry has been evicted meanwhile
+        """
+        ttl = self._ttl(method, endpoint)
+        key = self._key(endpoint, token)
+        entry = self.backend.get(key) if ttl else None
+        if entry is None:
+            return None
+        logger.debug(f"Cache revalidated {endpoint}")
+        entry.stored_at = time.time()
+        entry.etag = headers.get("ETag", entry.etag)
+        entry.last_modified = headers.get("Last-Modified", entry.last_modified)
+        self.backend.set(key, entry)
+        return entry.content
+
+    def clear(self) -> None:
+        """Remove every cached response"""
+        self.backend.clear()
+
+    def close(self) -> None:
+        """Release the backend"""
+        self.backend.close()
@@ -0,0 +1,132 @@
+"""
+JSON codec module for Tinder API
+Pluggable JSON encoder/decoder used by the transports for response bodies and
+request payloads: orjson or msgspec when installed, the standard library
+otherwise.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Union
+
+logger = logging.getLogger(__name__)
+
+# Codecs in order of preference
+PREFERRED_CODECS = ("orjson", "msgspec", "json")
+
+
+@dataclass(frozen=True)
+class JSONCodec:
+    """JSON decoder/encoder pair working on bytes"""
+
+    name: str
+    loads: Callable[[Union[bytes, str]], Any]
+    dumps: Callable[[Any], bytes]
+
+
+def _stdlib_codec() -> JSONCodec:
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    return JSONCodec("json", json.loads, lambda obj: encoder.encode(obj).encode("utf-8"))
+
+
+def _orjson_codec() -> JSONCodec:
+    import orjson
+
+    return JSONCodec("orjson", orjson.loads, orjson.dumps)
+
+
+def _msgspec_codec() -> JSONCodec:
+    import msgspec
+
+    decoder = msgspec.json.Decoder()
+    encoder = msgspec.json.Encoder()
+
+    def loads(data: Union[bytes, str]) -> Any:
+        # Raise ValueError on invalid JSON like json and orjson do
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    return JSONCodec("msgspec", loads, encoder.encode)
+
+
+_FACTORIES: Dict[str, Callable[[], JSONCodec]] = {
+    "orjson": _orjson_codec,
+    "msgspec": _msgspec_codec,
+    "json": _stdlib_codec,
+}
+
+
+def available_codecs() -> List[str]:
+    """
+    List the codecs that can be used in this environment
+
+    Returns:
+        Codec names in order of preference
+    """
+    names = []
+    for name in PREFERRED_CODECS:
+        try:
+            _FACTORIES[name]()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def _default_codec() -> JSONCodec:
+    for name in PREFERRED_CODECS:
+        try:
+            return _FACTORIES[name]()
+        except ImportError:
+            continue
+    return _stdlib_codec()
+
+
+_codec = _default_codec()
+logger.debug(f"Using {_codec.name} JSON codec")
+
+
+def get_codec() -> JSONCodec:
+    """
+    Get the JSON codec used by the transports
+
+    Returns:
+        Current codec
+    """
+    return _codec
+
+
+def set_codec(codec: Union[str, JSONCodec]) -> JSONCodec:
+    """
+    Select the JSON codec used by the transports
+
+    Args:
+        codec: "orjson", "msgspec", "json" or a custom JSONCodec
+
+    Returns:
+        The selected codec
+
+    Raises:
+        ValueError: If the codec name is unknown
+        ImportError: If the codec's package is not installed
+    """
+    global _codec
+    if isinstance(codec, str):
+        if codec not in _FACTORIES:
+            raise ValueError(f"Unknown JSON codec {codec!r}, expected one of {PREFERRED_CODECS}")
+        codec = _FACTORIES[codec]()
+    _codec = codec
+    return codec
+
+
+def loads(content: Union[bytes, str]) -> Any:
+    """Decode a JSON document with the current codec"""
+    return _codec.loads(content)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode an object as compact UTF-8 JSON with the current codec"""
+    return _codec.dumps(obj)
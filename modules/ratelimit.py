@@ -0,0 +1,276 @@
+"""
+Rate limiting module for Tinder API
+Token-bucket rate limiting with per-route buckets and an optional global
+bucket, shared by the synchronous transport and the async client. Only swipes
+are paced by default; every route backs off when the server answers
+429 Too Many Requests.
+"""
+
+import asyncio
+import logging
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Rate Limit Configuration
+DEFAULT_RATE: Optional[float] = None  # requests per second across all routes, None to disable
+DEFAULT_BURST = 5
+DEFAULT_ROUTE_LIMITS: Dict[str, Tuple[float, int]] = {
+    "GET /like/{id}": (1.0, 3),
+    "GET /pass/{id}": (1.0, 3),
+    "POST /like/{id}/super": (0.2, 1),
+}
+DEFAULT_RETRY_AFTER = 5.0
+MIN_RATE_FACTOR = 0.1  # adaptive rate never drops below 10% of the configured rate
+
+_ID_SEGMENT = re.compile(r"/(?=[^/]*\d)[^/]{8,}")
+
+
+def route_key(method: str, endpoint: str) -> str:
+    """
+    Build the bucket key of a request, replacing ids in the path with {id}
+
+    Args:
+        method: HTTP method
+        endpoint: API endpoint (without host), may include a query string
+
+    Returns:
+        Route key such as "GET /like/{id}"
+    """
+    path = endpoint.split("?", 1)[0]
+    return f"{method.upper()} {_ID_SEGMENT.sub('/{id}', path)}"
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value
+
+    Args:
+        value: Delay in seconds or an HTTP date
+
+    Returns:
+        Delay in seconds, or None if the value is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class TokenBucket:
+    """Token bucket that hands out reservations instead of blocking"""
+
+    __slots__ = ("rate", "capacity", "base_rate", "tokens", "updated", "blocked_until")
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Initialize the bucket
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (burst size)
+        """
+        self.rate = rate
+        self.base_rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def reserve(self, now: float) -> float:
+        """
+        Take one token, going into debt if the bucket is empty
+
+        Args:
+            now: Current monotonic time
+
+        Returns:
+            Seconds the caller must wait before sending
+        """
+        self._refill(now)
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+    def penalize(self, now: float, retry_after: float) -> None:
+        """Block the bucket for retry_after seconds and halve its rate"""
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+        self.blocked_until = max(self.blocked_until, now + retry_after)
+        self.rate = max(self.base_rate * MIN_RATE_FACTOR, self.rate / 2)
+
+    def recover(self) -> None:
+        """Raise a penalized rate back towards the configured rate"""
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate + self.base_rate * MIN_RATE_FACTOR)
+
+
+class RateLimiter:
+    """
+    Per-route token buckets and an optional global bucket
+
+    Routes without a bucket are not paced until the server answers 429, which
+    blocks every route for the Retry-After delay. The same limiter can be
+    shared by threads (acquire) and coroutines (acquire_async): the lock only
+    guards the bookkeeping, waiting happens outside of it.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        route_limits: Optional[Mapping[str, Tuple[float, int]]] = None,
+    ):
+        """
+        Initialize the rate limiter
+
+        Args:
+            rate: Global requests per second, None for no global bucket
+            burst: Global burst size
+            route_limits: Mapping of route key to (rate, burst)
+        """
+        self.global_bucket = TokenBucket(rate, burst) if rate else None
+        self.blocked_until = 0.0
+        self.route_limits = dict(DEFAULT_ROUTE_LIMITS if route_limits is None else route_limits)
+        self._routes: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _route_bucket(self, key: str) -> Optional[TokenBucket]:
+        bucket = self._routes.get(key)
+        if bucket is None and key in self.route_limits:
+            rate, burst = self.route_limits[key]
+            bucket = self._routes[key] = TokenBucket(rate, burst)
+        return bucket
+
+    def reserve(self, method: str, endpoint: str) -> float:
+        """
+        Reserve a slot for a request
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint (without host)
+
+        Returns:
+            Seconds to wait before sending the request
+        """
+        key = route_key(method, endpoint)
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self.blocked_until - now)
+            if self.global_bucket is not None:
+                wait = max(wait, self.global_bucket.reserve(now))
+            bucket = self._route_bucket(key)
+            if bucket is not None:
+                wait = max(wait, bucket.reserve(now))
+        if wait > 0:
+            logger.debug(f"Rate limited {key}: waiting {wait:.2f}s")
+        return wait
+
+    def acquire(self, method: str, endpoint: str) -> None:
+        """Block the calling thread until the request may be sent"""
+        wait = self.reserve(method, endpoint)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, method: str, endpoint: str) -> None:
+        """Wait without blocking the event loop until the request may be sent"""
+        wait = self.reserve(method, endpoint)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def update(
+        self, method: str, endpoint: str, status_code: int, headers: Mapping[str, str]
+    ) -> Optional[float]:
+        """
+        Adapt the buckets to a response
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint (without host)
+            status_code: Response status code
+            headers: Response headers
+
+        Returns:
+            Retry delay in seconds if the response was a 429, otherwise None
+        """
+        key = route_key(method, endpoint)
+        with self._lock:
+            bucket = self._route_bucket(key)
+            if status_code != 429:
+                if self.global_bucket is not None:
+                    self.global_bucket.recover()
+                if bucket is not None:
+                    bucket.recover()
+                return None
+
+            retry_after = parse_retry_after(headers.get("Retry-After"))
+            if retry_after is None:
+                retry_after = DEFAULT_RETRY_AFTER
+            now = time.monotonic()
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+            if self.global_bucket is not None:
+                self.global_bucket.penalize(now, retry_after)
+            if bucket is not None:
+                bucket.penalize(now, retry_after)
+        logger.warning(f"Rate limited by server on {key}, retrying after {retry_after:.1f}s")
+        return retry_after
+
+
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Get the process-wide rate limiter, creating it on first use
+
+    Returns:
+        Shared rate limiter
+    """
+    global _rate_limiter
+    limiter = _rate_limiter
+    if limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter()
+            limiter = _rate_limiter
+    return limiter
+
+
+def configure_rate_limits(
+    rate: Optional[float] = DEFAULT_RATE,
+    burst: int = DEFAULT_BURST,
+    route_limits: Optional[Mapping[str, Tuple[float, int]]] = None,
+) -> RateLimiter:
+    """
+    Replace the process-wide rate limiter
+
+    Args:
+        rate: Global requests per second, None for no global bucket
+        burst: Global burst size
+        route_limits: Mapping of route key to (rate, burst)
+
+    Returns:
+        The new shared rate limiter
+    """
+    global _rate_limiter
+    with _rate_limiter_lock:
+        _rate_limiter = RateLimiter(rate, burst, route_limits)
+        return _rate_limiter
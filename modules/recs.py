@@ -3,31 +3,27 @@ Recommendations module for Tinder API
 Handles getting user recommendations for swiping.
 """
 
-from typing import Any, Dict, List
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Set
 
-import requests
+from .transport import get_transport
 
-from .auth import API_HOST, TinderAPIError, get_headers, get_json_headers
+logger = logging.getLogger(__name__)
+
+# Recommendations Configuration
+RECS_V2_ENDPOINT = "/v2/recs/core?locale=en-US"
+DEFAULT_PREFETCH_PAGES = 1
+# Pages in a row without new users after which a stream gives up
+MAX_STALE_PAGES = 3
+# Share of the current page's new users left when the next page is prefetched
+PREFETCH_REMAINING = 0.25
 
 
 def _make_request(method: str, endpoint: str, json_data: Dict = None) -> Dict[str, Any]:
     """Make HTTP request to Tinder API"""
-    url = f"{API_HOST}{endpoint}"
-    headers = get_json_headers() if json_data else get_headers()
-
-    try:
-        if method.upper() == "GET":
-            response = requests.get(url, headers=headers)
-        elif method.upper() == "POST":
-            response = requests.post(url, headers=headers, json=json_data)
-        else:
-            raise TinderAPIError(f"Unsupported HTTP method: {method}")
-
-        response.raise_for_status()
-        return response.json()
-
-    except requests.exceptions.RequestException as e:
-        raise TinderAPIError(f"API request failed: {str(e)}")
+    return get_transport().request(method, endpoint, json_data=json_data)
 
 
 def get_recommendations() -> List[Dict[str, Any]]:
@@ -50,3 +46,154 @@ def get_recommendations_v2() -> List[Dict[str, Any]]:
     """
     response = _make_request("GET", "/v2/recs/core?locale=en-US")
     return response.get("results", [])
+
+
+def parse_recs_v2(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Extract the user profiles from a /v2/recs/core response
+
+    Args:
+        response: Response shaped {"data": {"results": [{"user": {...}}, ...]}}
+
+    Returns:
+        List of user profiles
+    """
+    results = response.get("data", {}).get("results", [])
+    return [result["user"] for result in results if "user" in result]
+
+
+class RecsPager:
+    """
+    Prefetch and dedupe policy shared by the recommendation streams
+
+    The next page is only requested once the consumer has taken all but
+    PREFETCH_REMAINING of the new users of the current page. Requested any
+    earlier, before the current users were swiped, it would mostly repeat
+    them; requested later, the consumer waits for it. A page that repeats
+    users already seen can still happen, so the stream only ends on an empty
+    page or after max_stale_pages pages in a row without new users.
+    """
+
+    def __init__(
+        self,
+        prefetch: int = DEFAULT_PREFETCH_PAGES,
+        max_pages: Optional[int] = None,
+        seen: Optional[Set[str]] = None,
+        max_stale_pages: int = MAX_STALE_PAGES,
+    ):
+        """
+        Initialize the pager
+
+        Args:
+            prefetch: Maximum number of pages requested ahead of the one being consumed
+            max_pages: Optional maximum number of pages to request
+            seen: Optional set of user IDs already seen, updated in place so it can
+                be shared between iterators
+            max_stale_pages: Pages in a row without new users that end the stream
+        """
+        self.prefetch = prefetch
+        self.max_pages = max_pages
+        self.seen = set() if seen is None else seen
+        self.max_stale_pages = max_stale_pages
+        self.requested = 0
+        self.stale = 0
+        self.done = False
+        self.page_size = 0
+        self.remaining = 0
+
+    def wants_page(self, pending: int) -> bool:
+        """
+        Check if another page should be requested, counting it if so
+
+        A page is always requested when nothing is left to consume; otherwise
+        only while fewer than prefetch pages are pending and the page being
+        consumed is drained down to PREFETCH_REMAINING.
+
+        Args:
+            pending: Number of pages requested and not consumed yet
+
+        Returns:
+            True if the caller should request a page now
+        """
+        if self.done:
+            return False
+        if self.max_pages is not None and self.requested >= self.max_pages:
+            return False
+        if pending or self.remaining:
+            if pending >= self.prefetch or not self.page_size:
+                return False
+            if self.remaining > self.page_size * PREFETCH_REMAINING:
+                return False
+        self.requested += 1
+        return True
+
+    def fresh(self, page: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the users of a page that were not seen yet, marking them seen
+
+        Args:
+            page: User profiles of one page
+
+        Returns:
+            Iterator of new user profiles
+        """
+        users, ids = [], set()
+        for user in page:
+            if user["_id"] not in self.seen and user["_id"] not in ids:
+                ids.add(user["_id"])
+                users.append(user)
+        self.stale = 0 if users else self.stale + 1
+        self.done = not page or self.stale >= self.max_stale_pages
+        self.page_size = self.remaining = len(users)
+        logger.debug(f"Recommendations page with {len(users)} new users")
+        for user in users:
+            self.remaining -= 1
+            if user["_id"] in self.seen:
+                continue
+            self.seen.add(user["_id"])
+            yield user
+
+
+def iter_recommendations(
+    prefetch: int = DEFAULT_PREFETCH_PAGES,
+    max_pages: Optional[int] = None,
+    seen: Optional[Set[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream recommendations page by page, prefetching ahead of the consumer
+
+    Once the caller has consumed most of a page, the next one is requested in
+    a background thread (see RecsPager). Users already yielded are skipped,
+    and the stream ends on an empty page or after MAX_STALE_PAGES pages in a
+    row without new users.
+
+    Args:
+        prefetch: Maximum number of pages requested ahead of the one being consumed
+        max_pages: Optional maximum number of pages to request
+        seen: Optional set of user IDs already seen, updated in place so it can
+            be shared between iterators
+
+    Returns:
+        Iterator of user profiles
+    """
+    pager = RecsPager(prefetch, max_pages, seen)
+    pending = deque()
+
+    def fetch_page() -> List[Dict[str, Any]]:
+        return parse_recs_v2(_make_request("GET", RECS_V2_ENDPOINT))
+
+    # A single worker keeps page requests sequential, like a user scrolling
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="recs-prefetch") as pool:
+        try:
+            while not pager.done:
+                while pager.wants_page(len(pending)):
+                    pending.append(pool.submit(fetch_page))
+                if not pending:
+                    return
+                for user in pager.fresh(pending.popleft().result()):
+                    yield user
+                    while pager.wants_page(len(pending)):
+                        pending.append(pool.submit(fetch_page))
+        finally:
+            for future in pending:
+                future.cancel()
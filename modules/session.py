@@ -0,0 +1,132 @@
+"""
+HTTP session module for Tinder API
+Provides a process-wide pooled, keep-alive requests session shared by the
+synchronous modules.
+"""
+
+import atexit
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Pool Configuration
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 16
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_session_config: Dict[str, Any] = {
+    "pool_connections": DEFAULT_POOL_CONNECTIONS,
+    "pool_maxsize": DEFAULT_POOL_MAXSIZE,
+    "max_retries": DEFAULT_MAX_RETRIES,
+    "backoff_factor": DEFAULT_BACKOFF_FACTOR,
+    "keep_alive": True,
+}
+
+
+def _build_session(
+    pool_connections: int,
+    pool_maxsize: int,
+    max_retries: int,
+    backoff_factor: float,
+    keep_alive: bool,
+) -> requests.Session:
+    """Create a session with a pooled HTTP adapter mounted for http and https"""
+    # Only connection establishment is retried at the adapter level: the
+    # request has not reached the server yet, so this is safe for every
+    # method. Status and read retries stay with the caller.
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=0,
+        status=0,
+        other=0,
+        backoff_factor=backoff_factor,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+        pool_block=False,
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def configure_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+    keep_alive: bool = True,
+) -> None:
+    """
+    Configure the shared session used by the synchronous modules
+
+    The current session, if any, is closed and a new one is created lazily
+    with the given settings on the next request.
+
+    Args:
+        pool_connections: Number of host pools to cache
+        pool_maxsize: Maximum number of connections kept per host
+        max_retries: Connection retries performed by the HTTP adapter
+        backoff_factor: Backoff factor between adapter retries
+        keep_alive: Keep connections open between requests
+    """
+    global _session
+    with _session_lock:
+        _session_config.update(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            backoff_factor=backoff_factor,
+            keep_alive=keep_alive,
+        )
+        if _session is not None:
+            _session.close()
+            _session = None
+    logger.debug(f"Session configured: {_session_config}")
+
+
+def get_session() -> requests.Session:
+    """
+    Get the process-wide pooled session, creating it on first use
+
+    Returns:
+        Shared requests session
+    """
+    global _session
+    session = _session
+    if session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session(**_session_config)
+                logger.debug("Created pooled HTTP session")
+            session = _session
+    return session
+
+
+def close_session() -> None:
+    """Close the shared session and release its pooled connections"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+atexit.register(close_session)
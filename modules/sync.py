@@ -0,0 +1,209 @@
+"""
+Updates sync module for Tinder API
+Incremental /updates synchronisation: the newest last_activity_date cursor
+and the match/message state are persisted locally, so each poll only
+requests and merges the activity since the previous one.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SyncDelta:
+    """Changes merged by one poll"""
+
+    new_matches: List[str] = field(default_factory=list)
+    updated_matches: List[str] = field(default_factory=list)
+    new_messages: List[Dict[str, Any]] = field(default_factory=list)
+    removed_matches: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(
+            self.new_matches or self.updated_matches or self.new_messages or self.removed_matches
+        )
+
+
+class SyncState:
+    """Local copy of the matches and messages with the /updates cursor"""
+
+    def __init__(self, cursor: str = "", matches: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Initialize the sync state
+
+        Args:
+            cursor: last_activity_date of the newest merged activity
+            matches: Matches keyed by match ID, each with its messages
+        """
+        self.cursor = cursor
+        self.matches: Dict[str, Dict[str, Any]] = matches or {}
+
+    @classmethod
+    def load(cls, path: str) -> "SyncState":
+        """
+        Load the state from a JSON file
+
+        Args:
+            path: State file. A missing file gives an empty state
+
+        Returns:
+            Loaded state
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls()
+        return cls(data.get("cursor", ""), data.get("matches", {}))
+
+    def save(self, path: str) -> None:
+        """
+        Atomically write the state to a JSON file
+
+        Args:
+            path: State file
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"cursor": self.cursor, "matches": self.matches}, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def merge(self, updates: Dict[str, Any]) -> SyncDelta:
+        """
+        Merge an /updates response into the state
+
+        Args:
+            updates: Response of get_updates(cursor)
+
+        Returns:
+            Changes applied to the state
+        """
+        delta = SyncDelta()
+        newest = self.cursor
+
+        for match in updates.get("matches", []):
+            match_id = match.get("_id") or match.get("id")
+            if not match_id:
+                continue
+            messages = match.get("messages", [])
+            current = self.matches.get(match_id)
+            if current is None:
+                self.matches[match_id] = dict(match, messages=list(messages))
+                delta.new_matches.append(match_id)
+                delta.new_messages.extend(messages)
+            else:
+                known = {message.get("_id") for message in current["messages"]}
+                fresh = [message for message in messages if message.get("_id") not in known]
+                changed = bool(fresh) or any(
+                    current.get(k) != v for k, v in match.items() if k != "messages"
+                )
+                current.update((k, v) for k, v in match.items() if k != "messages")
+                current["messages"].extend(fresh)
+                if changed:
+                    delta.updated_matches.append(match_id)
+                delta.new_messages.extend(fresh)
+            newest = max(newest, match.get("last_activity_date") or "")
+            for message in messages:
+                newest = max(newest, message.get("sent_date") or "")
+
+        for match_id in updates.get("blocks", []):
+            if self.matches.pop(match_id, None) is not None:
+                delta.removed_matches.append(match_id)
+
+        self.cursor = max(newest, updates.get("last_activity_date") or "")
+        return delta
+
+
+class UpdatesSync:
+    """Synchronous incremental /updates poller"""
+
+    def __init__(
+        self,
+        get_updates: Optional[Callable[[str], Dict[str, Any]]] = None,
+        path: Optional[str] = None,
+    ):
+        """
+        Initialize the sync engine
+
+        Args:
+            get_updates: Callable taking the last_activity_date cursor, such as
+                modules.api.get_updates (the default) or Tinder/tinder_api.get_updates
+            path: Optional JSON file persisting the state between runs
+        """
+        if get_updates is None:
+            from .api import get_updates
+        self._get_updates = get_updates
+        self.path = path
+        self.state = SyncState.load(path) if path else SyncState()
+
+    @property
+    def matches(self) -> Dict[str, Dict[str, Any]]:
+        """Synchronised matches keyed by match ID"""
+        return self.state.matches
+
+    def poll(self) -> SyncDelta:
+        """
+        Fetch and merge the activity since the stored cursor
+
+        Returns:
+            Changes merged by this poll
+        """
+        cursor = self.state.cursor
+        updates = self._get_updates(cursor)
+        delta = self.state.merge(updates)
+        logger.debug(
+            f"Synced updates: {len(delta.new_matches)} new matches, "
+            f"{len(delta.new_messages)} new messages, cursor {self.state.cursor!r}"
+        )
+        if self.path and (delta or self.state.cursor != cursor):
+            self.state.save(self.path)
+        return delta
+
+
+class AsyncUpdatesSync:
+    """Asynchronous incremental /updates poller"""
+
+    def __init__(
+        self, get_updates: Callable[[str], Awaitable[Dict[str, Any]]], path: Optional[str] = None
+    ):
+        """
+        Initialize the sync engine
+
+        Args:
+            get_updates: Coroutine function taking the cursor, such as
+                AsyncTinderAPI.get_updates
+            path: Optional JSON file persisting the state between runs
+        """
+        self._get_updates = get_updates
+        self.path = path
+        self.state = SyncState.load(path) if path else SyncState()
+
+    @property
+    def matches(self) -> Dict[str, Dict[str, Any]]:
+        """Synchronised matches keyed by match ID"""
+        return self.state.matches
+
+    async def poll(self) -> SyncDelta:
+        """
+        Fetch and merge the activity since the stored cursor
+
+        Returns:
+            Changes merged by this poll
+        """
+        cursor = self.state.cursor
+        updates = await self._get_updates(cursor)
+        delta = self.state.merge(updates)
+        if self.path and (delta or self.state.cursor != cursor):
+            self.state.save(self.path)
+        return delta
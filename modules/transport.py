@@ -0,0 +1,629 @@
+"""
+Transport module for Tinder API
+Single request engine shared by every client in the modules package, with
+pluggable HTTP backends, uniform timeouts, retry/backoff and one
+instrumentation point.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import requests
+
+from . import codec
+from .auth import API_HOST, TinderAPIError, get_headers, get_json_headers
+from .cache import ResponseCache
+from .ratelimit import RateLimiter, get_rate_limiter
+from .session import get_session
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - httpx is optional for sync usage
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+# Transport Configuration
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 1.0
+DEFAULT_BACKOFF_CAP = 30.0
+DEFAULT_RETRY_RATIO = 0.2
+DEFAULT_RETRY_RESERVE = 10
+SUPPORTED_METHODS = frozenset({"GET", "POST", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+# Returned by _handle when an attempt should be retried
+_RETRY = object()
+
+
+class TransportTimeout(Exception):
+    """Raised by a backend when a request times out"""
+
+    pass
+
+
+class TransportError(Exception):
+    """Raised by a backend when a request fails before a response arrives"""
+
+    pass
+
+
+@dataclass
+class Response:
+    """Backend-independent HTTP response"""
+
+    status_code: int
+    headers: Mapping[str, str]
+    content: bytes
+
+    def json(self) -> Dict[str, Any]:
+        """Decode the response body as JSON (empty bodies decode to {})"""
+        return _decode(self.content)
+
+
+def _decode(content: bytes) -> Dict[str, Any]:
+    if not content:
+        return {}
+    return codec.loads(content)
+
+
+def _decode_response(method: str, endpoint: str, content: bytes) -> Dict[str, Any]:
+    """
+    Decode a response body
+
+    Raises:
+        TinderAPIError: If the body is not valid JSON
+    """
+    try:
+        return _decode(content)
+    except ValueError as e:
+        logger.error(f"Invalid JSON response for {method} {endpoint}: {e}")
+        raise TinderAPIError(f"Invalid JSON response for {method} {endpoint}: {e}") from e
+
+
+def _encode(
+    headers: Mapping[str, str], json_data: Optional[Dict]
+) -> Tuple[Mapping[str, str], Optional[bytes]]:
+    """Encode a JSON request body with the shared codec, setting its content type"""
+    if json_data is None:
+        return headers, None
+    if not any(name.lower() == "content-type" for name in headers):
+        headers = {**headers, "Content-Type": "application/json"}
+    return headers, codec.dumps(json_data)
+
+
+@dataclass
+class RequestEvent:
+    """Instrumentation record emitted after every request attempt"""
+
+    method: str
+    endpoint: str
+    attempt: int
+    elapsed: float
+    status_code: Optional[int] = None
+    error: Optional[BaseException] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+RequestHook = Callable[[RequestEvent], None]
+
+
+class RequestsBackend:
+    """Backend using the shared pooled requests session"""
+
+    def __init__(self, session: Optional[requests.Session] = None):
+        """
+        Initialize the backend
+
+        Args:
+            session: Optional session. Defaults to the process-wide pooled session
+        """
+        self._session = session
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Mapping[str, str],
+        data: Optional[Dict] = None,
+        json_data: Optional[Dict] = None,
+        timeout: float,
+    ) -> Response:
+        """Send a request and return the normalized response"""
+        session = self._session or get_session()
+        headers, body = _encode(headers, json_data)
+        try:
+            response = session.request(
+                method, url, headers=headers, data=data if body is None else body, timeout=timeout
+            )
+        except requests.exceptions.Timeout as e:
+            raise TransportTimeout(str(e)) from e
+        except requests.exceptions.RequestException as e:
+            raise TransportError(str(e)) from e
+        return Response(response.status_code, response.headers, response.content)
+
+    def close(self) -> None:
+        """Close the backend (the shared session is closed at exit)"""
+        if self._session is not None:
+            self._session.close()
+
+
+class HTTPXBackend:
+    """Backend using a synchronous httpx client"""
+
+    def __init__(self, client: Optional["httpx.Client"] = None, **client_options):
+        """
+        Initialize the backend
+
+        Args:
+            client: Optional httpx client. If not provided, one is created
+            **client_options: Options passed to httpx.Client
+        """
+        if httpx is None:
+            raise TinderAPIError("httpx is required for HTTPXBackend")
+        self._client = client or httpx.Client(**client_options)
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Mapping[str, str],
+        data: Optional[Dict] = None,
+        json_data: Optional[Dict] = None,
+        timeout: float,
+    ) -> Response:
+        """Send a request and return the normalized response"""
+        headers, body = _encode(headers, json_data)
+        try:
+            response = self._client.request(
+                method, url, headers=headers, data=data, content=body, timeout=timeout
+            )
+        except httpx.TimeoutException as e:
+            raise TransportTimeout(str(e)) from e
+        except httpx.RequestError as e:
+            raise TransportError(str(e)) from e
+        return Response(response.status_code, response.headers, response.content)
+
+    def close(self) -> None:
+        """Close the httpx client"""
+        self._client.close()
+
+
+class AsyncHTTPXBackend:
+    """Backend using an asynchronous httpx client"""
+
+    def __init__(self, client: Optional["httpx.AsyncClient"] = None, **client_options):
+        """
+        Initialize the backend
+
+        Args:
+            client: Optional httpx async client. If not provided, one is created
+            **client_options: Options passed to httpx.AsyncClient
+        """
+        if httpx is None:
+            raise TinderAPIError("httpx is required for AsyncHTTPXBackend")
+        self._client = client or httpx.AsyncClient(**client_options)
+
+    async def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Mapping[str, str],
+        data: Optional[Dict] = None,
+        json_data: Optional[Dict] = None,
+        timeout: float,
+    ) -> Response:
+        """Send a request and return the normalized response"""
+        headers, body = _encode(headers, json_data)
+        try:
+            response = await self._client.request(
+                method, url, headers=headers, data=data, content=body, timeout=timeout
+            )
+        except httpx.TimeoutException as e:
+            raise TransportTimeout(str(e)) from e
+        except httpx.RequestError as e:
+            raise TransportError(str(e)) from e
+        return Response(response.status_code, response.headers, response.content)
+
+    async def close(self) -> None:
+        """Close the httpx async client"""
+        await self._client.aclose()
+
+
+class RetryBudget:
+    """
+    Bound on the share of requests that may be retried
+
+    Every request deposits ratio tokens and every retry withdraws one, so
+    once the reserve is spent at most ratio retries are made per request.
+    A failing server then sees a bounded amount of extra load instead of
+    max_retries times the traffic.
+    """
+
+    def __init__(self, ratio: float = DEFAULT_RETRY_RATIO, reserve: int = DEFAULT_RETRY_RESERVE):
+        """
+        Initialize the retry budget
+
+        Args:
+            ratio: Retries earned by each request
+            reserve: Maximum number of retries that can be banked
+        """
+        self.ratio = ratio
+        self.reserve = reserve
+        self._balance = float(reserve)
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        """Record a new request"""
+        with self._lock:
+            self._balance = min(float(self.reserve), self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Spend one retry
+
+        Returns:
+            True if the retry is allowed
+        """
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+class _BaseTransport:
+    """Request policy shared by the sync and async transports"""
+
+    def __init__(
+        self,
+        backend,
+        *,
+        base_url: str = API_HOST,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_cap: float = DEFAULT_BACKOFF_CAP,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+        retry_budget: Optional[RetryBudget] = None,
+    ):
+        self.backend = backend
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._rate_limiter = rate_limiter
+        self.cache = cache
+        self.retry_budget = retry_budget
+        self._hooks: List[RequestHook] = []
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """Rate limiter pacing this transport (the shared one by default)"""
+        return self._rate_limiter or get_rate_limiter()
+
+    def add_hook(self, hook: RequestHook) -> None:
+        """
+        Register an instrumentation hook
+
+        Args:
+            hook: Callable receiving a RequestEvent after every attempt
+        """
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: RequestHook) -> None:
+        """Unregister an instrumentation hook"""
+        self._hooks.remove(hook)
+
+    def _emit(self, event: RequestEvent) -> None:
+        for hook in self._hooks:
+            try:
+                hook(event)
+            except Exception:
+                logger.exception("Request hook failed")
+
+    def _prepare(self, method: str, endpoint: str, headers: Optional[Mapping[str, str]], json_data):
+        method = method.upper()
+        if method not in SUPPORTED_METHODS:
+            raise TinderAPIError(f"Unsupported HTTP method: {method}")
+        if headers is None:
+            headers = get_json_headers() if json_data is not None else get_headers()
+        return method, f"{self.base_url}{endpoint}", headers
+
+    def _from_cache(self, method: str, endpoint: str, headers: Mapping[str, str]):
+        """
+        Serve a request from the response cache if possible
+
+        Returns:
+            Decoded cached body (or _RETRY on a miss) and the headers to send
+        """
+        if self.cache is None:
+            return _RETRY, headers
+        content, conditional = self.cache.lookup(method, endpoint, headers.get("X-Auth-Token"))
+        if content is not None:
+            self._emit(RequestEvent(method, endpoint, 0, 0.0, 200, extra={"cache": "hit"}))
+            return _decode_response(method, endpoint, content), headers
+        if conditional:
+            headers = {**headers, **conditional}
+        return _RETRY, headers
+
+    def _retry_delay(self, attempt: int, response: Optional[Response]) -> float:
+        if response is not None and response.status_code == 429:
+            # The rate limiter was penalized with Retry-After; acquire() waits
+            return 0.0
+        # Full jitter spreads out clients that failed at the same moment
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2**attempt))
+
+    def _check_budget(self, method: str, endpoint: str) -> None:
+        """
+        Spend a retry from the budget
+
+        Raises:
+            TinderAPIError: If the retry budget is exhausted
+        """
+        if self.retry_budget is not None and not self.retry_budget.withdraw():
+            raise TinderAPIError(f"Retry budget exhausted for {method} {endpoint}")
+
+    def _handle(
+        self,
+        method: str,
+        endpoint: str,
+        attempt: int,
+        max_retries: int,
+        started: float,
+        response: Optional[Response] = None,
+        error: Optional[BaseException] = None,
+        token: Optional[str] = None,
+    ) -> Any:
+        """
+        Decide what to do with one attempt
+
+        Returns:
+            Decoded body on success, _RETRY if the attempt should be retried
+
+        Raises:
+            TinderAPIError: If the request failed and must not be retried
+        """
+        elapsed = time.perf_counter() - started
+        status = response.status_code if response is not None else None
+        self._emit(RequestEvent(method, endpoint, attempt, elapsed, status, error))
+        last = attempt >= max_retries
+        if response is not None:
+            self.rate_limiter.update(method, endpoint, status, response.headers)
+
+        if isinstance(error, TransportTimeout):
+            logger.warning(f"Request timeout (attempt {attempt + 1}): {error}")
+            if last:
+                raise TinderAPIError(f"Request timeout after {max_retries + 1} attempts")
+            return _RETRY
+        if error is not None:
+            logger.error(f"Request failed: {error}")
+            if last:
+                raise TinderAPIError(
+                    f"API request failed after {max_retries + 1} attempts: {str(error)}"
+                )
+            return _RETRY
+
+        if 200 <= status < 300:
+            logger.debug(f"Request successful: {status}")
+            body = _decode_response(method, endpoint, response.content)
+            if self.cache is not None:
+                self.cache.store(method, endpoint, response.content, response.headers, token)
+            return body
+        if status == 304 and self.cache is not None:
+            content = self.cache.revalidate(method, endpoint, response.headers, token)
+            if content is not None:
+                return _decode_response(method, endpoint, content)
+        if status in RETRY_STATUSES and not last:
+            logger.warning(f"Server error {status} (attempt {attempt + 1})")
+            return _RETRY
+        if status == 429 and not last:
+            return _RETRY
+        logger.error(f"HTTP error {status} for {method} {endpoint}")
+        raise TinderAPIError(f"HTTP error {status} for {method} {endpoint}")
+
+
+class Transport(_BaseTransport):
+    """Synchronous transport engine"""
+
+    def __init__(self, backend=None, **options):
+        """
+        Initialize the transport
+
+        Args:
+            backend: HTTP backend. Defaults to RequestsBackend
+            **options: base_url, timeout, max_retries, backoff_base, backoff_cap,
+                rate_limiter, cache and retry_budget
+        """
+        super().__init__(backend or RequestsBackend(), **options)
+
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        data: Optional[Dict] = None,
+        json_data: Optional[Dict] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        max_retries: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Make HTTP request to Tinder API with retry logic
+
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE)
+            endpoint: API endpoint (without host)
+            data: Form data for POST requests
+            json_data: JSON data for POST/PUT requests
+            headers: Request headers. Defaults to the auth module headers
+            max_retries: Maximum number of retry attempts
+
+        Returns:
+            API response as dictionary
+
+        Raises:
+            TinderAPIError: If request fails after all retries
+        """
+        method, url, headers = self._prepare(method, endpoint, headers, json_data)
+        token = headers.get("X-Auth-Token")
+        cached, headers = self._from_cache(method, endpoint, headers)
+        if cached is not _RETRY:
+            return cached
+        max_retries = self.max_retries if max_retries is None else max_retries
+        if self.retry_budget is not None:
+            self.retry_budget.deposit()
+
+        for attempt in range(max_retries + 1):
+            self.rate_limiter.acquire(method, endpoint)
+            logger.debug(f"Making {method} request to {endpoint} (attempt {attempt + 1})")
+            response = None
+            started = time.perf_counter()
+            try:
+                response = self.backend.send(
+                    method,
+                    url,
+                    headers=headers,
+                    data=data,
+                    json_data=json_data,
+                    timeout=self.timeout,
+                )
+            except (TransportTimeout, TransportError) as e:
+                result = self._handle(method, endpoint, attempt, max_retries, started, error=e)
+            else:
+                result = self._handle(
+                    method, endpoint, attempt, max_retries, started, response, token=token
+                )
+            if result is not _RETRY:
+                return result
+            self._check_budget(method, endpoint)
+            time.sleep(self._retry_delay(attempt, response))
+        raise RuntimeError("Unreachable code in transport retry loop")
+
+    def close(self) -> None:
+        """Close the underlying backend"""
+        self.backend.close()
+
+
+class AsyncTransport(_BaseTransport):
+    """Asynchronous transport engine"""
+
+    def __init__(self, backend=None, **options):
+        """
+        Initialize the transport
+
+        Args:
+            backend: Async HTTP backend. Defaults to AsyncHTTPXBackend
+            **options: base_url, timeout, max_retries, backoff_base, backoff_cap,
+                rate_limiter, cache and retry_budget
+        """
+        super().__init__(backend or AsyncHTTPXBackend(), **options)
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        data: Optional[Dict] = None,
+        json_data: Optional[Dict] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        max_retries: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Make async HTTP request to Tinder API with retry logic
+
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE)
+            endpoint: API endpoint (without host)
+            data: Form data for POST requests
+            json_data: JSON data for POST/PUT requests
+            headers: Request headers. Defaults to the auth module headers
+            max_retries: Maximum number of retry attempts
+
+        Returns:
+            API response as dictionary
+
+        Raises:
+            TinderAPIError: If request fails after all retries
+        """
+        method, url, headers = self._prepare(method, endpoint, headers, json_data)
+        token = headers.get("X-Auth-Token")
+        cached, headers = self._from_cache(method, endpoint, headers)
+        if cached is not _RETRY:
+            return cached
+        max_retries = self.max_retries if max_retries is None else max_retries
+        if self.retry_budget is not None:
+            self.retry_budget.deposit()
+
+        for attempt in range(max_retries + 1):
+            await self.rate_limiter.acquire_async(method, endpoint)
+            logger.debug(f"Making {method} request to {endpoint} (attempt {attempt + 1})")
+            response = None
+            started = time.perf_counter()
+            try:
+                response = await self.backend.send(
+                    method,
+                    url,
+                    headers=headers,
+                    data=data,
+                    json_data=json_data,
+                    timeout=self.timeout,
+                )
+            except (TransportTimeout, TransportError) as e:
+                result = self._handle(method, endpoint, attempt, max_retries, started, error=e)
+            else:
+                result = self._handle(
+                    method, endpoint, attempt, max_retries, started, response, token=token
+                )
+            if result is not _RETRY:
+                return result
+            self._check_budget(method, endpoint)
+            await asyncio.sleep(self._retry_delay(attempt, response))
+        raise RuntimeError("Unreachable code in transport retry loop")
+
+    async def close(self) -> None:
+        """Close the underlying backend"""
+        await self.backend.close()
+
+
+_transport: Optional[Transport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> Transport:
+    """
+    Get the process-wide synchronous transport, creating it on first use
+
+    Returns:
+        Shared transport
+    """
+    global _transport
+    transport = _transport
+    if transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = Transport()
+            transport = _transport
+    return transport
+
+
+def set_transport(transport: Transport) -> None:
+    """
+    Replace the process-wide synchronous transport
+
+    Args:
+        transport: Transport used by modules.api, recs, swipe and location
+    """
+    global _transport
+    with _transport_lock:
+        _transport = transport
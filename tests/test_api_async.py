@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from modules import api_async
+from modules.api_async import AsyncTinderAPI, TinderAPIError
+
+
+def test_pool_limits_are_configurable():
+    async def run():
+        async with AsyncTinderAPI(
+            "token", max_connections=4, max_keepalive_connections=2, keepalive_expiry=1.5
+        ) as api:
+            pool = api.client._transport._pool
+            return pool._max_connections, pool._max_keepalive_connections, pool._keepalive_expiry
+
+    assert asyncio.run(run()) == (4, 2, 1.5)
+
+
+def test_http2_requires_h2(monkeypatch):
+    monkeypatch.setattr(api_async, "http2_available", lambda: False)
+    with pytest.raises(TinderAPIError, match="h2"):
+        AsyncTinderAPI("token", http2=True)
+
+
+def make_api(server, **options):
+    from modules.ratelimit import RateLimiter
+
+    limiter = RateLimiter(route_limits={})
+    api = AsyncTinderAPI("token", rate_limiter=limiter, base_url=server.url, **options)
+    api._open()
+    api.transport.backoff_base = 0
+    return api
+
+
+def test_make_request_retries_server_errors_and_429():
+    from benchmarks.mock_server import MockTinderServer
+
+    async def run():
+        async with MockTinderServer(seed=4) as server:
+            api = make_api(server)
+            server.inject(503)
+            server.inject(429, retry_after=0.05)
+            try:
+                profile = await api.get_profile()
+            finally:
+                await api.close()
+            return profile, server.hits["/profile"]
+
+    profile, hits = asyncio.run(run())
+    assert profile["_id"] == "me"
+    assert hits == 3
+
+
+def test_make_request_converts_status_errors_and_spends_budget():
+    from benchmarks.mock_server import MockTinderServer
+    from modules.transport import RetryBudget
+
+    async def run():
+        async with MockTinderServer(seed=5) as server:
+            api = make_api(server, retry_budget=RetryBudget(ratio=0, reserve=1))
+            try:
+                server.inject(404)
+                with pytest.raises(TinderAPIError, match="404"):
+                    await api.get_meta()
+                server.inject(503, count=3)
+                with pytest.raises(TinderAPIError, match="budget"):
+                    await api.get_meta()
+            finally:
+                await api.close()
+            return server.hits["/meta"]
+
+    assert asyncio.run(run()) == 3
+
+
+def test_batches_stream_results_with_bounded_concurrency():
+    from benchmarks.mock_server import MockTinderServer
+
+    async def run():
+        async with MockTinderServer(seed=6, latency=0.01) as server:
+            api = make_api(server)
+            try:
+                server.inject(404)
+                users = [r async for r in api.get_user_infos(["a", "b", "c", "d", "e"], 2)]
+                matches = [r async for r in api.map([("GET", "/matches/m1")], concurrency=4)]
+            finally:
+                await api.close()
+            return users, matches, server.max_in_flight
+
+    users, matches, max_in_flight = asyncio.run(run())
+    assert sorted(r.key for r in users) == ["a", "b", "c", "d", "e"]
+    failed = [r for r in users if not r.ok]
+    assert len(failed) == 1 and isinstance(failed[0].error, TinderAPIError)
+    assert all(r.result["results"]["_id"] == r.key for r in users if r.ok)
+    assert matches[0].key == ("GET", "/matches/m1")
+    assert matches[0].result["results"]["_id"] == "m1"
+    assert max_in_flight <= 2
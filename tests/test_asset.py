@@ -0,0 +1,149 @@
+import pytest
+
+from tinder import types
+from tinder.models import Asset
+from tinder.state import ConnectionState
+
+STATE = ConnectionState(dispatch=None, handlers={}, http=None, loop=None)
+
+PHOTO = {
+    "id": "p1",
+    "url": "https://images/p1.jpg",
+    "processedFiles": [
+        {"url": f"https://images/p1_{width}.jpg", "width": width, "height": width * 5 // 4}
+        for width in (640, 320, 172, 84)
+    ],
+}
+
+
+def test_processed_variants_are_built_on_first_access():
+    asset = Asset(STATE, data=PHOTO)
+    assert asset._processed is None
+    processed = asset.processed
+    assert list(processed) == ["640x800", "320x400", "172x215", "84x105"]
+    assert processed["84x105"].url == "https://images/p1_84.jpg"
+    assert asset.processed is processed
+
+
+def test_best_size_picks_smallest_variant_wide_enough():
+    for asset in (
+        Asset(STATE, data=PHOTO),
+        Asset._from_payload(STATE, types.convert(types.PhotoPayload, PHOTO)),
+    ):
+        assert asset.best_size(200).url == "https://images/p1_320.jpg"
+        assert asset.best_size(320).url == "https://images/p1_320.jpg"
+        assert asset.best_size(10).url == "https://images/p1_84.jpg"
+        assert asset.best_size(4000).url == "https://images/p1_640.jpg"
+        assert asset._processed is None
+        processed = asset.processed
+        assert asset.best_size(100) is processed["172x215"]
+
+
+def test_best_size_without_variants_returns_the_asset():
+    asset = Asset(STATE, url="https://images/raw.jpg")
+    assert asset.best_size(320) is asset
+    assert not asset.processed
+
+
+def test_asset_cache_evicts_least_recently_used(tmp_path):
+    from tinder.cache import AssetCache
+
+    cache = AssetCache(tmp_path, max_bytes=10)
+    cache.store("a", b"aaaa")
+    cache.store("b", b"bbbb")
+    assert cache.read("a") == b"aaaa"
+    cache.store("c", b"cccc")
+    assert cache.read("b") is None
+    assert cache.read("a") == b"aaaa" and cache.read("c") == b"cccc"
+    cache.store("huge", b"x" * 11)
+    assert cache.read("huge") is None
+
+    reopened = AssetCache(tmp_path, max_bytes=10)
+    assert reopened.read("a") == b"aaaa"
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        [AssetCache.name("a"), AssetCache.name("c")]
+    )
+
+
+def test_asset_streams_to_file_and_serves_repeats_from_cache(tmp_path):
+    import asyncio
+    import io
+
+    from benchmarks.mock_server import MockTinderServer
+    from tinder.cache import AssetCache
+    from tinder.client import Client
+
+    async def run():
+        async with MockTinderServer(seed=3, asset_size=300 * 1024) as server:
+            client = Client(asset_cache=AssetCache(tmp_path / "assets"))
+            await client.login("token")
+            try:
+                asset = Asset(client._connection, data=server.photo())
+
+                stream = client.http.iter_asset(asset.url, key=asset.id, chunk_size=1024)
+                assert len(await stream.__anext__()) <= 1024
+                await stream.aclose()
+                assert not list((tmp_path / "assets").iterdir())
+
+                written = await asset.save(tmp_path / "photo.jpg")
+                buffer = io.BytesIO()
+                assert await asset.save(buffer) == written == 300 * 1024
+                assert await asset.read() == buffer.read()
+                assert (tmp_path / "photo.jpg").read_bytes() == buffer.getvalue()
+                assert server.hits["/assets/{name}"] == 2
+            finally:
+                await client.close()
+
+    asyncio.run(run())
+
+
+def test_failed_save_keeps_the_existing_file(tmp_path, monkeypatch):
+    import asyncio
+
+    asset = Asset(STATE, data=PHOTO)
+    target = tmp_path / "photo.jpg"
+    target.write_bytes(b"old")
+
+    async def broken_chunks(self):
+        yield b"new"
+        raise ConnectionResetError
+
+    monkeypatch.setattr(Asset, "iter_chunks", broken_chunks)
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(asset.save(target))
+    assert target.read_bytes() == b"old"
+    assert [p.name for p in tmp_path.iterdir()] == ["photo.jpg"]
+
+    async def chunks(self):
+        yield b"new"
+
+    monkeypatch.setattr(Asset, "iter_chunks", chunks)
+    assert asyncio.run(asset.save(str(target))) == 3
+    assert target.read_bytes() == b"new"
+    assert [p.name for p in tmp_path.iterdir()] == ["photo.jpg"]
+
+
+def test_asset_cache_only_manages_its_own_files(tmp_path):
+    import os
+    import time
+
+    from tinder.cache import STALE_TMP_SECONDS, AssetCache
+
+    (tmp_path / "notes.txt").write_bytes(b"x" * 100)
+    name = AssetCache.name("other")
+    (tmp_path / f"{name}.abc123.tmp").write_bytes(b"in progress")
+    stale = tmp_path / f"{name}.def456.tmp"
+    stale.write_bytes(b"crashed")
+    old = time.time() - STALE_TMP_SECONDS - 60
+    os.utime(stale, (old, old))
+
+    cache = AssetCache(tmp_path, max_bytes=10)
+    writer = cache.writer("a")
+    writer.write(b"aaaa")
+    cache.store("b", b"bbbbbbbb")
+    AssetCache(tmp_path, max_bytes=10)
+    writer.commit()
+    assert cache.read("a") == b"aaaa" and cache.read("b") is None
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        ["notes.txt", f"{name}.abc123.tmp", AssetCache.name("a")]
+    )
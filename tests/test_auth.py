@@ -0,0 +1,36 @@
+import threading
+
+import pytest
+
+from modules.auth import HeaderProvider
+
+
+def test_header_sets_are_cached_and_immutable():
+    provider = HeaderProvider("token")
+    headers = provider.headers()
+    assert headers is provider.headers()
+    assert headers["X-Auth-Token"] == "token"
+    assert provider.json_headers()["content-type"] == "application/json"
+    with pytest.raises(TypeError):
+        headers["X-Auth-Token"] = "other"
+
+
+def test_header_sets_rebuilt_on_token_rotation():
+    provider = HeaderProvider("token")
+    headers = provider.headers()
+    provider.set_token("token")
+    assert provider.headers() is headers
+    provider.set_token("rotated")
+    assert provider.headers() is not headers
+    assert provider.json_headers()["X-Auth-Token"] == "rotated"
+
+
+def test_header_provider_shared_across_threads():
+    provider = HeaderProvider("token")
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(provider.headers())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(headers is seen[0] for headers in seen)
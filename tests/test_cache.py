@@ -0,0 +1,47 @@
+import time
+
+from modules.cache import MemoryBackend, ResponseCache, SqliteBackend, CacheEntry
+
+
+def test_only_configured_get_routes_are_cached():
+    cache = ResponseCache()
+    cache.store("GET", "/like/5a1b2c3d4e5f", b'{"match": true}', {})
+    cache.store("POST", "/profile", b"{}", {})
+    cache.store("GET", "/user/5a1b2c3d4e5f", b'{"results": {}}', {})
+    assert cache.lookup("GET", "/like/5a1b2c3d4e5f") == (None, {})
+    assert cache.lookup("POST", "/profile") == (None, {})
+    assert cache.lookup("GET", "/user/5a1b2c3d4e5f") == (b'{"results": {}}', {})
+
+
+def test_stale_entry_is_revalidated_with_etag():
+    cache = ResponseCache(ttls={"GET /profile": 0.01})
+    cache.store("GET", "/profile", b'{"name": "x"}', {"ETag": '"v1"'})
+    time.sleep(0.02)
+    assert cache.lookup("GET", "/profile") == (None, {"If-None-Match": '"v1"'})
+    assert cache.revalidate("GET", "/profile", {}) == b'{"name": "x"}'
+    assert cache.lookup("GET", "/profile")[0] == b'{"name": "x"}'
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryBackend(max_bytes=10)
+    backend.set("a", CacheEntry(b"aaaa", 0.0, 60.0))
+    backend.set("b", CacheEntry(b"bbbb", 0.0, 60.0))
+    backend.get("a")
+    backend.set("c", CacheEntry(b"cccc", 0.0, 60.0))
+    assert backend.get("b") is None
+    assert backend.get("a") is not None
+
+
+def test_sqlite_backend_persists(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    backend = SqliteBackend(path, max_bytes=10)
+    backend.set("a", CacheEntry(b"aaaa", 1.0, 60.0, '"e"'))
+    backend.set("b", CacheEntry(b"bbbb", 1.0, 60.0))
+    backend.get("a")
+    backend.set("c", CacheEntry(b"cccc", 1.0, 60.0))
+    backend.close()
+
+    reopened = SqliteBackend(path, max_bytes=10)
+    assert reopened.get("a").etag == '"e"'
+    assert reopened.get("b") is None
+    reopened.close()
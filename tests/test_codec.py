@@ -0,0 +1,50 @@
+import pytest
+
+from modules import codec
+from modules.transport import Response, _encode
+
+
+@pytest.fixture
+def restore_codec():
+    previous = codec.get_codec()
+    yield
+    codec.set_codec(previous)
+
+
+def test_available_codecs_round_trip(restore_codec):
+    assert "json" in codec.available_codecs()
+    payload = {"results": [{"_id": "a1", "name": "Zoë", "distance_mi": 3}]}
+    for name in codec.available_codecs():
+        selected = codec.set_codec(name)
+        body = selected.dumps(payload)
+        assert isinstance(body, bytes)
+        assert codec.loads(body) == payload
+
+
+def test_set_codec_rejects_unknown_name():
+    with pytest.raises(ValueError):
+        codec.set_codec("yaml")
+
+
+def test_transport_uses_selected_codec(restore_codec):
+    calls = []
+    stdlib = codec.set_codec("json")
+    codec.set_codec(
+        codec.JSONCodec(
+            "counting",
+            lambda content: calls.append("loads") or stdlib.loads(content),
+            lambda obj: calls.append("dumps") or stdlib.dumps(obj),
+        )
+    )
+    headers, body = _encode({"X-Auth-Token": "token"}, {"lat": 1.5})
+    assert body == b'{"lat":1.5}'
+    assert headers["Content-Type"] == "application/json"
+    assert Response(200, {}, body).json() == {"lat": 1.5}
+    assert Response(204, {}, b"").json() == {}
+    assert calls == ["dumps", "loads"]
+
+
+def test_encode_keeps_existing_content_type():
+    headers = {"content-type": "application/json; charset=utf-8"}
+    assert _encode(headers, {})[0] is headers
+    assert _encode(headers, None) == (headers, None)
@@ -0,0 +1,417 @@
+import asyncio
+
+import pytest
+
+from tinder.errors import InvalidData
+from tinder.gateway import HEARTBEAT, NewMatch, NewMessage, Op, Typing, decode_frame, encode_event
+from tinder.protobuf import decode_message, encode_message
+
+
+def test_protobuf_round_trip():
+    fields = {1: "match", 2: b"\x00\xff", 3: 1700000000000, 15: 0}
+    assert decode_message(encode_message(fields)) == {
+        1: b"match",
+        2: b"\x00\xff",
+        3: 1700000000000,
+        15: 0,
+    }
+    assert decode_message(bytes.fromhex("0d01000000")) == {1: 1}
+
+
+@pytest.mark.parametrize("frame", ["12", "1205", "0b", "08ff"])
+def test_malformed_frames_raise_invalid_data(frame):
+    with pytest.raises(InvalidData):
+        decode_frame(bytes.fromhex(frame))
+
+
+def test_decode_frame_events():
+    assert HEARTBEAT == bytes.fromhex("2a00")
+    assert decode_frame(HEARTBEAT) == [("heartbeat_ack", None)]
+    for event, name in [
+        (NewMatch("m1", "u1", 1700000000000), "match"),
+        (NewMessage("m1", "msg1", 1700000000001), "message"),
+        (Typing("m1", "u1"), "typing"),
+    ]:
+        assert decode_frame(encode_event(event)) == [(name, event)]
+    assert decode_frame(encode_message({99: b"future op"})) == []
+
+
+def test_decode_frame_keeps_repeated_ops():
+    first, second = NewMessage("m1", "a", 1), NewMessage("m2", "b", 2)
+    frame = encode_event(first) + HEARTBEAT + encode_event(second) + encode_event(NewMatch("m3"))
+    assert decode_frame(frame) == [
+        ("message", first),
+        ("heartbeat_ack", None),
+        ("message", second),
+        ("match", NewMatch("m3")),
+    ]
+
+
+def test_gateway_dispatches_pushed_events():
+    from benchmarks.mock_server import MockTinderServer
+    from tinder.client import Client
+    from tinder.http import HTTPClient, Route
+
+    received = []
+
+    async def run():
+        async with MockTinderServer(seed=4) as server:
+            base, gateway = Route.BASE, HTTPClient.GATEWAY
+            Route.BASE, HTTPClient.GATEWAY = server.url, server.ws_url
+            client = Client(typed_events=True)
+
+            @client.event
+            async def on_typing(event):
+                received.append(event)
+
+            await client.login("token")
+            try:
+                await client.connect()
+                waiter = client.wait_for("message", check=lambda e: e.match_id == "m2")
+                await server.push(encode_event(NewMessage("m1", "a", 1)))
+                await server.push(encode_event(Typing("m2", "u2", 2)))
+                await server.push(encode_event(NewMessage("m2", "b", 3)))
+                assert await waiter == NewMessage("m2", "b", 3)
+                await asyncio.sleep(0)
+            finally:
+                Route.BASE, HTTPClient.GATEWAY = base, gateway
+                await client.close()
+
+    asyncio.run(run())
+    assert received == [Typing("m2", "u2", 2)]
+
+
+def test_scheduler_turns_pushes_into_coalesced_fetches():
+    from benchmarks.mock_server import MockTinderServer
+    from tinder.client import Client
+    from tinder.http import HTTPClient, Route
+    from tinder.ratelimit import RateLimiter
+
+    fetched = []
+
+    async def run():
+        async with MockTinderServer(seed=5) as server:
+            base, gateway = Route.BASE, HTTPClient.GATEWAY
+            Route.BASE, HTTPClient.GATEWAY = server.url, server.ws_url
+            client = Client(
+                ratelimiter=RateLimiter(routes={}),
+                debounce=0.05,
+                poll_interval=None,
+                typed_events=True,
+            )
+
+            @client.event
+            async def on_messages(match_id, messages):
+                fetched.append(match_id)
+
+            await client.login("token")
+            try:
+                seeded = client.wait_for("updates", timeout=5)
+                await client.connect()
+                seed = await seeded
+                assert len(seed.matches) == server.matches_count
+                assert client.scheduler.cursor == seed.last_activity_date
+                for match_id in ("m1", "m2", "m1"):
+                    await server.push(encode_event(NewMessage(match_id, "x", 1)))
+                seen = set()
+                await client.wait_for(
+                    "messages", check=lambda m, _: seen.add(m) or len(seen) == 2, timeout=5
+                )
+                assert server.hits["/v2/matches/{match_id}/messages"] == 2
+
+                await server.push(encode_event(NewMatch("m3", "u3", 2)))
+                await server.push(encode_event(NewMessage("m3", "y", 3)))
+                updates = await client.wait_for("updates", timeout=5)
+                assert updates.matches == []
+                assert client.scheduler.cursor == seed.last_activity_date
+                assert server.hits["/updates"] == 2
+                assert server.hits["/v2/matches/{match_id}/messages"] == 2
+            finally:
+                Route.BASE, HTTPClient.GATEWAY = base, gateway
+                await client.close()
+
+    asyncio.run(run())
+    assert sorted(fetched) == ["m1", "m2"]
+
+
+def test_gateway_reconnects_and_catches_up():
+    from benchmarks.mock_server import MockTinderServer
+    from tinder.client import Client
+    from tinder.http import HTTPClient, Route
+    from tinder.ratelimit import RateLimiter
+
+    events = []
+    states = []
+
+    async def run():
+        async with MockTinderServer(seed=6) as server:
+            base, gateway = Route.BASE, HTTPClient.GATEWAY
+            Route.BASE, HTTPClient.GATEWAY = server.url, server.ws_url
+            client = Client(
+                ratelimiter=RateLimiter(routes={}),
+                typed_events=True,
+                debounce=0.01,
+                poll_interval=None,
+                heartbeat_interval=0.05,
+                heartbeat_timeout=0.3,
+                backoff_base=0.01,
+                backoff_cap=0.05,
+                metrics_callback=lambda stats: states.append(stats.state),
+            )
+
+            @client.event
+            async def on_disconnect():
+                events.append("disconnect")
+
+            @client.event
+            async def on_resumed():
+                events.append("resumed")
+
+            await client.login("token")
+            try:
+                seeded = client.wait_for("updates", timeout=5)
+                await client.connect()
+                await seeded
+                for _ in range(100):
+                    if client.latency is not None:
+                        break
+                    await asyncio.sleep(0.01)
+                assert client.latency is not None
+                assert client.latency_avg is not None
+                await server.push(encode_event(Typing("m1", "u1", 1)))
+                await client.wait_for("typing", timeout=5)
+
+                await server.disconnect()
+                await client.wait_for("updates", timeout=5)
+                assert client.ws.reconnects == 1
+                assert server.hits["/ws/generate"] == 2
+                assert server.hits["/updates"] == 2
+
+                server.ack_heartbeats = False
+                await client.wait_for("resumed", timeout=5)
+                assert client.ws.reconnects == 2
+                metrics = client.metrics
+                assert metrics.state == "connected" and metrics.reconnects == 2
+                assert metrics.frames >= 2 and metrics.bytes > len(HEARTBEAT)
+                assert metrics.decode_time_avg is not None
+                assert metrics.state_durations["connected"] > 0
+            finally:
+                Route.BASE, HTTPClient.GATEWAY = base, gateway
+                await client.close()
+
+    asyncio.run(run())
+    assert events[:4] == ["disconnect", "resumed", "disconnect", "resumed"]
+    assert states[:2] == ["connecting", "connected"]
+    assert "backoff" in states and states[-1] == "closed"
+
+
+def test_gateway_metrics(monkeypatch):
+    from tinder import metrics
+
+    now = [100.0]
+    monkeypatch.setattr(metrics.time, "monotonic", lambda: now[0])
+    snapshots = []
+    recorder = metrics.GatewayMetrics(snapshots.append, window=10.0, smoothing=0.5)
+
+    recorder.set_state("connected")
+    recorder.record_latency(0.2)
+    recorder.record_latency(0.4)
+    assert (recorder.latency, recorder.latency_avg) == (0.4, pytest.approx(0.3))
+    assert [s.latency for s in snapshots] == [None, 0.2, 0.4]
+
+    for size in (100, 300):
+        recorder.record_frame(size, 0.001)
+    now[0] += 5.0
+    recorder.record_frame(600, 0.003)
+    stats = recorder.snapshot()
+    assert (stats.frames, stats.bytes) == (3, 1000)
+    assert stats.frames_per_second == pytest.approx(0.3)
+    assert stats.decode_time_avg == pytest.approx(0.002)
+
+    now[0] += 6.0
+    recorder.set_state("backoff")
+    stats = snapshots[-1]
+    assert stats.bytes_per_second == pytest.approx(60.0)
+    assert stats.state_durations == {"closed": 0.0, "connected": 11.0, "backoff": 0.0}
+    now[0] += 2.0
+    assert recorder.snapshot().time_in_state == 2.0
+
+
+@pytest.mark.parametrize("compress", [0, 12, 15])
+def test_gateway_compression_and_message_size_bound(compress):
+    from benchmarks.mock_server import MockTinderServer
+    from tinder.client import Client
+    from tinder.http import HTTPClient, Route
+
+    async def run():
+        async with MockTinderServer(seed=7) as server:
+            base, gateway = Route.BASE, HTTPClient.GATEWAY
+            Route.BASE, HTTPClient.GATEWAY = server.url, server.ws_url
+            client = Client(
+                compress=compress, max_msg_size=256, backoff_base=0.01, typed_events=True
+            )
+            await client.login("token")
+            try:
+                await client.connect()
+                assert bool(client.ws.ws.compress) == bool(compress)
+                event = NewMessage("m1" * 20, "a" * 24, 1)
+                waiter = client.wait_for("message", timeout=5)
+                await server.push(encode_event(event))
+                assert await waiter == event
+
+                waiter = client.wait_for("resumed", timeout=5)
+                await server.push(encode_message({Op.TYPING: b"x" * 1024}))
+                await waiter
+                assert client.ws.reconnects == 1
+            finally:
+                Route.BASE, HTTPClient.GATEWAY = base, gateway
+                await client.close()
+
+    asyncio.run(run())
+
+
+def test_gateway_liveness_without_heartbeat_acks_and_unexpected_errors(caplog):
+    from benchmarks.mock_server import MockTinderServer
+    from tinder.client import Client
+    from tinder.http import HTTPClient, Route
+    from tinder.ratelimit import RateLimiter
+
+    async def run():
+        async with MockTinderServer(seed=9) as server:
+            server.ack_heartbeats = False
+            base, gateway = Route.BASE, HTTPClient.GATEWAY
+            Route.BASE, HTTPClient.GATEWAY = server.url, server.ws_url
+            client = Client(
+                ratelimiter=RateLimiter(routes={}),
+                poll_interval=None,
+                heartbeat_interval=0.05,
+                heartbeat_timeout=0.2,
+                backoff_base=0.01,
+                backoff_cap=0.05,
+            )
+            await client.login("token")
+            try:
+                await client.connect()
+                await asyncio.sleep(0.5)
+                assert client.ws.reconnects == 0 and client.metrics.state == "connected"
+
+                get_gateway = client.http.get_gateway
+                failures = [KeyError("token")]
+
+                async def flaky_get_gateway():
+                    if failures:
+                        raise failures.pop()
+                    return await get_gateway()
+
+                client.http.get_gateway = flaky_get_gateway
+                waiter = client.wait_for("resumed", timeout=5)
+                await server.disconnect()
+                await waiter
+                assert client.ws.reconnects == 1 and not failures
+            finally:
+                Route.BASE, HTTPClient.GATEWAY = base, gateway
+                await client.close()
+
+    asyncio.run(run())
+    assert "Unexpected error while connecting to the gateway" in caplog.text
+
+
+def test_connect_stops_the_supervisor_when_it_does_not_become_ready():
+    from tinder.client import Client
+    from tinder.errors import ClientException
+
+    async def run():
+        client = Client()
+
+        async def stalled(*, reconnect):
+            await asyncio.sleep(10)
+
+        client.ws.run = stalled
+        with pytest.raises(asyncio.TimeoutError):
+            await client.connect(timeout=0.05)
+        assert client._gateway is None
+
+        async def closed(*, reconnect):
+            pass
+
+        client.ws.run = closed
+        with pytest.raises(ClientException):
+            await client.connect(reconnect=False)
+        assert client._gateway is None and client.scheduler._task is None
+
+    asyncio.run(run())
+
+
+def test_scheduler_resumes_from_a_persisted_cursor_and_survives_errors(caplog):
+    from types import SimpleNamespace
+
+    from tinder.scheduler import FetchScheduler
+    from tinder.types import UpdatesPayload
+
+    cursors = []
+    dispatched = []
+
+    async def updates_since(cursor, payload_type):
+        cursors.append(cursor)
+        if len(cursors) == 1:
+            raise KeyError("matches")
+        return UpdatesPayload(last_activity_date="2020-01-02")
+
+    async def run():
+        client = SimpleNamespace(
+            loop=asyncio.get_running_loop(),
+            http=SimpleNamespace(updates_since=updates_since),
+            dispatch=lambda *args: dispatched.append(args),
+        )
+        scheduler = FetchScheduler(client, debounce=0, poll_interval=None, cursor="2020-01-01")
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        assert cursors == []
+        scheduler.request_updates()
+        await asyncio.sleep(0.05)
+        scheduler.request_messages("m1")
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+        return scheduler.cursor
+
+    assert asyncio.run(run()) == "2020-01-02"
+    assert cursors == ["2020-01-01", "2020-01-01"]
+    assert [name for name, *_ in dispatched] == ["updates"]
+    assert "Fetch scheduler failed" in caplog.text
+
+
+def test_gateway_without_typed_events_only_schedules_updates():
+    from benchmarks.mock_server import MockTinderServer
+    from tinder.client import Client
+    from tinder.http import HTTPClient, Route
+    from tinder.ratelimit import RateLimiter
+
+    received = []
+
+    async def run():
+        async with MockTinderServer(seed=10) as server:
+            base, gateway = Route.BASE, HTTPClient.GATEWAY
+            Route.BASE, HTTPClient.GATEWAY = server.url, server.ws_url
+            client = Client(ratelimiter=RateLimiter(routes={}), debounce=0.01, poll_interval=None)
+
+            @client.event
+            async def on_message(event):
+                received.append(event)
+
+            await client.login("token")
+            try:
+                seeded = client.wait_for("updates", timeout=5)
+                await client.connect()
+                await seeded
+                frame = encode_event(NewMessage("m1", "a", 1))
+                waiter = client.wait_for("frame", timeout=5)
+                await server.push(frame)
+                assert await waiter == frame
+                await client.wait_for("updates", timeout=5)
+                assert server.hits["/updates"] == 2
+            finally:
+                Route.BASE, HTTPClient.GATEWAY = base, gateway
+                await client.close()
+
+    asyncio.run(run())
+    assert received == []
@@ -17,3 +17,169 @@ def test_route_format():
     r = http.Route("GET", "/test/{test}", test="working")
     assert r.method == "GET"
     assert r.url == "https://api.gotinder.com/test/working"
+
+
+def test_route_bucket_uses_path_template():
+    r = http.Route("POST", "/like/{user_id}", user_id="1234")
+    assert r.bucket == "POST /like/{user_id}"
+    assert r.url == "https://api.gotinder.com/like/1234"
+
+
+def test_request_waits_out_global_429():
+    import asyncio
+
+    from aiohttp import web
+
+    from tinder.ratelimit import RateLimiter
+
+    hits = []
+
+    async def handler(request):
+        hits.append(request.path)
+        if len(hits) == 1:
+            return web.json_response(
+                {"error": "slow down"}, status=429, headers={"Retry-After": "0.1"}
+            )
+        return web.json_response({"ok": True})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/profile", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        client = http.HTTPClient(ratelimiter=RateLimiter(routes={}), backoff_base=0)
+        await client.login("token")
+        route = http.Route("GET", "/profile")
+        route.url = f"http://127.0.0.1:{port}/profile"
+        try:
+            return await asyncio.gather(*(client.request(route) for _ in range(4)))
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    results = asyncio.run(run())
+    assert results == [{"ok": True}] * 4
+    assert len(hits) == 5
+
+
+def test_request_encodes_json_body_with_codec():
+    import asyncio
+
+    from aiohttp import web
+
+    from tinder import codec
+    from tinder.ratelimit import RateLimiter
+
+    async def handler(request):
+        assert request.content_type == "application/json"
+        return web.json_response({"echo": await request.json()})
+
+    async def run():
+        app = web.Application()
+        app.router.add_post("/v2/meta", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        client = http.HTTPClient(ratelimiter=RateLimiter(routes={}))
+        await client.login("token")
+        route = http.Route("POST", "/v2/meta")
+        route.url = f"http://127.0.0.1:{port}/v2/meta"
+        try:
+            return await client.request(route, json={"lat": 38.7, "lon": -9.1, "name": "Zoë"})
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    previous = codec.get_codec()
+    try:
+        for name in ("json", previous.name):
+            codec.set_codec(name)
+            assert asyncio.run(run()) == {"echo": {"lat": 38.7, "lon": -9.1, "name": "Zoë"}}
+    finally:
+        codec.set_codec(previous)
+
+
+def test_rate_limiter_only_paces_swipes_by_default():
+    import asyncio
+    import time
+
+    from tinder.ratelimit import RateLimiter
+
+    limiter = RateLimiter()
+
+    async def run():
+        for _ in range(50):
+            await limiter.acquire("GET /profile")
+        assert limiter.update("GET /profile", 429, {"Retry-After": "2"}) == 2.0
+        assert limiter.blocked_until - time.monotonic() > 1.5
+
+    assert limiter.global_bucket is None
+    asyncio.run(asyncio.wait_for(run(), 1))
+
+
+def test_response_cache_is_scoped_to_the_token_and_revalidates():
+    import asyncio
+
+    from aiohttp import web
+
+    from tinder.cache import ResponseCache
+    from tinder.ratelimit import RateLimiter
+
+    hits = []
+
+    async def profile(request):
+        token = request.headers["X-Auth-Token"]
+        etag = f'"{token}"'
+        if request.headers.get("If-None-Match") == etag:
+            hits.append(("304", token))
+            return web.Response(status=304, headers={"ETag": etag})
+        hits.append(("200", token))
+        return web.json_response({"token": token}, headers={"ETag": etag})
+
+    async def meta(request):
+        hits.append(("meta", request.headers["X-Auth-Token"]))
+        return web.json_response({"ok": True})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/profile", profile)
+        app.router.add_post("/v2/meta", meta)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        cache = ResponseCache(ttls={"GET /profile": 0.1, "POST /v2/meta": 600.0})
+        client = http.HTTPClient(ratelimiter=RateLimiter(routes={}), cache=cache)
+        route = http.Route("GET", "/profile")
+        route.url = f"http://127.0.0.1:{port}/profile"
+        meta_route = http.Route("POST", "/v2/meta")
+        meta_route.url = f"http://127.0.0.1:{port}/v2/meta"
+        try:
+            await client.login("a")
+            first = [await client.request(route), await client.request(route)]
+            await client.login("b")
+            second = await client.request(route)
+            await client.login("a")
+            await asyncio.sleep(0.15)
+            revalidated = await client.request(route)
+            for _ in range(2):
+                await client.request(meta_route, json={"lat": 1})
+            return first, second, revalidated
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    first, second, revalidated = asyncio.run(run())
+    assert first == [{"token": "a"}] * 2
+    assert second == {"token": "b"}
+    assert revalidated == {"token": "a"}
+    assert hits == [("200", "a"), ("200", "b"), ("304", "a"), ("meta", "a"), ("meta", "a")]
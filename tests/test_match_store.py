@@ -0,0 +1,162 @@
+import importlib
+import os
+import sys
+import types
+
+import pytest
+
+TINDER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Tinder")
+
+
+def make_match(match_id, date, *messages, **person):
+    person = {
+        "_id": "p" + match_id,
+        "name": "Alex",
+        "bio": "",
+        "gender": 1,
+        "birth_date": "1990-01-01T00:00:00.000Z",
+        "distance_mi": 3,
+        "photos": [{"url": "https://images/p.jpg", "successRate": 0.5}],
+        **person,
+    }
+    return {
+        "id": match_id,
+        "last_activity_date": date,
+        "message_count": len(messages),
+        "messages": [{"_id": m, "sent_date": date} for m in messages],
+        "person": person,
+    }
+
+
+@pytest.fixture
+def features(tmp_path, monkeypatch):
+    """Tinder/features.py on a tmp_path database with a stubbed tinder_api"""
+    api = types.ModuleType("tinder_api")
+    api.responses = []
+    api.cursors = []
+
+    def get_updates(cursor):
+        api.cursors.append(cursor)
+        return api.responses.pop(0)
+
+    api.get_updates = get_updates
+    monkeypatch.setitem(sys.modules, "tinder_api", api)
+    monkeypatch.setitem(sys.modules, "config", types.ModuleType("config"))
+    monkeypatch.syspath_prepend(TINDER_DIR)
+    monkeypatch.delitem(sys.modules, "features", raising=False)
+    module = importlib.import_module("features")
+    monkeypatch.setattr(module, "STORE_FILE", str(tmp_path / "matches.db"))
+    yield module, api
+    if module.store is not None:
+        module.store.close()
+    sys.modules.pop("features", None)
+
+
+def reopen(features):
+    features.store.close()
+    features.store = None
+
+
+def test_updates_are_merged_across_runs(features):
+    features, api = features
+    api.responses = [
+        {
+            "matches": [
+                make_match("m1", "2020-01-01T00:00:00.000Z", "a", name="Sam"),
+                make_match("m2", "2020-01-02T00:00:00.000Z", name="Kai"),
+            ],
+            "last_activity_date": "2020-01-03T00:00:00.000Z",
+        },
+        {
+            "matches": [make_match("m1", "2020-01-04T00:00:00.000Z", "a", "b")],
+            "blocks": ["m2"],
+        },
+    ]
+    info = features.get_match_info()
+    assert {entry["name"] for entry in info.values()} == {"Sam", "Kai"}
+    reopen(features)
+
+    info = features.get_match_info()
+    assert api.cursors == ["", "2020-01-03T00:00:00.000Z"]
+    assert list(info) == ["pm1"]
+    assert info["pm1"]["message_count"] == 2
+    assert [m["_id"] for m in info["pm1"]["messages"]] == ["a", "b"]
+    assert features.get_store().get_cursor() == "2020-01-04T00:00:00.000Z"
+    assert [name for name, _ in features.how_long_has_it_been().items()] == ["Sam"]
+    assert [person for person, _ in features.sort_by_value("message_count")] == ["pm1"]
+    with pytest.raises(ValueError):
+        features.sort_by_value("name; DROP TABLE matches")
+
+
+def test_cursor_stays_before_a_failed_match(features):
+    features, api = features
+    broken = make_match("m2", "2020-01-02T00:00:00.000Z")
+    del broken["person"]["gender"]
+    api.responses = [
+        {
+            "matches": [
+                make_match("m1", "2020-01-01T00:00:00.000Z"),
+                broken,
+                make_match("m3", "2020-01-03T00:00:00.000Z"),
+            ],
+            "last_activity_date": "2020-01-03T00:00:00.000Z",
+        },
+        {
+            "matches": [
+                make_match("m2", "2020-01-02T00:00:00.000Z"),
+                make_match("m3", "2020-01-03T00:00:00.000Z"),
+            ],
+        },
+    ]
+    assert set(features.get_match_info()) == {"pm1", "pm3"}
+    assert features.get_store().get_cursor() == "2020-01-01T00:00:00.000Z"
+    reopen(features)
+
+    assert set(features.get_match_info()) == {"pm1", "pm2", "pm3"}
+    assert api.cursors == ["", "2020-01-01T00:00:00.000Z"]
+    assert features.get_store().get_cursor() == "2020-01-03T00:00:00.000Z"
+
+
+def test_cursor_gives_up_on_a_match_that_keeps_failing(features):
+    features, api = features
+    broken = make_match("m2", "2020-01-02T00:00:00.000Z")
+    del broken["person"]["gender"]
+    undated = make_match("m4", None)
+    del undated["person"]["gender"]
+    response = {
+        "matches": [make_match("m1", "2020-01-01T00:00:00.000Z"), broken, undated],
+        "last_activity_date": "2020-01-03T00:00:00.000Z",
+    }
+    api.responses = [response] * features.MAX_MATCH_ATTEMPTS
+    for _ in range(features.MAX_MATCH_ATTEMPTS - 1):
+        assert set(features.get_match_info()) == {"pm1"}
+        assert features.get_store().get_cursor() == "2020-01-01T00:00:00.000Z"
+
+    features.get_match_info()
+    assert features.get_store().get_cursor() == "2020-01-03T00:00:00.000Z"
+
+
+def test_distances_are_looked_up_once_per_person(features):
+    features, api = features
+    calls = []
+
+    def get_person(person_id):
+        calls.append(person_id)
+        if person_id == "pbad":
+            raise KeyError("results")
+        return {"results": {"distance_mi": len(calls) * 10}}
+
+    api.get_person = get_person
+    features.person_cache.clear()
+    far = [make_match(f"m{i}", "2020-01-01T00:00:00.000Z", _id="pfar") for i in range(3)]
+    bad = make_match("m4", "2020-01-02T00:00:00.000Z", _id="pbad")
+    near = make_match("m5", "2020-01-03T00:00:00.000Z")
+    for match in far + [bad]:
+        del match["person"]["distance_mi"]
+    api.responses = [{"matches": far + [bad, near]}]
+
+    info = features.get_match_info()
+    assert sorted(calls) == ["pbad", "pfar"]
+    assert info["pfar"]["distance"] in (10, 20)
+    assert info["pbad"]["distance"] is None
+    assert info["pm5"]["distance"] == 3
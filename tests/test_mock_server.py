@@ -0,0 +1,107 @@
+import asyncio
+
+from benchmarks.mock_server import MockTinderServer
+from modules.ratelimit import RateLimiter
+from modules.transport import Transport
+
+
+def unlimited():
+    return RateLimiter(route_limits={})
+
+
+def test_transport_against_mock_server_retries_injected_faults():
+    server = MockTinderServer(seed=1, retry_after=0)
+    url = server.start_in_thread()
+    try:
+        transport = Transport(base_url=url, rate_limiter=unlimited(), backoff_base=0)
+        server.inject(503)
+        server.inject(429)
+        headers = {"X-Auth-Token": "token"}
+        recs = transport.request("GET", "/user/recs", headers=headers)
+        assert len(recs["results"]) == server.recs_count
+        assert server.hits["/user/recs"] == 3
+        updates = transport.request(
+            "POST", "/updates", json_data={"last_activity_date": ""}, headers=headers
+        )
+        assert len(updates["matches"]) == server.matches_count
+    finally:
+        server.stop_thread()
+
+
+def test_async_clients_against_mock_server():
+    from modules.api_async import AsyncTinderAPI
+    from tinder.client import Client
+    from tinder.http import Route
+    from tinder.ratelimit import RateLimiter as ClientRateLimiter
+
+    async def run():
+        async with MockTinderServer(seed=2) as server:
+            async with AsyncTinderAPI(
+                "token", rate_limiter=unlimited(), base_url=server.url
+            ) as api:
+                assert (await api.get_profile())["_id"] == "me"
+                assert len(await api.get_matches(5)) == 5
+
+            base, Route.BASE = Route.BASE, server.url
+            client = Client(ratelimiter=ClientRateLimiter(routes={}))
+            await client.login("token")
+            try:
+                users = await client.fetch_recs()
+                assert len(users) == server.recs_count
+                gateway = await client.http.fetch_gateway()
+                assert gateway["token"]
+            finally:
+                Route.BASE = base
+                await client.close()
+
+    asyncio.run(run())
+
+
+def test_async_convenience_functions_share_one_client(monkeypatch):
+    from modules import api_async
+
+    monkeypatch.setenv("TINDER_AUTH_TOKEN", "token")
+
+    async def run():
+        async with MockTinderServer(seed=3) as server:
+            shared = api_async.get_shared_api()
+            shared.transport.base_url = server.url
+            shared.transport._rate_limiter = unlimited()
+            client = shared.client
+            assert (await api_async.like("5a1b2c3d"))["match"] is False
+            assert len(await api_async.get_matches(3)) == 3
+            assert api_async.get_shared_api() is shared and shared.client is client
+            await api_async.close_shared_api()
+            assert shared.client is None
+        return shared
+
+    first = asyncio.run(run())
+    assert asyncio.run(run()) is not first
+
+
+def test_shared_client_is_closed_with_its_event_loop(monkeypatch):
+    import gc
+
+    from modules import api_async
+
+    monkeypatch.setenv("TINDER_AUTH_TOKEN", "token")
+    server = MockTinderServer(seed=3)
+    url = server.start_in_thread()
+    shared = []
+
+    async def run():
+        api = api_async.get_shared_api()
+        api.transport.base_url = url
+        api.transport._rate_limiter = unlimited()
+        shared.append(api)
+        return await api_async.get_matches(3)
+
+    try:
+        for _ in range(5):
+            assert len(asyncio.run(run())) == 3
+    finally:
+        server.stop_thread()
+    gc.collect()
+    assert len(set(map(id, shared))) == 5
+    assert all(api.client is None for api in shared)
+    assert len(api_async._shared_apis) == 0
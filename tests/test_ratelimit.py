@@ -0,0 +1,61 @@
+import asyncio
+
+from modules.ratelimit import RateLimiter, TokenBucket, parse_retry_after, route_key
+
+
+def test_route_key_replaces_ids():
+    assert route_key("get", "/like/5a1b2c3d4e5f6a7b8c9d0e1f") == "GET /like/{id}"
+    assert route_key("GET", "/v2/recs/core?locale=en-US") == "GET /v2/recs/core"
+    assert route_key("POST", "/like/5a1b2c3d4e5f6a7b/super") == "POST /like/{id}/super"
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_token_bucket_burst_then_wait():
+    bucket = TokenBucket(rate=2.0, capacity=2)
+    now = bucket.updated
+    assert bucket.reserve(now) == 0.0
+    assert bucket.reserve(now) == 0.0
+    assert bucket.reserve(now) == 0.5
+    assert bucket.reserve(now + 1.0) == 0.0
+
+
+def test_rate_limiter_penalized_by_429():
+    limiter = RateLimiter(rate=100.0, burst=10, route_limits={})
+    assert limiter.reserve("GET", "/profile") == 0.0
+    assert limiter.update("GET", "/profile", 429, {"Retry-After": "2"}) == 2.0
+    assert limiter.global_bucket.rate == 50.0
+    assert limiter.reserve("GET", "/profile") > 1.5
+    limiter.update("GET", "/profile", 200, {})
+    assert limiter.global_bucket.rate == 60.0
+
+
+def test_rate_limiter_route_bucket():
+    limiter = RateLimiter(rate=100.0, burst=10, route_limits={"GET /like/{id}": (1.0, 1)})
+    assert limiter.reserve("GET", "/like/5a1b2c3d4e5f") == 0.0
+    assert limiter.reserve("GET", "/like/6a1b2c3d4e5f") > 0.9
+    assert limiter.reserve("GET", "/profile") == 0.0
+
+
+def test_rate_limiter_async_acquire():
+    limiter = RateLimiter(rate=100.0, burst=1, route_limits={})
+
+    async def run():
+        await limiter.acquire_async("GET", "/meta")
+        await limiter.acquire_async("GET", "/meta")
+
+    asyncio.run(run())
+
+
+def test_rate_limiter_only_paces_swipes_by_default():
+    limiter = RateLimiter()
+    assert limiter.global_bucket is None
+    assert all(limiter.reserve("GET", "/profile") == 0.0 for _ in range(50))
+    assert limiter.reserve("GET", "/like/5a1b2c3d4e5f") == 0.0
+    assert limiter.update("GET", "/profile", 429, {"Retry-After": "2"}) == 2.0
+    assert limiter.reserve("GET", "/v2/recs/core") > 1.5
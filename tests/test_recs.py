@@ -0,0 +1,163 @@
+import asyncio
+import json
+
+from modules import recs
+from modules.transport import Response, get_transport, set_transport
+
+from .test_transport import HEADERS, FakeBackend, make_transport
+
+
+def page(*user_ids):
+    results = [{"type": "user", "user": {"_id": user_id}} for user_id in user_ids]
+    return Response(200, {}, json.dumps({"data": {"results": results}}).encode())
+
+
+def test_iter_recommendations_dedupes_and_stops_on_exhausted_pages(monkeypatch):
+    from modules import transport
+
+    monkeypatch.setattr(transport, "get_headers", lambda: HEADERS)
+    pages = [page("a", "b"), page("b", "c", "c"), page("c"), page("d")]
+    pages += [page("a"), page("b"), page("c"), page("e")]
+    backend = FakeBackend(*pages)
+    previous = get_transport()
+    set_transport(make_transport(backend))
+    try:
+        seen = set()
+        users = [user["_id"] for user in recs.iter_recommendations(prefetch=1, seen=seen)]
+    finally:
+        set_transport(previous)
+    # A page repeating the current users does not end the stream, three in a row do
+    assert users == ["a", "b", "c", "d"]
+    assert seen == {"a", "b", "c", "d"}
+    assert len(backend.calls) <= 8
+
+
+def test_async_streams_end_on_empty_page(monkeypatch):
+    from modules.api_async import AsyncTinderAPI
+
+    pages = [{"data": {"results": [{"user": {"_id": "a"}}]}}, {"data": {"results": []}}]
+    calls = []
+
+    async def make_request(self, method, endpoint, **kwargs):
+        calls.append(endpoint)
+        return pages[min(len(calls), len(pages)) - 1]
+
+    monkeypatch.setattr(AsyncTinderAPI, "_make_request", make_request)
+
+    async def run():
+        api = AsyncTinderAPI("token")
+        return [user["_id"] async for user in api.iter_recommendations(prefetch=0)]
+
+    assert asyncio.run(run()) == ["a"]
+    assert len(calls) == 2
+
+
+def test_async_iterators_prefetch_pages_from_mock_server():
+    from benchmarks.mock_server import MockTinderServer
+    from modules.api_async import AsyncTinderAPI
+    from modules.ratelimit import RateLimiter
+    from tinder.client import Client
+    from tinder.http import Route
+    from tinder.ratelimit import RateLimiter as ClientRateLimiter
+
+    async def run():
+        async with MockTinderServer(seed=7, recs_count=4) as server:
+            limiter = RateLimiter(route_limits={})
+            async with AsyncTinderAPI("token", rate_limiter=limiter, base_url=server.url) as api:
+                stream = api.iter_recommendations(prefetch=2, max_pages=3)
+                users = [await stream.__anext__() for _ in range(3)]
+                await asyncio.sleep(0.05)
+                # Nothing is prefetched until the page is drained to a quarter
+                assert server.hits["/v2/recs/core"] == 1
+                users.append(await stream.__anext__())
+                await asyncio.sleep(0.05)
+                assert server.hits["/v2/recs/core"] == 3
+                users += [user async for user in stream]
+            assert len({user["_id"] for user in users}) == 12
+            assert server.hits["/v2/recs/core"] == 3
+
+            base, Route.BASE = Route.BASE, server.url
+            client = Client(ratelimiter=ClientRateLimiter(routes={}))
+            await client.login("token")
+            try:
+                stream = client.iter_recs(prefetch=2)
+                first = await stream.__anext__()
+                await asyncio.sleep(0.05)
+                assert server.hits["/v2/recs/core"] == 3 + 1
+                for _ in range(3):
+                    await stream.__anext__()
+                await asyncio.sleep(0.05)
+                # Two look-ahead pages once three of the four users were consumed
+                assert server.hits["/v2/recs/core"] == 3 + 3
+                await stream.aclose()
+            finally:
+                Route.BASE = base
+                await client.close()
+            return first
+
+    assert asyncio.run(run()).photos
+
+
+def test_fetch_recs2_builds_users_from_v2_results():
+    from benchmarks.mock_server import MockTinderServer
+    from tinder.client import Client
+    from tinder.http import Route
+    from tinder.ratelimit import RateLimiter
+
+    async def run():
+        async with MockTinderServer(seed=8, recs_count=4) as server:
+            base, Route.BASE = Route.BASE, server.url
+            client = Client(ratelimiter=RateLimiter(routes={}))
+            await client.login("token")
+            try:
+                return await client.fetch_recs2()
+            finally:
+                Route.BASE = base
+                await client.close()
+
+    users = asyncio.run(run())
+    assert len(users) == 4
+    assert all(user.id and user.name and user.distance_mi for user in users)
+    assert all(photo.processed for user in users for photo in user.photos)
+
+
+def test_client_iter_recs_survives_repeated_pages(monkeypatch):
+    from types import SimpleNamespace
+
+    from tinder.client import Client
+
+    pages = [["a", "b"], ["b"], ["a", "c"], ["c"], ["c"], ["c"], ["d"]]
+
+    async def fetch_recs2(self):
+        return [SimpleNamespace(id=user_id) for user_id in pages.pop(0)]
+
+    monkeypatch.setattr(Client, "fetch_recs2", fetch_recs2)
+
+    async def run():
+        return [user.id async for user in Client().iter_recs(prefetch=0)]
+
+    assert asyncio.run(run()) == ["a", "b", "c"]
+    assert pages == [["d"]]
+
+
+def test_user_from_rec_reads_v2_results_directly():
+    from tinder.models import User
+    from tinder.state import ConnectionState
+
+    state = ConnectionState(dispatch=None, handlers={}, http=None, loop=None)
+    rec = {
+        "type": "user",
+        "distance_mi": 4,
+        "user": {
+            "_id": "u1",
+            "name": "Sam",
+            "bio": None,
+            "photos": [{"id": "p1", "url": "https://p.jpg"}],
+        },
+    }
+    user = User._from_rec(state, rec)
+    assert (user.id, user.name, user.bio, user.distance_mi) == ("u1", "Sam", "", 4)
+    assert [photo.url for photo in user.photos] == ["https://p.jpg"]
+    del rec["distance_mi"]
+    rec["user"]["distance_mi"] = 7
+    assert User._from_rec(state, rec).distance_mi == 7
@@ -0,0 +1,28 @@
+from requests.adapters import HTTPAdapter
+
+from modules import session
+
+
+def test_configured_session_reuses_one_pooled_adapter():
+    try:
+        session.configure_session(pool_maxsize=7, max_retries=2, keep_alive=False)
+        shared = session.get_session()
+        assert session.get_session() is shared
+
+        adapter = shared.get_adapter("https://api.gotinder.com/v2/profile")
+        assert isinstance(adapter, HTTPAdapter)
+        assert shared.get_adapter("http://localhost/updates") is adapter
+        assert adapter._pool_maxsize == 7
+        assert adapter.poolmanager.connection_pool_kw["maxsize"] == 7
+        assert shared.headers["Connection"] == "close"
+
+        retry = adapter.max_retries
+        assert (retry.total, retry.connect) == (2, 2)
+        assert (retry.read, retry.status, retry.other) == (0, 0, 0)
+
+        session.configure_session(pool_maxsize=3)
+        rebuilt = session.get_session()
+        assert rebuilt is not shared
+        assert rebuilt.get_adapter("https://api.gotinder.com/v2/profile")._pool_maxsize == 3
+    finally:
+        session.configure_session()
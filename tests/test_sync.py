@@ -0,0 +1,42 @@
+from modules.sync import SyncState, UpdatesSync
+
+
+def make_match(match_id, date, *messages):
+    return {
+        "_id": match_id,
+        "last_activity_date": date,
+        "message_count": len(messages),
+        "messages": [{"_id": m, "sent_date": date} for m in messages],
+    }
+
+
+def test_merge_tracks_cursor_and_new_messages():
+    state = SyncState()
+    delta = state.merge({"matches": [make_match("m1", "2020-01-01T00:00:00.000Z", "a")]})
+    assert delta.new_matches == ["m1"]
+    assert state.cursor == "2020-01-01T00:00:00.000Z"
+
+    delta = state.merge({"matches": [make_match("m1", "2020-01-02T00:00:00.000Z", "a", "b")]})
+    assert delta.updated_matches == ["m1"]
+    assert [m["_id"] for m in delta.new_messages] == ["b"]
+    assert [m["_id"] for m in state.matches["m1"]["messages"]] == ["a", "b"]
+    assert state.cursor == "2020-01-02T00:00:00.000Z"
+
+    delta = state.merge({"matches": [], "blocks": ["m1"]})
+    assert delta.removed_matches == ["m1"]
+    assert state.matches == {}
+
+
+def test_updates_sync_requests_delta_and_persists(tmp_path):
+    path = str(tmp_path / "state.json")
+    cursors = []
+
+    def get_updates(cursor):
+        cursors.append(cursor)
+        return {"matches": [make_match("m1", "2020-01-01T00:00:00.000Z", "a")]}
+
+    UpdatesSync(get_updates, path).poll()
+    sync = UpdatesSync(get_updates, path)
+    assert "m1" in sync.matches
+    assert not sync.poll()
+    assert cursors == ["", "2020-01-01T00:00:00.000Z"]
@@ -0,0 +1,139 @@
+import time
+
+import pytest
+
+from modules.auth import TinderAPIError
+from modules.ratelimit import RateLimiter
+from modules.transport import Response, Transport, TransportTimeout
+
+
+class FakeBackend:
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def send(self, method, url, *, headers, data=None, json_data=None, timeout):
+        self.calls.append((method, url, json_data))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def close(self):
+        pass
+
+
+HEADERS = {"X-Auth-Token": "token"}
+
+
+def make_transport(backend, **options):
+    limiter = RateLimiter(route_limits={})
+    return Transport(backend, backoff_base=0, rate_limiter=limiter, **options)
+
+
+def test_transport_retries_server_errors():
+    backend = FakeBackend(Response(502, {}, b""), Response(200, {}, b'{"ok": true}'))
+    transport = make_transport(backend)
+    assert transport.request("GET", "/profile", headers=HEADERS) == {"ok": True}
+    assert len(backend.calls) == 2
+    assert backend.calls[0][1] == "https://api.gotinder.com/profile"
+
+
+def test_transport_raises_on_client_error():
+    transport = make_transport(FakeBackend(Response(404, {}, b"")))
+    with pytest.raises(TinderAPIError):
+        transport.request("GET", "/user/1", headers=HEADERS)
+
+
+def test_transport_timeout_exhausts_retries():
+    backend = FakeBackend(TransportTimeout("slow"), TransportTimeout("slow"))
+    transport = make_transport(backend, max_retries=1)
+    with pytest.raises(TinderAPIError, match="timeout"):
+        transport.request("GET", "/meta", headers=HEADERS)
+
+
+def test_transport_unsupported_method():
+    transport = make_transport(FakeBackend())
+    with pytest.raises(TinderAPIError):
+        transport.request("PATCH", "/profile", headers=HEADERS)
+
+
+def test_transport_hooks_receive_every_attempt():
+    events = []
+    backend = FakeBackend(Response(500, {}, b""), Response(200, {}, b"{}"))
+    transport = make_transport(backend)
+    transport.add_hook(events.append)
+    transport.request("POST", "/updates", json_data={}, headers=HEADERS)
+    assert [(e.attempt, e.status_code) for e in events] == [(0, 500), (1, 200)]
+
+
+def test_transport_retries_after_429():
+    backend = FakeBackend(
+        Response(429, {"Retry-After": "0"}, b""), Response(200, {}, b'{"match": false}')
+    )
+    transport = make_transport(backend)
+    assert transport.request("GET", "/like/5a1b2c3d4e5f", headers=HEADERS) == {"match": False}
+    assert len(backend.calls) == 2
+
+
+def test_transport_serves_cached_responses():
+    from modules.cache import ResponseCache
+
+    backend = FakeBackend(
+        Response(200, {"ETag": '"v1"'}, b'{"name": "me"}'), Response(304, {}, b"")
+    )
+    transport = make_transport(backend, cache=ResponseCache(ttls={"GET /profile": 0.05}))
+    assert transport.request("GET", "/profile", headers=HEADERS) == {"name": "me"}
+    assert transport.request("GET", "/profile", headers=HEADERS) == {"name": "me"}
+    assert len(backend.calls) == 1
+
+    time.sleep(0.06)
+    assert transport.request("GET", "/profile", headers=HEADERS) == {"name": "me"}
+    assert len(backend.calls) == 2
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "msgspec"])
+def test_invalid_json_response_raises_api_error(name):
+    from modules import codec
+
+    if name not in codec.available_codecs():
+        pytest.skip(f"{name} is not installed")
+    default = codec.get_codec()
+    codec.set_codec(name)
+    try:
+        backend = FakeBackend(Response(200, {}, b"<html>maintenance</html>"))
+        with pytest.raises(TinderAPIError, match="Invalid JSON"):
+            make_transport(backend).request("GET", "/profile", headers=HEADERS)
+    finally:
+        codec.set_codec(default)
+
+
+def test_cached_responses_are_scoped_to_the_auth_token(tmp_path):
+    from modules.cache import ResponseCache
+
+    path = str(tmp_path / "cache.sqlite")
+    backend = FakeBackend(
+        Response(200, {}, b'{"name": "first"}'), Response(200, {}, b'{"name": "second"}')
+    )
+    transport = make_transport(backend, cache=ResponseCache(path=path))
+    assert transport.request("GET", "/profile", headers=HEADERS) == {"name": "first"}
+    transport.cache.close()
+
+    transport = make_transport(backend, cache=ResponseCache(path=path))
+    other = {"X-Auth-Token": "other-token"}
+    assert transport.request("GET", "/profile", headers=other) == {"name": "second"}
+    assert transport.request("GET", "/profile", headers=HEADERS) == {"name": "first"}
+    assert len(backend.calls) == 2
+    with open(path, "rb") as f:
+        assert b"other-token" not in f.read()
+    transport.cache.close()
+
+
+def test_transport_retry_budget_bounds_retries():
+    from modules.transport import RetryBudget
+
+    backend = FakeBackend(*[Response(503, {}, b"")] * 3)
+    transport = make_transport(backend, retry_budget=RetryBudget(ratio=0.5, reserve=1))
+    with pytest.raises(TinderAPIError, match="budget"):
+        transport.request("GET", "/meta", headers=HEADERS)
+    assert len(backend.calls) == 2
@@ -0,0 +1,71 @@
+import pytest
+
+from tinder import codec, types
+from tinder.errors import InvalidData
+
+
+def rec(user_id, **user):
+    photo = {
+        "id": "p" + user_id,
+        "url": "https://images/p.jpg",
+        "processedFiles": [{"url": "https://images/p_84.jpg", "width": 84, "height": 106}],
+        "successRate": 0.5,
+    }
+    user = {"_id": user_id, "name": "Alex", "photos": [photo], "jobs": [], **user}
+    return {"type": "user", "user": user, "distance_mi": 4, "teasers": [{"type": "job"}]}
+
+
+def test_decode_recs_page_into_payloads():
+    body = codec.dumps({"meta": {"status": 200}, "data": {"results": [rec("a1"), rec("b2")]}})
+    page = types.decode(types.RecsPayload, body)
+    first = page.data.results[0]
+    assert [r.user.id for r in page.data.results] == ["a1", "b2"]
+    assert first.distance_mi == 4 and first.user.bio is None
+    assert first.user.photos[0].processed_files[0].width == 84
+    assert not hasattr(first.user, "__dict__")
+    assert not hasattr(first.user, "jobs")
+
+
+def test_decode_messages_and_updates():
+    message = {"_id": "m1", "match_id": "x", "from": "me", "to": "you", "message": "hi"}
+    match = {"_id": "x", "messages": [message], "last_activity_date": "2024-01-01"}
+    updates = types.decode(types.UpdatesPayload, codec.dumps({"matches": [match], "blocks": ["y"]}))
+    assert updates.matches[0].messages[0].sender == "me"
+    assert updates.matches[0].person is None
+    assert updates.blocks == ["y"]
+    meta = types.convert(types.MetaPayload, {"rating": {"super_likes": {"remaining": 5}}})
+    assert meta.rating.super_likes.remaining == 5 and meta.rating.likes_remaining == 0
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"{",
+        b"[]",
+        b'{"data": {"results": [{"user": {"name": "Alex"}}]}}',
+        b'{"data": {"results": [{"user": {"_id": 1, "name": "Alex"}}]}}',
+        b'{"data": {"results": [{"user": {"_id": "a", "name": "A", "photos": {}}}]}}',
+    ],
+)
+def test_malformed_payloads_fail_fast(body):
+    with pytest.raises(InvalidData):
+        types.decode(types.RecsPayload, body)
+
+
+def test_user_model_from_payload():
+    from tinder.models import User
+    from tinder.state import ConnectionState
+
+    state = ConnectionState(dispatch=None, handlers={}, http=None, loop=None)
+    page = types.convert(types.RecsPayload, {"data": {"results": [rec("a1")]}})
+    user = User._from_payload(state, page.data.results[0].user, page.data.results[0].distance_mi)
+    assert (user.id, user.name, user.bio, user.distance_mi) == ("a1", "Alex", "", 4)
+    assert list(user.photos[0].processed) == ["84x106"]
+
+
+def test_nullable_bio_and_float_distance():
+    user = {"_id": "a1", "name": "Alex", "bio": None, "distance_mi": 2.5}
+    body = codec.dumps({"data": {"results": [{"user": user, "distance_mi": 2.5}]}})
+    page = types.decode(types.RecsPayload, body)
+    assert page.data.results[0].distance_mi == 2.5
+    assert page.data.results[0].user.bio is None
@@ -0,0 +1,290 @@
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, BinaryIO, Dict, Mapping, Optional, Tuple
+
+log: logging.Logger = logging.getLogger(__name__)
+
+DEFAULT_TTLS: Dict[str, float] = {
+    "GET /profile": 300.0,
+    "GET /user/{user_id}": 3600.0,
+    "GET /v2/explore": 600.0,
+}
+
+# Only files named like this are managed by an AssetCache, anything else in
+# its directory is left alone
+ASSET_NAME = re.compile(r"[0-9a-f]{64}")
+ASSET_TMP_NAME = re.compile(r"[0-9a-f]{64}\.[^.]+\.tmp")
+# Age after which a temporary file is considered left over by a crashed writer
+STALE_TMP_SECONDS = 24 * 3600.0
+
+
+class CacheEntry:
+    __slots__ = ("content", "stored_at", "ttl", "etag", "last_modified")
+
+    def __init__(
+        self,
+        content: bytes,
+        ttl: float,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        self.content: bytes = content
+        self.stored_at: float = time.monotonic()
+        self.ttl: float = ttl
+        self.etag: Optional[str] = etag
+        self.last_modified: Optional[str] = last_modified
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() - self.stored_at < self.ttl
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """In-memory LRU cache for read-only routes of the HTTP client.
+
+    Entries are scoped to a fingerprint of the auth token, so a client that
+    logs in with another token is never served the previous account's data.
+
+    Args:
+        ttls (Optional[Mapping[str, float]]): TTL in seconds keyed by
+            :attr:`Route.bucket`. Only GET routes listed here are cached.
+        max_bytes (int): maximum total size of cached bodies.
+    """
+
+    def __init__(
+        self, ttls: Optional[Mapping[str, float]] = None, max_bytes: int = 8 * 1024 * 1024
+    ) -> None:
+        self.ttls: Dict[str, float] = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_bytes: int = max_bytes
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._size: int = 0
+
+    def key(self, route, params: Any = None, token: Optional[str] = None) -> Optional[str]:
+        """Cache key of a request or None if the route is not cacheable.
+
+        Args:
+            route (Route): the request route.
+            params (Any): the query parameters.
+            token (Optional[str]): the auth token of the request.
+
+        Returns:
+            The key, or None for routes that are not GET or have no TTL.
+        """
+        if route.method != "GET" or route.bucket not in self.ttls:
+            return None
+        key = f"{route.method} {route.url}"
+        if params:
+            key += "?" + "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+        if token:
+            key = f"{hashlib.sha256(token.encode()).hexdigest()[:16]} {key}"
+        return key
+
+    def lookup(self, key: str) -> Tuple[Optional[bytes], Dict[str, str]]:
+        """Fresh cached body and conditional headers for a stale entry."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, {}
+        self._entries.move_to_end(key)
+        if entry.is_fresh():
+            log.debug(f"Cache hit for {key}")
+            return entry.content, {}
+        return None, entry.conditional_headers()
+
+    def store(self, bucket: str, key: str, content: bytes, headers: Mapping[str, str]) -> None:
+        if len(content) > self.max_bytes or "no-store" in headers.get("Cache-Control", ""):
+            return
+        self._pop(key)
+        entry = CacheEntry(
+            content, self.ttls[bucket], headers.get("ETag"), headers.get("Last-Modified")
+        )
+        self._entries[key] = entry
+        self._size += len(content)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted.content)
+
+    def revalidate(self, key: str, headers: Mapping[str, str]) -> Optional[bytes]:
+        """Refresh an entry after a 304 response and return its body."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry.stored_at = time.monotonic()
+        entry.etag = headers.get("ETag", entry.etag)
+        entry.last_modified = headers.get("Last-Modified", entry.last_modified)
+        return entry.content
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry.content)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+
+class AssetCache:
+    """Content-addressed on-disk cache of downloaded assets.
+
+    Files are named by the SHA-256 of the asset id (or URL when the asset has
+    no id) and evicted least recently used first once their total size
+    exceeds ``max_bytes``. Other files in the directory are never touched,
+    and temporary files are only removed once stale, so several caches may
+    share a directory. The index is thread-safe, so the blocking file
+    operations can run in an executor.
+
+    Args:
+        directory (str | os.PathLike): cache directory, created if missing.
+        max_bytes (int): maximum total size of cached files.
+    """
+
+    def __init__(self, directory: str | os.PathLike, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.directory: str = os.path.expanduser(os.fspath(directory))
+        self.max_bytes: int = max_bytes
+        self._files: OrderedDict[str, int] = OrderedDict()
+        self._size: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        entries = []
+        stale = time.time() - STALE_TMP_SECONDS
+        for entry in os.scandir(self.directory):
+            if not entry.is_file():
+                continue
+            if ASSET_TMP_NAME.fullmatch(entry.name):
+                if entry.stat().st_mtime < stale:
+                    self._remove(entry.name)
+                continue
+            if not ASSET_NAME.fullmatch(entry.name):
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self._files[name] = size
+            self._size += size
+        self._evict()
+
+    @staticmethod
+    def name(key: str) -> str:
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, self.name(key))
+
+    def open(self, key: str) -> Optional[BinaryIO]:
+        """Open a cached asset for reading, or None on a miss."""
+        name = self.name(key)
+        if name not in self._files:
+            return None
+        path = os.path.join(self.directory, name)
+        try:
+            fp = open(path, "rb")
+        except FileNotFoundError:
+            with self._lock:
+                self._size -= self._files.pop(name, 0)
+            return None
+        with self._lock:
+            if name in self._files:
+                self._files.move_to_end(name)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        log.debug(f"Asset cache hit for {key}")
+        return fp
+
+    def read(self, key: str) -> Optional[bytes]:
+        """Cached asset content, or None on a miss."""
+        fp = self.open(key)
+        if fp is None:
+            return None
+        with fp:
+            return fp.read()
+
+    def store(self, key: str, content: bytes) -> None:
+        writer = self.writer(key)
+        writer.write(content)
+        writer.commit()
+
+    def writer(self, key: str) -> "AssetWriter":
+        """Writer adding an asset chunk by chunk, visible once committed."""
+        return AssetWriter(self, key)
+
+    def _add(self, name: str, size: int) -> None:
+        with self._lock:
+            if name in self._files:
+                self._size -= self._files.pop(name)
+            self._files[name] = size
+            self._size += size
+        self._evict()
+
+    def _evict(self) -> None:
+        while True:
+            with self._lock:
+                if self._size <= self.max_bytes or not self._files:
+                    return
+                name, size = self._files.popitem(last=False)
+                self._size -= size
+            self._remove(name)
+
+    def _remove(self, name: str) -> None:
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        with self._lock:
+            names = list(self._files)
+            self._files.clear()
+            self._size = 0
+        for name in names:
+            self._remove(name)
+
+
+class AssetWriter:
+    """Streams an asset into a temporary file of an :class:`AssetCache`."""
+
+    __slots__ = ("cache", "key", "size", "_fp", "_tmp_path")
+
+    def __init__(self, cache: AssetCache, key: str) -> None:
+        self.cache: AssetCache = cache
+        self.key: str = key
+        self.size: int = 0
+        fd, self._tmp_path = tempfile.mkstemp(
+            dir=cache.directory, prefix=cache.name(key) + ".", suffix=".tmp"
+        )
+        self._fp: BinaryIO = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        self._fp.write(chunk)
+        self.size += len(chunk)
+
+    def commit(self) -> None:
+        """Atomically publish the asset, unless it alone exceeds the cache size."""
+        self._fp.close()
+        if self.size > self.cache.max_bytes:
+            os.remove(self._tmp_path)
+            return
+        name = self.cache.name(self.key)
+        os.replace(self._tmp_path, os.path.join(self.cache.directory, name))
+        self.cache._add(name, self.size)
+
+    def abort(self) -> None:
+        self._fp.close()
+        try:
+            os.remove(self._tmp_path)
+        except FileNotFoundError:
+            pass
@@ -1,17 +1,49 @@
 import asyncio
+import functools
 import logging
 import signal
 import sys
 import traceback
 
-from typing import List, Union
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    List,
+    Optional,
+    Set,
+    Type,
+    TypeVar,
+    Union,
+)
+from .errors import ClientException
 from .gateway import TinderWebSocket
 from .http import HTTPClient
+from .metrics import GatewayMetrics, GatewayStats
 from .models import Asset, ClientUser, User
+from .scheduler import FetchScheduler
 from .state import ConnectionState
+from .types import (
+    HAS_MSGSPEC,
+    Payload,
+    ProfilePayload,
+    RecsPayload,
+    UserRecsPayload,
+    UserResultPayload,
+)
+
+T = TypeVar("T")
 
 log = logging.getLogger(__name__)
 
+# Pages in a row without new users after which iter_recs gives up
+MAX_STALE_PAGES = 3
+# Share of the current page's new users left when iter_recs prefetches the next page
+PREFETCH_REMAINING = 0.25
+
 
 class _ClientEventTask(asyncio.Task):
     def __init__(self, original_coro, event_name, coro, *, loop):
@@ -38,10 +70,45 @@ class Client:
         self.proxy_auth = options.pop("proxy_auth", None)
         self._listeners = {}
         self.http = HTTPClient(
-            self.connector, proxy=self.proxy, proxy_auth=self.proxy_auth, loop=self.loop
+            self.connector,
+            proxy=self.proxy,
+            proxy_auth=self.proxy_auth,
+            loop=self.loop,
+            ratelimiter=options.pop("ratelimiter", None),
+            max_retries=options.pop("max_retries", 3),
+            cache=options.pop("cache", None),
+            asset_cache=options.pop("asset_cache", None),
         )
         self._ready = asyncio.Event()
-        self._handlers = {"ready": self._handle_ready}
+        self.scheduler = FetchScheduler(
+            self,
+            debounce=options.pop("debounce", 0.2),
+            poll_interval=options.pop("poll_interval", 300.0),
+            cursor=options.pop("updates_cursor", ""),
+        )
+        self._handlers = {
+            "ready": self._handle_ready,
+            "resumed": self.scheduler.request_updates,
+            "frame": self.scheduler.on_frame,
+            "match": self.scheduler.on_match,
+            "message": self.scheduler.on_message,
+        }
+        ws_options = {
+            key: options.pop(key)
+            for key in (
+                "heartbeat_interval",
+                "backoff_base",
+                "backoff_cap",
+                "compress",
+                "max_msg_size",
+                "typed_events",
+            )
+            if key in options
+        }
+        ws_options["metrics"] = GatewayMetrics(
+            options.pop("metrics_callback", None), window=options.pop("metrics_window", 60.0)
+        )
+        self._gateway: Optional[asyncio.Task] = None
         self._connection = ConnectionState(
             dispatch=self.dispatch,
             handlers=self._handlers,
@@ -49,7 +116,7 @@ class Client:
             loop=self.loop,
             **options,
         )
-        self.ws = TinderWebSocket(self)  # FIXME: throwing exception
+        self.ws = TinderWebSocket(self, **ws_options)  # FIXME: throwing exception
 
     def is_ready(self):
         return self._ready.is_set()
@@ -133,12 +200,67 @@ class Client:
 
     async def close(self) -> None:
         log.debug("Closing client")
+        await self._stop_gateway()
+        await self.ws.close()
+        await self.scheduler.stop()
         await self.http.close()
 
-    async def connect(self, *, reconnect=True) -> None:
-        if self.ws:
-            coro = self.ws.connect()
-            self.ws = await asyncio.wait_for(coro, timeout=60.0)
+    async def _stop_gateway(self) -> None:
+        if self._gateway is not None:
+            self._gateway.cancel()
+            try:
+                await self._gateway
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._gateway = None
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Last gateway heartbeat round-trip time in seconds."""
+        return self.ws.latency
+
+    @property
+    def latency_avg(self) -> Optional[float]:
+        """Moving average of the gateway heartbeat round-trip time in seconds."""
+        return self.ws.metrics.latency_avg
+
+    @property
+    def metrics(self) -> GatewayStats:
+        """Snapshot of the gateway latency, traffic, decode time and state."""
+        return self.ws.metrics.snapshot()
+
+    async def connect(self, *, reconnect=True, timeout=60.0) -> None:
+        """Connect to the gateway and keep the connection supervised.
+
+        Returns once the first connection is established; the supervisor
+        keeps running in the background until :meth:`close`.
+
+        Args:
+            reconnect (bool): reconnect with backoff when the connection is lost.
+            timeout (float): seconds to wait for the first connection.
+
+        Raises:
+            asyncio.TimeoutError: no connection within ``timeout``; the supervisor is stopped.
+            ClientException: the supervisor ended before the first connection.
+        """
+        if self._gateway is None or self._gateway.done():
+            self._ready.clear()
+            self._gateway = self.loop.create_task(self.ws.run(reconnect=reconnect))
+        ready = self.loop.create_task(self._ready.wait())
+        try:
+            done, _ = await asyncio.wait(
+                {ready, self._gateway}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            ready.cancel()
+        if not done:
+            await self._stop_gateway()
+            raise asyncio.TimeoutError("Timed out connecting to the gateway")
+        if not self._ready.is_set():
+            gateway, self._gateway = self._gateway, None
+            gateway.result()
+            raise ClientException("Gateway closed before it was ready")
+        self.scheduler.start()
 
     async def login(self, token) -> None:
         log.debug("Logging in")
@@ -150,7 +272,7 @@ class Client:
         reconnect = kwargs.pop("reconnect", True)
 
         await self.login(*args)
-        # await self.connect(reconnect=reconnect)
+        await self.connect(reconnect=reconnect)
 
     async def main(self) -> None:
         pass
@@ -201,26 +323,145 @@ class Client:
         log.debug("%s has successfully been registered as an event", coro.__name__)
         return coro
 
+    async def _fetch(
+        self,
+        get: Callable[..., Awaitable[Any]],
+        payload_type: Type[Payload],
+        from_payload: Callable[[Any], T],
+        from_dict: Callable[[Any], T],
+    ) -> T:
+        """Fetch a response and build models from it.
+
+        Typed payloads only pay off when msgspec decodes them from the bytes,
+        the pure Python fallback builds them on top of the dicts, so without
+        msgspec the models are built from the dicts directly.
+
+        Args:
+            get (Callable[..., Awaitable[Any]]): the HTTP method, accepting ``payload_type``.
+            payload_type (Type[Payload]): the payload to decode into with msgspec.
+            from_payload (Callable[[Any], T]): builds the result from the payload.
+            from_dict (Callable[[Any], T]): builds the result from the dicts.
+
+        Returns:
+            The built result.
+        """
+        if HAS_MSGSPEC:
+            return from_payload(await get(payload_type=payload_type))
+        return from_dict(await get())
+
     async def fetch_user_profile(self, user_id: Union[str, int]) -> User:
-        data = await self.http.get_user_profile(user_id)
+        user = await self._fetch(
+            functools.partial(self.http.get_user_profile, user_id),
+            UserResultPayload,
+            lambda data: User._from_payload(self._connection, data.results),
+            lambda data: User(self._connection, data=data["results"]),
+        )
         log.debug("Fetched user profile.")
-        return User(self._connection, data=data["results"])
+        return user
 
     async def fetch_profile(self) -> ClientUser:
-        data = await self.http.get_profile()
+        user = await self._fetch(
+            self.http.get_profile,
+            ProfilePayload,
+            lambda data: ClientUser._from_payload(self._connection, data),
+            lambda data: ClientUser(self._connection, data=data),
+        )
         log.debug("Fetched client profile.")
-        return ClientUser(self._connection, data=data)
+        return user
 
     async def fetch_recs(self) -> List[User]:
-        data = await self.http.get_recs()
-        users = [User(self._connection, data=user_data) for user_data in data["results"]]
+        users = await self._fetch(
+            self.http.get_recs,
+            UserRecsPayload,
+            lambda data: [User._from_payload(self._connection, user) for user in data.results],
+            lambda data: [User(self._connection, data=user) for user in data["results"]],
+        )
         log.debug(f"Fetched {len(users)} user records.")
         return users
 
+    async def iter_recs(
+        self, prefetch: int = 1, max_pages: Optional[int] = None, seen: Optional[Set[str]] = None
+    ) -> AsyncIterator[User]:
+        """Stream user records, prefetching the next page once most of the current one is consumed.
+
+        The next page is requested when ``PREFETCH_REMAINING`` of the current
+        page's new users are left: any earlier, before they were swiped, it
+        would mostly repeat them; any later, the consumer waits for it. Users
+        already yielded are skipped, and the stream ends on an empty page or
+        after ``MAX_STALE_PAGES`` pages in a row without new users.
+
+        Args:
+            prefetch (int): maximum number of pages requested ahead of the current one.
+            max_pages (Optional[int]): maximum number of pages to request.
+            seen (Optional[Set[str]]): ids of users already seen, updated in place.
+
+        Returns:
+            Async iterator of users.
+        """
+        seen = set() if seen is None else seen
+        pending: Deque[asyncio.Task] = deque()
+        requested = stale = page_size = remaining = 0
+
+        async def fetch_page(previous: Optional[asyncio.Task]) -> List[User]:
+            if previous is not None:
+                await asyncio.wait({previous})
+            return await self.fetch_recs2()
+
+        def request_pages() -> None:
+            nonlocal requested
+            while max_pages is None or requested < max_pages:
+                if pending or remaining:
+                    if len(pending) >= prefetch or not page_size:
+                        return
+                    if remaining > page_size * PREFETCH_REMAINING:
+                        return
+                previous = pending[-1] if pending else None
+                pending.append(self.loop.create_task(fetch_page(previous)))
+                requested += 1
+
+        try:
+            while True:
+                request_pages()
+                if not pending:
+                    return
+                page = await pending.popleft()
+                users: List[User] = []
+                ids: Set[str] = set()
+                for user in page:
+                    if user.id not in seen and user.id not in ids:
+                        ids.add(user.id)
+                        users.append(user)
+                stale = 0 if users else stale + 1
+                if not page or stale >= MAX_STALE_PAGES:
+                    return
+                page_size = remaining = len(users)
+                for user in users:
+                    remaining -= 1
+                    if user.id in seen:
+                        continue
+                    seen.add(user.id)
+                    yield user
+                    request_pages()
+        finally:
+            for task in pending:
+                task.cancel()
+
     async def fetch_recs2(self) -> List[User]:
-        data = await self.http.get_recs2()
-        log.debug("Fetched records v2.")
-        raise NotImplementedError
+        def from_payload(page: RecsPayload) -> List[User]:
+            results = page.data.results if page.data is not None else []
+            return [
+                User._from_payload(self._connection, rec.user, rec.distance_mi)
+                for rec in results
+                if rec.user is not None
+            ]
+
+        def from_dict(data) -> List[User]:
+            results = (data.get("data") or {}).get("results", [])
+            return [User._from_rec(self._connection, rec) for rec in results if "user" in rec]
+
+        users = await self._fetch(self.http.get_recs2, RecsPayload, from_payload, from_dict)
+        log.debug(f"Fetched {len(users)} user records (v2).")
+        return users
 
     async def fetch_teasers(self) -> List[Asset]:
         data = await self.http.get_teasers()
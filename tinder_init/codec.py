@@ -0,0 +1,77 @@
+import json
+import logging
+from typing import Any, Callable, NamedTuple
+
+log: logging.Logger = logging.getLogger(__name__)
+
+PREFERRED = ("orjson", "msgspec", "json")
+
+
+class Codec(NamedTuple):
+    name: str
+    loads: Callable[[bytes | str], Any]
+    dumps: Callable[[Any], bytes]
+
+
+def _make(name: str) -> Codec:
+    if name == "orjson":
+        import orjson
+
+        return Codec(name, orjson.loads, orjson.dumps)
+    if name == "msgspec":
+        import msgspec
+
+        decoder = msgspec.json.Decoder()
+
+        def loads(data: bytes | str) -> Any:
+            # invalid JSON raises ValueError, as with json and orjson
+            try:
+                return decoder.decode(data)
+            except msgspec.DecodeError as exc:
+                raise ValueError(str(exc)) from exc
+
+        return Codec(name, loads, msgspec.json.Encoder().encode)
+    if name == "json":
+        encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+        return Codec(name, json.loads, lambda obj: encoder.encode(obj).encode("utf-8"))
+    raise ValueError(f"unknown JSON codec {name!r}, expected one of {PREFERRED}")
+
+
+def _default() -> Codec:
+    for name in PREFERRED:
+        try:
+            return _make(name)
+        except ImportError:
+            continue
+    return _make("json")
+
+
+_codec: Codec = _default()
+
+
+def get_codec() -> Codec:
+    """Returns the JSON codec used for request and response bodies."""
+    return _codec
+
+
+def set_codec(codec: str | Codec) -> Codec:
+    """Selects the JSON codec used for request and response bodies.
+
+    Args:
+        codec (str | Codec): ``"orjson"``, ``"msgspec"``, ``"json"`` or a custom codec.
+
+    Returns:
+        Codec: The selected codec.
+    """
+    global _codec
+    _codec = _make(codec) if isinstance(codec, str) else codec
+    log.debug(f"using {_codec.name} JSON codec")
+    return _codec
+
+
+def loads(data: bytes | str) -> Any:
+    return _codec.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    return _codec.dumps(obj)
@@ -27,6 +27,12 @@ class NotFound(HTTPException):
     pass
 
 
+class TooManyRequests(HTTPException):
+    def __init__(self, response, message, retry_after=None):
+        super().__init__(response, message)
+        self.retry_after = retry_after
+
+
 class InvalidData(ClientException):
     pass
 
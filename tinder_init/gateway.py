@@ -1,37 +1,316 @@
 import aiohttp
 import asyncio
 import logging
+import random
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .errors import HTTPException, InvalidData
+from .http import WS_COMPRESS, WS_MAX_MSG_SIZE
+from .metrics import GatewayMetrics
+from .protobuf import decode_fields, decode_message, encode_message
 
 log = logging.getLogger(__name__)
 
 
+class Op:
+    """Top-level field numbers of the keepalive frames.
+
+    Experimental: apart from the heartbeat, these numbers and the event field
+    layouts are not verified against captured frames, so typed events are
+    only dispatched when :class:`TinderWebSocket` is created with
+    ``typed_events=True``.
+    """
+
+    MATCH = 1
+    MESSAGE = 2
+    TYPING = 3
+    HEARTBEAT = 5
+
+
+class NewMatch(NamedTuple):
+    match_id: str = ""
+    user_id: str = ""
+    timestamp: int = 0
+
+
+class NewMessage(NamedTuple):
+    match_id: str = ""
+    message_id: str = ""
+    timestamp: int = 0
+
+
+class Typing(NamedTuple):
+    match_id: str = ""
+    user_id: str = ""
+    timestamp: int = 0
+
+
+# op -> (event name, event type); the event fields are numbered from 1 in order
+EVENTS: Dict[int, Tuple[str, type]] = {
+    Op.MATCH: ("match", NewMatch),
+    Op.MESSAGE: ("message", NewMessage),
+    Op.TYPING: ("typing", Typing),
+}
+
+HEARTBEAT: bytes = encode_message({Op.HEARTBEAT: b""})
+
+CONNECT_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, HTTPException, OSError)
+
+
+def _build_event(event_type: type, body: bytes) -> Any:
+    fields = decode_message(body)
+    values = []
+    for number, (name, field_type) in enumerate(event_type.__annotations__.items(), 1):
+        value = fields.get(number)
+        if value is None:
+            values.append(event_type._field_defaults[name])
+        elif field_type is str and isinstance(value, bytes):
+            values.append(value.decode("utf-8", "replace"))
+        elif field_type is int and isinstance(value, int):
+            values.append(value)
+        else:
+            raise InvalidData(f"unexpected value for {event_type.__name__}.{name}")
+    return event_type(*values)
+
+
+def decode_frame(data: bytes) -> List[Tuple[str, Any]]:
+    """Decodes a keepalive frame into events.
+
+    Args:
+        data (bytes): the binary frame.
+
+    Returns:
+        ``(event name, event)`` pairs in frame order, one per op so a frame
+        may carry several events; heartbeat acknowledgements are
+        ``("heartbeat_ack", None)`` and unknown ops are skipped.
+
+    Raises:
+        InvalidData: the frame is malformed.
+    """
+    events: List[Tuple[str, Any]] = []
+    for op, body in decode_fields(data):
+        if op == Op.HEARTBEAT:
+            events.append(("heartbeat_ack", None))
+            continue
+        try:
+            name, event_type = EVENTS[op]
+        except KeyError:
+            log.debug(f"Skipping unknown gateway op {op}")
+            continue
+        if not isinstance(body, bytes):
+            raise InvalidData(f"op {op} is not a message")
+        events.append((name, _build_event(event_type, body)))
+    return events
+
+
+def encode_event(event: Any) -> bytes:
+    """Encodes an event as a keepalive frame, the inverse of :func:`decode_frame`."""
+    op = next(op for op, (_, event_type) in EVENTS.items() if isinstance(event, event_type))
+    body = encode_message({number: value for number, value in enumerate(event, 1) if value})
+    return encode_message({op: body})
+
+
 class TinderWebSocket:
-    def __init__(self, client):
+    """Supervised keepalive gateway connection.
+
+    Args:
+        client (Client): the client.
+        heartbeat_interval (float): seconds between heartbeats.
+        backoff_base (float): base of the full-jitter reconnect backoff.
+        backoff_cap (float): maximum reconnect delay in seconds.
+        metrics (Optional[GatewayMetrics]): collector of the connection metrics.
+        compress (int): permessage-deflate window bits offered, 0 to disable.
+        max_msg_size (int): largest frame accepted; a bigger one drops the connection.
+        typed_events (bool): decode frames into the experimental typed events of
+            :class:`Op`. Otherwise every frame but a heartbeat acknowledgement is
+            logged and dispatched as a raw ``frame`` event.
+    """
+
+    def __init__(
+        self,
+        client,
+        *,
+        heartbeat_interval: float = 30.0,
+        backoff_base: float = 1.0,
+        backoff_cap: float = 60.0,
+        metrics: Optional[GatewayMetrics] = None,
+        compress: int = WS_COMPRESS,
+        max_msg_size: int = WS_MAX_MSG_SIZE,
+        typed_events: bool = False,
+    ):
         self.client = client
         self.url: str
-        self.ws: aiohttp.ClientWebSocketResponse
+        self.ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self.heartbeat_interval: float = heartbeat_interval
+        self.backoff_base: float = backoff_base
+        self.backoff_cap: float = backoff_cap
+        self.compress: int = compress
+        self.max_msg_size: int = max_msg_size
+        self.typed_events: bool = typed_events
+        self.metrics: GatewayMetrics = metrics if metrics is not None else GatewayMetrics()
+        self._ping_sent: Optional[float] = None
+        self._last_received: float = 0.0
+        self._acked: bool = False
+
+    @property
+    def latency(self) -> Optional[float]:
+        return self.metrics.latency
+
+    @property
+    def reconnects(self) -> int:
+        return self.metrics.reconnects
+
+    @property
+    def heartbeat_timeout(self) -> float:
+        return self.client._connection.heartbeat_timeout
 
     async def fetch_token(self):
         resp = await self.client.http.fetch_gateway()
         return resp["token"]
 
     async def connect(self):
+        """Open a connection with a fresh gateway token."""
         self.url = await self.client.http.get_gateway()
-        self.ws = await self.client.http.ws_connect(self.url)
+        self.ws = await self.client.http.ws_connect(
+            self.url,
+            compress=self.compress,
+            max_msg_size=self.max_msg_size,
+            heartbeat=self.heartbeat_interval,
+        )
+        log.debug(f"Gateway connected, compression window bits {self.ws.compress}")
+        self._last_received = time.monotonic()
+        self._ping_sent = None
+        self._acked = False
 
-        self.client.loop.create_task(self.ping())
-        self.client.loop.create_task(self.receive())
+    async def run(self, *, reconnect: bool = True) -> None:
+        """Keep the gateway connected until cancelled.
+
+        The first connection fires ``ready``. When the socket closes, errors,
+        misses a websocket pong or, once it has acknowledged a heartbeat, goes
+        silent for ``heartbeat_timeout`` seconds, ``disconnect`` is dispatched and a new connection is opened after a
+        full-jitter backoff; once it is up ``resumed`` fires, which schedules
+        an ``/updates`` catch-up for the gap.
+
+        Args:
+            reconnect (bool): reconnect after failures instead of returning.
+
+        Raises:
+            The connection error of the first attempt when not reconnecting.
+        """
+        attempt = 0
+        connected = False
+        try:
+            while True:
+                self.metrics.set_state("connecting")
+                try:
+                    await self.connect()
+                except CONNECT_ERRORS as exc:
+                    if not reconnect:
+                        raise
+                    log.warning(f"Gateway connection failed ({exc!r})")
+                except Exception:
+                    if not reconnect:
+                        raise
+                    log.exception("Unexpected error while connecting to the gateway")
+                else:
+                    attempt = 0
+                    event = "resumed" if connected else "ready"
+                    if connected:
+                        self.metrics.record_reconnect()
+                    connected = True
+                    self.metrics.set_state("connected")
+                    self.client._connection.call_handlers(event)
+                    self.client.dispatch(event)
+                    await self.poll()
+                    self.client.dispatch("disconnect")
+                    if not reconnect:
+                        return
+                self.metrics.set_state("backoff")
+                delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2**attempt))
+                attempt += 1
+                log.info(f"Reconnecting to the gateway in {delay:.2f}s")
+                await asyncio.sleep(delay)
+        finally:
+            self.metrics.set_state("closed")
+
+    async def poll(self) -> None:
+        """Run the receive and heartbeat loops until the connection is lost."""
+        tasks = {
+            self.client.loop.create_task(self.receive()),
+            self.client.loop.create_task(self.ping()),
+        }
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await self.close()
+        for task in done:
+            if not task.cancelled() and task.exception() is not None:
+                log.warning(f"Gateway connection lost ({task.exception()!r})")
+
+    async def close(self) -> None:
+        if self.ws is not None and not self.ws.closed:
+            await self.ws.close()
 
     async def receive(self):
-        while True:
-            resp = await self.ws.receive()
-            try:
-                resp = resp.data.hex()
-                log.debug(f"Gateway message received: {resp}")
-            except AttributeError:
-                log.debug(f"Gateway received: {resp}")
+        async for msg in self.ws:
+            self._last_received = time.monotonic()
+            if msg.type is aiohttp.WSMsgType.BINARY:
+                self.handle_frame(msg.data)
+            elif msg.type is aiohttp.WSMsgType.ERROR:
+                log.warning(f"Gateway error: {msg.data!r}")
+                break
+            else:
+                log.debug(f"Gateway received {msg.type.name}")
+        log.debug("Gateway closed")
+
+    def handle_frame(self, data: bytes) -> None:
+        """Decodes a frame and dispatches its events through the client."""
+        if data == HEARTBEAT:
+            self.metrics.record_frame(len(data), 0.0)
+            self._ack()
+            return
+        if not self.typed_events:
+            self.metrics.record_frame(len(data), 0.0)
+            log.debug(f"Gateway frame {data.hex()}")
+            self.client._connection.call_handlers("frame", data)
+            self.client.dispatch("frame", data)
+            return
+        started = time.perf_counter()
+        try:
+            events = decode_frame(data)
+        except InvalidData as exc:
+            log.warning(f"Dropping malformed gateway frame ({len(data)} bytes): {exc}")
+            return
+        finally:
+            self.metrics.record_frame(len(data), time.perf_counter() - started)
+        for name, event in events:
+            if name == "heartbeat_ack":
+                self._ack()
+            else:
+                self.client._connection.call_handlers(name, event)
+                self.client.dispatch(name, event)
+
+    def _ack(self) -> None:
+        self._acked = True
+        if self._ping_sent is not None:
+            self.metrics.record_latency(time.monotonic() - self._ping_sent)
+            self._ping_sent = None
+        log.debug(f"Gateway heartbeat acknowledged, latency {self.latency}")
 
     async def ping(self):
+        """Send heartbeats, returning once a gateway that acknowledged them goes silent.
+
+        Any received frame counts as a sign of life. Heartbeat acknowledgements
+        only measure the latency, and a gateway that never sends them is left
+        to the websocket ping/pong of :meth:`connect`.
+        """
         while True:
-            await self.ws.send_bytes(bytearray.fromhex("2a00"))
-            await asyncio.sleep(30)
+            if self._acked and time.monotonic() - self._last_received > self.heartbeat_timeout:
+                log.warning(f"Gateway silent for {self.heartbeat_timeout}s")
+                return
+            self._ping_sent = time.monotonic()
+            await self.ws.send_bytes(HEARTBEAT)
+            await asyncio.sleep(self.heartbeat_interval)
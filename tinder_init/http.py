@@ -1,18 +1,36 @@
 import asyncio
 import logging
-from typing import Optional, Any, Dict, Coroutine
+import random
+from typing import Optional, Any, AsyncIterator, Dict, Coroutine, Type
 from urllib.parse import quote as _uriquote
 
 import aiohttp
-from .errors import Forbidden, HTTPException, NotFound
+from . import codec, types
+from .cache import AssetCache, ResponseCache
+from .errors import Forbidden, HTTPException, NotFound, TooManyRequests
+from .ratelimit import RateLimiter
 
 log: logging.Logger = logging.getLogger(__name__)
 
+ASSET_CHUNK_SIZE: int = 64 * 1024
+# permessage-deflate window bits offered to the gateway, 0 disables compression
+WS_COMPRESS: int = 15
+WS_MAX_MSG_SIZE: int = 1024 * 1024
+WS_CLOSE_TIMEOUT: float = 30.0
 
-async def json_or_text(response) -> Dict[str, Any] | str:
+
+def _loads(body: bytes, payload_type: Optional[Type[types.Payload]] = None) -> Any:
+    if payload_type is not None:
+        return types.decode(payload_type, body)
+    return codec.loads(body) if body.strip() else None
+
+
+async def json_or_text(
+    response, payload_type: Optional[Type[types.Payload]] = None
+) -> Dict[str, Any] | types.Payload | str:
     try:
         if "application/json" in response.headers["content-type"]:
-            return await response.json()
+            return _loads(await response.read(), payload_type)
     except KeyError:
         pass
     return await response.text(encoding="utf-8")
@@ -24,6 +42,7 @@ class Route:
     def __init__(self, method, path, **params) -> None:
         self.path = path
         self.method = method
+        self.bucket: str = f"{method} {path}"
         url: str = self.BASE + self.path
         if params:
             self.url = url.format(
@@ -34,6 +53,8 @@ class Route:
 
 
 class HTTPClient:
+    GATEWAY = "wss://keepalive.gotinder.com/ws"
+
     def __init__(
         self,
         connector: Optional[aiohttp.BaseConnector] = None,
@@ -41,8 +62,20 @@ class HTTPClient:
         proxy: Optional[str] = None,
         proxy_auth: Optional[aiohttp.BasicAuth] = None,
         loop: Optional[asyncio.AbstractEventLoop] = None,
+        ratelimiter: Optional[RateLimiter] = None,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_cap: float = 30.0,
+        cache: Optional[ResponseCache] = None,
+        asset_cache: Optional[AssetCache] = None,
     ) -> None:
         self.loop: asyncio.AbstractEventLoop = loop or asyncio.get_event_loop()
+        self.ratelimiter: RateLimiter = ratelimiter or RateLimiter()
+        self.max_retries: int = max_retries
+        self.backoff_base: float = backoff_base
+        self.backoff_cap: float = backoff_cap
+        self.cache: Optional[ResponseCache] = cache
+        self.asset_cache: Optional[AssetCache] = asset_cache
         self.connector: Optional[aiohttp.BaseConnector] = connector
         self.__session: aiohttp.ClientSession
         self.token: Optional[str] = None
@@ -70,18 +103,86 @@ class HTTPClient:
         if self.__session and self.__session.closed:
             self.__session = aiohttp.ClientSession(connector=self.connector)
 
-    async def get_asset(self, url) -> bytes:
+    @staticmethod
+    def _check_asset(resp: aiohttp.ClientResponse) -> None:
+        if resp.status == 200:
+            return
+        elif resp.status == 404:
+            raise NotFound(resp, "asset not found")
+        elif resp.status == 403:
+            raise Forbidden(resp, "cannot retrieve asset")
+        else:
+            raise HTTPException(resp, "failed to get asset")
+
+    async def get_asset(self, url: str, *, key: Optional[str] = None) -> bytes:
+        """Download an asset, served from the asset cache when possible.
+
+        Args:
+            url (str): the asset URL.
+            key (Optional[str]): asset cache key, the URL by default.
+
+        Returns:
+            The asset content.
+        """
+        cache_key = key or url
+        loop = asyncio.get_running_loop()
+        if self.asset_cache is not None:
+            cached = await loop.run_in_executor(None, self.asset_cache.read, cache_key)
+            if cached is not None:
+                return cached
         async with self.__session.get(url) as resp:
-            if resp.status == 200:
-                return await resp.read()
-            elif resp.status == 404:
-                raise NotFound(resp, "asset not found")
-            elif resp.status == 403:
-                raise Forbidden(resp, "cannot retrieve asset")
-            else:
-                raise HTTPException(resp, "failed to get asset")
+            self._check_asset(resp)
+            data = await resp.read()
+        if self.asset_cache is not None:
+            await loop.run_in_executor(None, self.asset_cache.store, cache_key, data)
+        return data
+
+    async def iter_asset(
+        self, url: str, *, key: Optional[str] = None, chunk_size: int = ASSET_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Stream an asset in chunks without holding it in memory.
+
+        Cached assets are read back from disk; otherwise the chunks are
+        written to the asset cache as they arrive and published once the
+        download completes. Disk reads and writes run in the default executor.
+
+        Args:
+            url (str): the asset URL.
+            key (Optional[str]): asset cache key, the URL by default.
+            chunk_size (int): maximum chunk size in bytes.
 
-    async def request(self, route: Route, **kwargs) -> dict[str, Any] | str:
+        Returns:
+            Async iterator of chunks.
+        """
+        cache_key = key or url
+        loop = asyncio.get_running_loop()
+        if self.asset_cache is not None:
+            fp = await loop.run_in_executor(None, self.asset_cache.open, cache_key)
+            if fp is not None:
+                with fp:
+                    while chunk := await loop.run_in_executor(None, fp.read, chunk_size):
+                        yield chunk
+                return
+        async with self.__session.get(url) as resp:
+            self._check_asset(resp)
+            writer = None
+            if self.asset_cache is not None:
+                writer = await loop.run_in_executor(None, self.asset_cache.writer, cache_key)
+            try:
+                async for chunk in resp.content.iter_chunked(chunk_size):
+                    if writer is not None:
+                        await loop.run_in_executor(None, writer.write, chunk)
+                    yield chunk
+            except BaseException:
+                if writer is not None:
+                    writer.abort()
+                raise
+            if writer is not None:
+                await loop.run_in_executor(None, writer.commit)
+
+    async def request(
+        self, route: Route, *, payload_type: Optional[Type[types.Payload]] = None, **kwargs
+    ) -> dict[str, Any] | types.Payload | str:
         method = route.method
         url = route.url
         headers: Optional[dict[str, str]] = kwargs.get("headers")
@@ -97,28 +198,85 @@ class HTTPClient:
             headers["X-Auth-Token"] = self.token
         if "json" in kwargs:
             headers["Content-Type"] = "application/json"
+            kwargs["data"] = codec.dumps(kwargs.pop("json"))
         kwargs["headers"] = headers
         if self.proxy:
             kwargs["proxy"] = self.proxy
         elif self.proxy_auth:
             kwargs["proxy_auth"] = self.proxy_auth
+        cache_key: Optional[str] = None
+        if self.cache is not None:
+            token = headers.get("X-Auth-Token") or headers.get("x-auth-token")
+            cache_key = self.cache.key(route, kwargs.get("params"), token)
+        if cache_key is not None:
+            cached, conditional = self.cache.lookup(cache_key)
+            if cached is not None:
+                return _loads(cached, payload_type)
+            headers.update(conditional)
+        for tries in range(self.max_retries + 1):
+            last: bool = tries == self.max_retries
+            if not self.__global_over.is_set():
+                await self.__global_over.wait()
+            await self.ratelimiter.acquire(route.bucket)
+            try:
+                async with self.__session.request(method, url, **kwargs) as r:
+                    ok: bool = 300 > r.status >= 200
+                    data = await json_or_text(r, payload_type if ok else None)
+                    if cache_key is not None and ok and not isinstance(data, str):
+                        self.cache.store(route.bucket, cache_key, await r.read(), r.headers)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as exc:
+                if last:
+                    raise
+                delay = self._backoff(tries)
+                log.warning(f"{method} {url} failed ({exc!r}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            retry_after = self.ratelimiter.update(route.bucket, r.status, r.headers)
+            if 300 > r.status >= 200:
+                return data
+            elif r.status == 304 and cache_key is not None:
+                cached = self.cache.revalidate(cache_key, r.headers)
+                if cached is not None:
+                    return _loads(cached, payload_type)
+                raise HTTPException(r, "cached response evicted before revalidation")
+            elif r.status == 429:
+                if last:
+                    raise TooManyRequests(r, data, retry_after)
+                await self._global_ratelimit(retry_after)
+                continue
+            elif r.status in {500, 502, 503, 504} and not last:
+                delay = self._backoff(tries)
+                log.warning(f"{method} {url} returned {r.status}, retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+            elif r.status == 403:
+                raise Forbidden(r, data)
+            elif r.status == 404:
+                raise NotFound(r, data)
+            else:
+                raise HTTPException(r, data)
+        raise RuntimeError("Unreachable code in HTTP handling")
+
+    def _backoff(self, tries: int) -> float:
+        """Full-jitter exponential backoff delay for the given attempt."""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2**tries))
+
+    async def _global_ratelimit(self, retry_after: Optional[float]) -> None:
+        """Hold every request until the server-specified delay has passed.
+
+        The first coroutine hitting a 429 clears the global event and sleeps;
+        the others wait on the event and are all released when it is set.
+        """
         if not self.__global_over.is_set():
             await self.__global_over.wait()
-        for tries in range(3):
-            async with self.__session.request(method, url, **kwargs) as r:
-                data: dict[str, Any] | str = await json_or_text(r)
-                if 300 > r.status >= 200:
-                    return data
-                elif r.status in {500, 502}:
-                    await asyncio.sleep(1 + tries * 2)
-                    continue
-                elif r.status == 403:
-                    raise Forbidden(r, data)
-                elif r.status == 404:
-                    raise NotFound(r, data)
-                else:
-                    raise HTTPException(r, data)
-        raise RuntimeError("Unreachable code in HTTP handling")
+            return
+        self.__global_over.clear()
+        log.warning(f"Globally rate limited, sleeping {retry_after:.2f}s")
+        try:
+            await asyncio.sleep(retry_after or 0)
+        finally:
+            self.__global_over.set()
 
     def fetch_gateway(self) -> Coroutine:
         headers: dict[str, Optional[str]] = {
@@ -136,58 +294,99 @@ class HTTPClient:
 
     async def get_gateway(self) -> str:
         token: str = (await self.fetch_gateway())["token"]
-        return f"wss://keepalive.gotinder.com/ws?token={token}"
+        return f"{self.GATEWAY}?token={token}"
+
+    async def ws_connect(
+        self,
+        url: str,
+        *,
+        compress: int = WS_COMPRESS,
+        max_msg_size: int = WS_MAX_MSG_SIZE,
+        heartbeat: Optional[float] = None,
+    ) -> aiohttp.ClientWebSocketResponse:
+        """Open a websocket.
+
+        Args:
+            url (str): the websocket url.
+            compress (int): permessage-deflate window bits (9-15) offered for the client's
+                compressor, 0 to disable; the server picks the window of its own frames.
+            max_msg_size (int): largest message accepted after decompression, bigger ones
+                close the connection.
+            heartbeat (Optional[float]): seconds between websocket pings; the connection
+                is closed when a pong does not arrive in time.
 
-    async def ws_connect(self, url: str, *, compress: int = 0) -> aiohttp.ClientWebSocketResponse:
+        Returns:
+            The websocket; ``compress`` holds the negotiated window bits, 0 if the
+            server declined compression.
+        """
+        if compress and not 9 <= compress <= 15:
+            raise ValueError(f"compress must be 0 or between 9 and 15, not {compress}")
+        timeout: Any = WS_CLOSE_TIMEOUT
+        if hasattr(aiohttp, "ClientWSTimeout"):
+            timeout = aiohttp.ClientWSTimeout(ws_close=WS_CLOSE_TIMEOUT)
         kwargs: dict[str, Any] = {
             "proxy_auth": self.proxy_auth,
             "proxy": self.proxy,
-            "max_msg_size": 0,
-            "timeout": 30.0,
+            "max_msg_size": max_msg_size,
+            "timeout": timeout,
             "autoclose": False,
             "headers": {
                 "User-Agent": self.user_agent,
             },
             "compress": compress,
+            "heartbeat": heartbeat,
         }
 
         return await self.__session.ws_connect(url, **kwargs)
 
-    def get_profile(self) -> Coroutine:
+    def get_profile(self, payload_type: Optional[Type[types.Payload]] = None) -> Coroutine:
         """Get client profile.
 
+        Args:
+            payload_type (Optional[Type[types.Payload]]): decode the response into this payload.
+
         Returns:
             Response data.
         """
-        return self.request(Route("GET", "/profile"))
+        return self.request(Route("GET", "/profile"), payload_type=payload_type)
 
-    def get_user_profile(self, user_id: str | int) -> Coroutine:
+    def get_user_profile(
+        self, user_id: str | int, payload_type: Optional[Type[types.Payload]] = None
+    ) -> Coroutine:
         """Get a user's profile.
 
         Args:
             user_id (Union[str, int]): the id of the user.
+            payload_type (Optional[Type[types.Payload]]): decode the response into this payload.
 
         Returns:
             Response data.
         """
-        return self.request(Route("GET", "/user/{user_id}", user_id=user_id))
+        route = Route("GET", "/user/{user_id}", user_id=user_id)
+        return self.request(route, payload_type=payload_type)
 
-    def get_recs(self) -> Coroutine:
+    def get_recs(self, payload_type: Optional[Type[types.Payload]] = None) -> Coroutine:
         """Get new records.
 
+        Args:
+            payload_type (Optional[Type[types.Payload]]): decode the response into this payload.
+
         Returns:
             Response data.
         """
-        return self.request(Route("GET", "/user/recs"))
+        return self.request(Route("GET", "/user/recs"), payload_type=payload_type)
 
-    def get_recs2(self) -> Coroutine:
+    def get_recs2(self, payload_type: Optional[Type[types.Payload]] = None) -> Coroutine:
         """Get new records (version 2).
 
+        Args:
+            payload_type (Optional[Type[types.Payload]]): decode the response into this payload.
+
         Returns:
             Response data.
         """
         params: dict[str, str] = {"locale": "en"}
-        return self.request(Route("GET", "/v2/recs/core"), params=params)
+        return self.request(Route("GET", "/v2/recs/core"), params=params, payload_type=payload_type)
 
     def get_teasers(self) -> Coroutine:
         """Get teasers.
@@ -234,18 +433,24 @@ class HTTPClient:
         params: dict[str, str] = {"locale": "en"}
         return self.request(Route("PUT", "/v2/push/notifications"), params=params)
 
-    def matches(self, count: int = 60, message: int = 0) -> Coroutine:
+    def matches(
+        self,
+        count: int = 60,
+        message: int = 0,
+        payload_type: Optional[Type[types.Payload]] = None,
+    ) -> Coroutine:
         """Get matches of the client.
 
         Args:
             count (int): number of matches.
             message (int): message option 0 or 1.
+            payload_type (Optional[Type[types.Payload]]): decode the response into this payload.
 
         Returns:
             Response data.
         """
         params: dict[str, str | int] = {"locale": "en", "count": count, "message": message}
-        return self.request(Route("GET", "/v2/matches"), params=params)
+        return self.request(Route("GET", "/v2/matches"), params=params, payload_type=payload_type)
 
     def explore(self) -> Coroutine:
         """Explore information.
@@ -299,14 +504,53 @@ class HTTPClient:
         """
         return self.request(Route("POST", "/v2/fast-match/count"))
 
-    def update(self) -> Coroutine:
+    def update(self, payload_type: Optional[Type[types.Payload]] = None) -> Coroutine:
         """Get updates.
 
+        Args:
+            payload_type (Optional[Type[types.Payload]]): decode the response into this payload.
+
+        Returns:
+            Response data.
+        """
+        params: dict[str, str] = {"locale": "en"}
+        return self.request(Route("GET", "/updates"), params=params, payload_type=payload_type)
+
+    def updates_since(
+        self, last_activity_date: str = "", payload_type: Optional[Type[types.Payload]] = None
+    ) -> Coroutine:
+        """Get the activity since a cursor.
+
+        Args:
+            last_activity_date (str): the newest ``last_activity_date`` already seen,
+                empty for everything.
+            payload_type (Optional[Type[types.Payload]]): decode the response into this payload.
+
         Returns:
             Response data.
         """
         params: dict[str, str] = {"locale": "en"}
-        return self.request(Route("GET", "/updates"), params=params)
+        payload: dict[str, str] = {"last_activity_date": last_activity_date}
+        return self.request(
+            Route("POST", "/updates"), params=params, json=payload, payload_type=payload_type
+        )
+
+    def get_messages(
+        self, match_id: str, count: int = 100, payload_type: Optional[Type[types.Payload]] = None
+    ) -> Coroutine:
+        """Get the messages of a match.
+
+        Args:
+            match_id (str): the id of the match.
+            count (int): number of messages.
+            payload_type (Optional[Type[types.Payload]]): decode the response into this payload.
+
+        Returns:
+            Response data.
+        """
+        params: dict[str, str | int] = {"locale": "en", "count": count}
+        route = Route("GET", "/v2/matches/{match_id}/messages", match_id=match_id)
+        return self.request(route, params=params, payload_type=payload_type)
 
     def meta(self, lat: float, lon: float, force_fetch_resources: bool = True) -> Coroutine:
 
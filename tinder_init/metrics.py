@@ -0,0 +1,131 @@
+import logging
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, NamedTuple, Optional, Tuple
+
+log: logging.Logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = 60.0
+DEFAULT_SMOOTHING = 0.2
+
+
+class GatewayStats(NamedTuple):
+    """Snapshot of the gateway metrics.
+
+    Times are in seconds; the averages are exponentially weighted and the
+    rates are measured over the last ``window`` seconds.
+    """
+
+    state: str
+    time_in_state: float
+    state_durations: Dict[str, float]
+    latency: Optional[float]
+    latency_avg: Optional[float]
+    frames: int
+    bytes: int
+    frames_per_second: float
+    bytes_per_second: float
+    decode_time: Optional[float]
+    decode_time_avg: Optional[float]
+    reconnects: int
+
+
+def _ewma(average: Optional[float], value: float, smoothing: float) -> float:
+    return value if average is None else average + smoothing * (value - average)
+
+
+class GatewayMetrics:
+    """Collects heartbeat latency, traffic and connection state of the gateway.
+
+    Args:
+        callback (Optional[Callable[[GatewayStats], None]]): called with a
+            snapshot on every heartbeat acknowledgement and state change.
+        window (float): seconds over which frame and byte rates are measured.
+        smoothing (float): weight of the newest sample in the moving averages.
+    """
+
+    def __init__(
+        self,
+        callback: Optional[Callable[[GatewayStats], None]] = None,
+        *,
+        window: float = DEFAULT_WINDOW,
+        smoothing: float = DEFAULT_SMOOTHING,
+    ) -> None:
+        self.callback = callback
+        self.window: float = window
+        self.smoothing: float = smoothing
+        self.state: str = "closed"
+        self.state_since: float = time.monotonic()
+        self.state_durations: Dict[str, float] = {}
+        self.latency: Optional[float] = None
+        self.latency_avg: Optional[float] = None
+        self.frames: int = 0
+        self.bytes: int = 0
+        self.decode_time: Optional[float] = None
+        self.decode_time_avg: Optional[float] = None
+        self.reconnects: int = 0
+        self._recent: Deque[Tuple[float, int]] = deque()
+        self._recent_bytes: int = 0
+
+    def set_state(self, state: str) -> None:
+        """Enter a connection state: connecting, connected, backoff or closed."""
+        if state == self.state:
+            return
+        now = time.monotonic()
+        self.state_durations[self.state] = (
+            self.state_durations.get(self.state, 0.0) + now - self.state_since
+        )
+        self.state, self.state_since = state, now
+        self.emit()
+
+    def record_frame(self, size: int, decode_time: float) -> None:
+        now = time.monotonic()
+        self.frames += 1
+        self.bytes += size
+        self._recent.append((now, size))
+        self._recent_bytes += size
+        self._expire(now)
+        self.decode_time = decode_time
+        self.decode_time_avg = _ewma(self.decode_time_avg, decode_time, self.smoothing)
+
+    def record_latency(self, latency: float) -> None:
+        self.latency = latency
+        self.latency_avg = _ewma(self.latency_avg, latency, self.smoothing)
+        self.emit()
+
+    def record_reconnect(self) -> None:
+        self.reconnects += 1
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.window
+        while self._recent and self._recent[0][0] < cutoff:
+            self._recent_bytes -= self._recent.popleft()[1]
+
+    def snapshot(self) -> GatewayStats:
+        now = time.monotonic()
+        self._expire(now)
+        time_in_state = now - self.state_since
+        durations = dict(self.state_durations)
+        durations[self.state] = durations.get(self.state, 0.0) + time_in_state
+        return GatewayStats(
+            state=self.state,
+            time_in_state=time_in_state,
+            state_durations=durations,
+            latency=self.latency,
+            latency_avg=self.latency_avg,
+            frames=self.frames,
+            bytes=self.bytes,
+            frames_per_second=len(self._recent) / self.window,
+            bytes_per_second=self._recent_bytes / self.window,
+            decode_time=self.decode_time,
+            decode_time_avg=self.decode_time_avg,
+            reconnects=self.reconnects,
+        )
+
+    def emit(self) -> None:
+        if self.callback is None:
+            return
+        try:
+            self.callback(self.snapshot())
+        except Exception:
+            log.exception("Gateway metrics callback failed")
@@ -1,43 +1,141 @@
+import asyncio
 import io
 import os
-from typing import Union
+import secrets
+from typing import AsyncIterator, Iterator, Optional, Tuple, Union
 
 from collections import OrderedDict
 from tinder.errors import TinderException
+from tinder.http import ASSET_CHUNK_SIZE
 from tinder.state import ConnectionState
+from tinder.types import PhotoPayload
 
 
 class Asset:
-    __slots__ = ("_state", "url", "processed", "id")
+    __slots__ = ("_state", "url", "id", "_processed_files", "_processed")
 
     def __init__(self, state: ConnectionState, *, data=None, url=None):
         self._state: ConnectionState = state
         self.url = data["url"] if data else url
-        self.processed = OrderedDict()
-        self.id = None
+        self.id = data["id"] if data else None
+        self._processed_files = data.get("processedFiles", ()) if data else ()
+        self._processed: Optional[OrderedDict[str, Asset]] = None
 
-        if data:
-            self.id = data["id"]
-            for pf in data["processedFiles"]:
-                key = f"{pf['width']}x{pf['height']}"
-                value = Asset(state, url=pf["url"])
-                self.processed[key] = value
+    @classmethod
+    def _from_payload(cls, state: ConnectionState, photo: PhotoPayload) -> "Asset":
+        """Build an asset from a decoded photo payload.
+
+        Args:
+            state (ConnectionState): the connection state.
+            photo (PhotoPayload): the photo.
+
+        Returns:
+            The asset.
+        """
+        self = cls.__new__(cls)
+        self._state = state
+        self.url = photo.url
+        self.id = photo.id
+        self._processed_files = photo.processed_files
+        self._processed = None
+        return self
+
+    def _variants(self) -> Iterator[Tuple[int, int, str]]:
+        for pf in self._processed_files:
+            if isinstance(pf, dict):
+                yield pf["width"], pf["height"], pf["url"]
+            else:
+                yield pf.width, pf.height, pf.url
+
+    @property
+    def processed(self) -> "OrderedDict[str, Asset]":
+        """Processed variants keyed by ``"{width}x{height}"``, built on first access."""
+        if self._processed is None:
+            self._processed = OrderedDict(
+                (f"{width}x{height}", Asset(self._state, url=url))
+                for width, height, url in self._variants()
+            )
+        return self._processed
+
+    def best_size(self, width: int) -> "Asset":
+        """Pick the processed variant that best fits a target width.
+
+        The smallest variant at least ``width`` pixels wide is chosen, or the
+        widest one if none is large enough. Only that variant is built.
+
+        Args:
+            width (int): the target width in pixels.
+
+        Returns:
+            The variant, or this asset if it has no processed variants.
+        """
+        variants = list(self._variants())
+        if not variants:
+            return self
+        large_enough = [variant for variant in variants if variant[0] >= width]
+        best_width, best_height, url = min(large_enough) if large_enough else max(variants)
+        if self._processed is not None:
+            return self._processed[f"{best_width}x{best_height}"]
+        return Asset(self._state, url=url)
 
     async def read(self):
         if not self.url:
             raise TinderException("Invalid asset (no URL)")
-        return await self._state.http.get_asset(self.url)
+        return await self._state.http.get_asset(self.url, key=self.id)
+
+    async def iter_chunks(self, chunk_size: int = ASSET_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """Stream the asset content in chunks.
+
+        Args:
+            chunk_size (int): maximum chunk size in bytes.
+
+        Returns:
+            Async iterator of chunks.
+        """
+        if not self.url:
+            raise TinderException("Invalid asset (no URL)")
+        async for chunk in self._state.http.iter_asset(
+            self.url, key=self.id, chunk_size=chunk_size
+        ):
+            yield chunk
 
     async def save(self, fp: Union[str, bytes, os.PathLike, io.BytesIO], *, seek_begin=True):
-        data = await self.read()
+        """Save the asset to a buffer or a file.
+
+        A file is downloaded next to its target and only replaces it once
+        complete, so a failed download never leaves a truncated file behind.
+        File writes run in the default executor.
+
+        Args:
+            fp (Union[str, bytes, os.PathLike, io.BytesIO]): the buffer or file path.
+            seek_begin (bool): rewind the buffer after writing.
+
+        Returns:
+            The number of bytes written.
+        """
+        written = 0
         if isinstance(fp, io.BytesIO) and fp.writable():
-            wf = fp.write(data)
+            async for chunk in self.iter_chunks():
+                written += fp.write(chunk)
             if seek_begin:
                 fp.seek(0)
-            return wf
-        else:
-            with open(fp, "wb") as f:  # type: ignore
-                return f.write(data)
+            return written
+        loop = asyncio.get_running_loop()
+        path = os.fsdecode(fp)
+        tmp_path = f"{path}.{secrets.token_hex(4)}.part"
+        try:
+            f = await loop.run_in_executor(None, open, tmp_path, "xb")
+            with f:
+                async for chunk in self.iter_chunks():
+                    written += await loop.run_in_executor(None, f.write, chunk)
+            await loop.run_in_executor(None, os.replace, tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        return written
 
     def __str__(self):
         return self.url if self.url else ""
@@ -3,6 +3,7 @@ import logging
 
 from . import abc
 from ..state import ConnectionState
+from ..types import ProfilePayload, UserPayload
 from .asset import Asset
 
 log = logging.getLogger(__name__)
@@ -20,7 +21,7 @@ class BaseUser(abc.User):
 
     def _update(self, data):
         self.name: str = data["name"]
-        self.bio: str = data.get("bio", "")
+        self.bio: str = data.get("bio") or ""
         self.id: str = data["_id"]
 
     def __repr__(self):
@@ -35,8 +36,55 @@ class User(BaseUser):
         self._update(data)
 
     def _update(self, data):
-        self.distance_mi = data["distance_mi"]
-        self.photos = [Asset(self._state, data=photo) for photo in data["photos"]]
+        self.distance_mi = data.get("distance_mi")
+        self.photos = [Asset(self._state, data=photo) for photo in data.get("photos", ())]
+
+    @classmethod
+    def _from_rec(cls, state: ConnectionState, rec) -> "User":
+        """Build a user from a ``/v2/recs/core`` result.
+
+        Only the fields the model exposes are read; the rest of the payload
+        (teasers, spotify, instagram, ...) is never touched.
+
+        Args:
+            state (ConnectionState): the connection state.
+            rec (dict): an item of ``data.results``.
+
+        Returns:
+            The user.
+        """
+        data = rec["user"]
+        self = cls.__new__(cls)
+        self._state = state
+        self.id = data["_id"]
+        self.name = data["name"]
+        self.bio = data.get("bio") or ""
+        self.distance_mi = rec.get("distance_mi", data.get("distance_mi"))
+        self.photos = [Asset(state, data=photo) for photo in data.get("photos", ())]
+        return self
+
+    @classmethod
+    def _from_payload(
+        cls, state: ConnectionState, data: UserPayload, distance_mi: float | None = None
+    ) -> "User":
+        """Build a user from a decoded user payload.
+
+        Args:
+            state (ConnectionState): the connection state.
+            data (UserPayload): the user.
+            distance_mi (Optional[float]): distance given outside the user, as in v2 recs.
+
+        Returns:
+            The user.
+        """
+        self = cls.__new__(cls)
+        self._state = state
+        self.id = data.id
+        self.name = data.name
+        self.bio = data.bio or ""
+        self.distance_mi = data.distance_mi if distance_mi is None else distance_mi
+        self.photos = [Asset._from_payload(state, photo) for photo in data.photos]
+        return self
 
     async def like(self):
         log.debug(f"Liked user {self}")
@@ -63,9 +111,33 @@ class ClientUser(BaseUser):
     def _update(self, data):
         self.name = data["name"]
         self.id = data["_id"]
-        self.bio = data.get("bio", "")
+        self.bio = data.get("bio") or ""
         self.birth_date = datetime.strptime(data["birth_date"], "%Y-%m-%dT%H:%M:%S.%fZ")
         self.create_date = datetime.strptime(data["create_date"], "%Y-%m-%dT%H:%M:%S.%fZ")
         self.distance_filter = data["distance_filter"]
         self.gender = data["gender"]
         self.gender_filter = data["gender_filter"]
+
+    @classmethod
+    def _from_payload(cls, state: ConnectionState, data: ProfilePayload) -> "ClientUser":
+        """Build the client user from a decoded profile payload.
+
+        Args:
+            state (ConnectionState): the connection state.
+            data (ProfilePayload): the profile.
+
+        Returns:
+            The client user.
+        """
+        self = cls.__new__(cls)
+        self._state = state
+        self.name = data.name
+        self.id = data.id
+        self.bio = data.bio or ""
+        self.photos = [Asset._from_payload(state, photo) for photo in data.photos]
+        self.birth_date = datetime.strptime(data.birth_date, "%Y-%m-%dT%H:%M:%S.%fZ")
+        self.create_date = datetime.strptime(data.create_date, "%Y-%m-%dT%H:%M:%S.%fZ")
+        self.distance_filter = data.distance_filter
+        self.gender = data.gender
+        self.gender_filter = data.gender_filter
+        return self
@@ -0,0 +1,125 @@
+"""Minimal protobuf wire-format codec for the keepalive gateway frames.
+
+Only what the gateway uses is supported: varints, 32/64-bit fixed values and
+length-delimited fields. Messages decode to ``{field_number: value}`` dicts
+where length-delimited values are left as bytes for the caller to interpret
+as a string or a nested message.
+"""
+from typing import Dict, List, Tuple
+
+from .errors import InvalidData
+
+VARINT = 0
+FIXED64 = 1
+LENGTH_DELIMITED = 2
+FIXED32 = 5
+
+Value = int | bytes
+
+
+def read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Reads a varint.
+
+    Args:
+        data (bytes): the buffer.
+        pos (int): offset of the varint.
+
+    Returns:
+        The value and the offset following it.
+    """
+    result = shift = 0
+    try:
+        while True:
+            byte = data[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result, pos
+            shift += 7
+            if shift >= 64:
+                raise InvalidData("varint too long")
+    except IndexError:
+        raise InvalidData("truncated varint") from None
+
+
+def decode_fields(data: bytes) -> List[Tuple[int, Value]]:
+    """Decodes the top-level fields of a message in wire order, repeated ones included.
+
+    Args:
+        data (bytes): the encoded message.
+
+    Returns:
+        ``(field number, value)`` pairs.
+
+    Raises:
+        InvalidData: the message is truncated or uses an unsupported wire type.
+    """
+    fields: List[Tuple[int, Value]] = []
+    pos, end = 0, len(data)
+    while pos < end:
+        key, pos = read_varint(data, pos)
+        number, wire_type = key >> 3, key & 7
+        value: Value
+        if wire_type == VARINT:
+            value, pos = read_varint(data, pos)
+        elif wire_type == LENGTH_DELIMITED:
+            length, pos = read_varint(data, pos)
+            if pos + length > end:
+                raise InvalidData(f"field {number} overruns the message")
+            value = bytes(data[pos : pos + length])
+            pos += length
+        elif wire_type == FIXED64 or wire_type == FIXED32:
+            size = 8 if wire_type == FIXED64 else 4
+            if pos + size > end:
+                raise InvalidData(f"field {number} overruns the message")
+            value = int.from_bytes(data[pos : pos + size], "little")
+            pos += size
+        else:
+            raise InvalidData(f"unsupported wire type {wire_type} for field {number}")
+        fields.append((number, value))
+    return fields
+
+
+def decode_message(data: bytes) -> Dict[int, Value]:
+    """Decodes the top-level fields of a message, the last occurrence wins.
+
+    Args:
+        data (bytes): the encoded message.
+
+    Returns:
+        Field values keyed by field number.
+
+    Raises:
+        InvalidData: the message is truncated or uses an unsupported wire type.
+    """
+    return dict(decode_fields(data))
+
+
+def write_varint(value: int) -> bytes:
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def encode_message(fields: Dict[int, int | str | bytes]) -> bytes:
+    """Encodes a message, ints as varints and str/bytes as length-delimited fields.
+
+    Args:
+        fields (Dict[int, int | str | bytes]): values keyed by field number.
+
+    Returns:
+        The encoded message.
+    """
+    out = bytearray()
+    for number, value in fields.items():
+        if isinstance(value, int):
+            out += write_varint(number << 3 | VARINT) + write_varint(value)
+        else:
+            if isinstance(value, str):
+                value = value.encode()
+            out += write_varint(number << 3 | LENGTH_DELIMITED) + write_varint(len(value))
+            out += value
+    return bytes(out)
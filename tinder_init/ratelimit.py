@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional, Tuple
+
+log: logging.Logger = logging.getLogger(__name__)
+
+DEFAULT_RETRY_AFTER = 5.0
+MIN_RATE_FACTOR = 0.1
+
+DEFAULT_ROUTES: Dict[str, Tuple[float, int]] = {
+    "POST /like/{user_id}": (1.0, 3),
+    "POST /pass/{user_id}": (1.0, 3),
+}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header.
+
+    Args:
+        value (Optional[str]): delay in seconds or an HTTP date.
+
+    Returns:
+        Delay in seconds or None if missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class TokenBucket:
+    __slots__ = ("rate", "base_rate", "capacity", "tokens", "updated", "blocked_until")
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate: float = rate
+        self.base_rate: float = rate
+        self.capacity: int = capacity
+        self.tokens: float = float(capacity)
+        self.updated: float = time.monotonic()
+        self.blocked_until: float = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def reserve(self, now: float) -> float:
+        self._refill(now)
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+    def penalize(self, now: float, retry_after: float) -> None:
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+        self.blocked_until = max(self.blocked_until, now + retry_after)
+        self.rate = max(self.base_rate * MIN_RATE_FACTOR, self.rate / 2)
+
+    def recover(self) -> None:
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate + self.base_rate * MIN_RATE_FACTOR)
+
+
+class RateLimiter:
+    """Per-route token buckets and an optional global bucket for the HTTP client.
+
+    Routes without a bucket are not paced until the server answers 429, which
+    blocks every route for the Retry-After delay.
+
+    Args:
+        rate (Optional[float]): global requests per second, None for no global bucket.
+        burst (int): global burst size.
+        routes (Optional[Mapping[str, Tuple[float, int]]]): per-route
+            ``(rate, burst)`` keyed by :attr:`Route.bucket`.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: int = 5,
+        routes: Optional[Mapping[str, Tuple[float, int]]] = None,
+    ) -> None:
+        self.global_bucket: Optional[TokenBucket] = TokenBucket(rate, burst) if rate else None
+        self.blocked_until: float = 0.0
+        self.routes: Dict[str, Tuple[float, int]] = dict(
+            DEFAULT_ROUTES if routes is None else routes
+        )
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def _bucket(self, key: str) -> Optional[TokenBucket]:
+        bucket = self._buckets.get(key)
+        if bucket is None and key in self.routes:
+            bucket = self._buckets[key] = TokenBucket(*self.routes[key])
+        return bucket
+
+    async def acquire(self, key: str) -> None:
+        """Wait until a request on the given route may be sent.
+
+        Args:
+            key (str): the route bucket.
+        """
+        now = time.monotonic()
+        wait = max(0.0, self.blocked_until - now)
+        if self.global_bucket is not None:
+            wait = max(wait, self.global_bucket.reserve(now))
+        bucket = self._bucket(key)
+        if bucket is not None:
+            wait = max(wait, bucket.reserve(now))
+        if wait > 0:
+            log.debug(f"Rate limited {key}: waiting {wait:.2f}s")
+            await asyncio.sleep(wait)
+
+    def update(self, key: str, status: int, headers: Mapping[str, str]) -> Optional[float]:
+        """Adapt the buckets to a response.
+
+        Args:
+            key (str): the route bucket.
+            status (int): response status.
+            headers (Mapping[str, str]): response headers.
+
+        Returns:
+            Retry delay in seconds for a 429 response, otherwise None.
+        """
+        bucket = self._bucket(key)
+        if status != 429:
+            if self.global_bucket is not None:
+                self.global_bucket.recover()
+            if bucket is not None:
+                bucket.recover()
+            return None
+
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        if retry_after is None:
+            retry_after = DEFAULT_RETRY_AFTER
+        now = time.monotonic()
+        self.blocked_until = max(self.blocked_until, now + retry_after)
+        if self.global_bucket is not None:
+            self.global_bucket.penalize(now, retry_after)
+        if bucket is not None:
+            bucket.penalize(now, retry_after)
+        log.warning(f"Rate limited on {key}, retry after {retry_after:.1f}s")
+        return retry_after
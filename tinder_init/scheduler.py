@@ -0,0 +1,134 @@
+import asyncio
+import logging
+from typing import Optional, Set
+
+import aiohttp
+
+from .errors import HTTPException, InvalidData
+from .types import MessagesPayload, UpdatesPayload
+
+log: logging.Logger = logging.getLogger(__name__)
+
+FETCH_ERRORS = (HTTPException, InvalidData, aiohttp.ClientError, asyncio.TimeoutError)
+
+
+class FetchScheduler:
+    """Turns gateway notifications into targeted fetches.
+
+    A ``match`` notification schedules an ``/updates`` delta from the last
+    seen ``last_activity_date`` and a ``message`` notification schedules a
+    fetch of that match's messages. A raw ``frame``, dispatched while typed
+    gateway events are disabled, schedules an ``/updates`` delta. Notifications arriving within
+    ``debounce`` seconds are coalesced, and a pending ``/updates`` delta
+    covers the messages of every match. Without notifications an
+    ``/updates`` delta is still fetched every ``poll_interval`` seconds as
+    a safety net.
+
+    Without a ``cursor`` to resume from, the first ``/updates`` call is made
+    as soon as the scheduler starts, so the full history is fetched once up
+    front and every later call is a delta.
+
+    Results are dispatched as ``updates`` (:class:`~tinder.types.UpdatesPayload`)
+    and ``messages`` (match id, list of :class:`~tinder.types.MessagePayload`).
+
+    Args:
+        client (Client): the client.
+        debounce (float): seconds to wait for more notifications before fetching.
+        poll_interval (Optional[float]): safety net polling interval, None to disable.
+        cursor (str): ``last_activity_date`` to resume from, such as one persisted
+            from :attr:`cursor` by a previous run.
+    """
+
+    def __init__(
+        self,
+        client,
+        *,
+        debounce: float = 0.2,
+        poll_interval: Optional[float] = 300.0,
+        cursor: str = "",
+    ) -> None:
+        self.client = client
+        self.debounce: float = debounce
+        self.poll_interval: Optional[float] = poll_interval
+        self.cursor: str = cursor
+        self._updates_due: bool = False
+        self._message_matches: Set[str] = set()
+        self._wake: asyncio.Event = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def on_match(self, event) -> None:
+        self.request_updates()
+
+    def on_message(self, event) -> None:
+        self.request_messages(event.match_id)
+
+    def on_frame(self, data: bytes) -> None:
+        self.request_updates()
+
+    def request_updates(self) -> None:
+        """Schedule an ``/updates`` delta."""
+        self._updates_due = True
+        self._wake.set()
+
+    def request_messages(self, match_id: str) -> None:
+        """Schedule a fetch of a match's messages."""
+        self._message_matches.add(match_id)
+        self._wake.set()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = self.client.loop.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self) -> None:
+        if not self.cursor:
+            self.request_updates()
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                self._updates_due = True
+            await asyncio.sleep(self.debounce)
+            self._wake.clear()
+            updates_due, self._updates_due = self._updates_due, False
+            matches, self._message_matches = self._message_matches, set()
+            try:
+                if updates_due:
+                    await self.fetch_updates()
+                elif matches:
+                    await asyncio.gather(*(self.fetch_messages(match_id) for match_id in matches))
+            except Exception:
+                log.exception("Fetch scheduler failed, retrying on the next notification or poll")
+                self._updates_due = self._updates_due or updates_due
+                self._message_matches |= matches
+
+    async def fetch_updates(self) -> Optional[UpdatesPayload]:
+        """Fetch and dispatch the ``/updates`` delta since the cursor."""
+        try:
+            updates = await self.client.http.updates_since(self.cursor, payload_type=UpdatesPayload)
+        except FETCH_ERRORS as exc:
+            log.warning(f"Fetching updates failed ({exc}), retrying on the next poll")
+            return None
+        self.cursor = max(self.cursor, updates.last_activity_date or "")
+        log.debug(f"Fetched {len(updates.matches)} updated matches")
+        self.client.dispatch("updates", updates)
+        return updates
+
+    async def fetch_messages(self, match_id: str) -> None:
+        """Fetch and dispatch the messages of a match."""
+        try:
+            page = await self.client.http.get_messages(match_id, payload_type=MessagesPayload)
+        except FETCH_ERRORS as exc:
+            log.warning(f"Fetching messages of {match_id} failed ({exc}), requesting updates")
+            self.request_updates()
+            return
+        messages = page.data.messages if page.data is not None else []
+        self.client.dispatch("messages", match_id, messages)
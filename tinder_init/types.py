@@ -1,5 +1,351 @@
-from typing import TypedDict
+"""Typed payloads of the Tinder API.
 
-# TODO: Payload
-class UserPayload(TypedDict):
-    ...
+With msgspec installed (``pip install tinder.py[msgspec]``) the payloads are
+``msgspec.Struct`` types and are decoded straight from the response bytes:
+fields that are not declared are skipped by the parser and no intermediate
+dict tree is built, so :class:`~tinder.Client` decodes profiles and
+recommendations through them. Otherwise they are slotted dataclasses built
+on top of the decoded JSON, which costs more than the dicts alone; the client
+then keeps the dict path and only uses them for the small ``/updates`` and
+messages payloads of the fetch scheduler. Either way a payload that does not
+match its schema raises :class:`~tinder.errors.InvalidData`.
+"""
+import dataclasses
+import types
+from typing import Any, Callable, Dict, Type, TypeVar, Union, get_args, get_origin, get_type_hints
+
+from . import codec
+from .errors import InvalidData
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+HAS_MSGSPEC: bool = msgspec is not None
+
+P = TypeVar("P", bound="Payload")
+
+if msgspec is not None:
+
+    class Payload(msgspec.Struct):
+        """Base of the typed payloads."""
+
+    def payload(cls):
+        return cls
+
+    def _list():
+        return msgspec.field(default_factory=list)
+
+else:
+
+    class Payload:  # type: ignore[no-redef]
+        """Base of the typed payloads."""
+
+        __slots__ = ()
+        __rename__: Dict[str, str] = {}
+
+        def __init_subclass__(cls, rename: Dict[str, str] | None = None, **kwargs) -> None:
+            super().__init_subclass__(**kwargs)
+            if rename is not None:
+                cls.__rename__ = rename
+
+    payload = dataclasses.dataclass(slots=True)
+
+    def _list():
+        return dataclasses.field(default_factory=list)
+
+
+@payload
+class ProcessedFilePayload(Payload):
+    url: str
+    width: int
+    height: int
+
+
+@payload
+class PhotoPayload(Payload, rename={"processed_files": "processedFiles"}):
+    id: str
+    url: str
+    processed_files: list[ProcessedFilePayload] = _list()
+
+
+@payload
+class UserPayload(Payload, rename={"id": "_id"}):
+    id: str
+    name: str
+    bio: str | None = None
+    birth_date: str | None = None
+    gender: int | None = None
+    distance_mi: int | float | None = None
+    photos: list[PhotoPayload] = _list()
+
+
+@payload
+class ProfilePayload(Payload, rename={"id": "_id"}):
+    id: str
+    name: str
+    birth_date: str
+    create_date: str
+    distance_filter: int
+    gender: int
+    gender_filter: int
+    bio: str | None = None
+    photos: list[PhotoPayload] = _list()
+
+
+@payload
+class MessagePayload(Payload, rename={"id": "_id", "sender": "from"}):
+    id: str
+    match_id: str
+    message: str = ""
+    sent_date: str | None = None
+    sender: str | None = None
+    to: str | None = None
+
+
+@payload
+class MatchPayload(Payload, rename={"id": "_id"}):
+    id: str
+    person: UserPayload | None = None
+    messages: list[MessagePayload] = _list()
+    message_count: int = 0
+    last_activity_date: str | None = None
+
+
+@payload
+class SuperLikesPayload(Payload):
+    remaining: int = 0
+
+
+@payload
+class RatingPayload(Payload):
+    likes_remaining: int = 0
+    super_likes: SuperLikesPayload | None = None
+
+
+@payload
+class MetaPayload(Payload):
+    rating: RatingPayload | None = None
+
+
+# Response envelopes
+
+
+@payload
+class RecPayload(Payload):
+    user: UserPayload | None = None
+    distance_mi: int | float | None = None
+
+
+@payload
+class RecsDataPayload(Payload):
+    results: list[RecPayload] = _list()
+
+
+@payload
+class RecsPayload(Payload):
+    """``GET /v2/recs/core``"""
+
+    data: RecsDataPayload | None = None
+
+
+@payload
+class UserRecsPayload(Payload):
+    """``GET /user/recs``"""
+
+    results: list[UserPayload] = _list()
+
+
+@payload
+class UserResultPayload(Payload):
+    """``GET /user/{user_id}``"""
+
+    results: UserPayload
+
+
+@payload
+class MatchesDataPayload(Payload):
+    matches: list[MatchPayload] = _list()
+
+
+@payload
+class MatchesPayload(Payload):
+    """``GET /v2/matches``"""
+
+    data: MatchesDataPayload | None = None
+
+
+@payload
+class MessagesDataPayload(Payload):
+    messages: list[MessagePayload] = _list()
+
+
+@payload
+class MessagesPayload(Payload):
+    """``GET /v2/matches/{match_id}/messages``"""
+
+    data: MessagesDataPayload | None = None
+
+
+@payload
+class UpdatesPayload(Payload):
+    """``GET /updates``"""
+
+    matches: list[MatchPayload] = _list()
+    blocks: list[str] = _list()
+    last_activity_date: str | None = None
+
+
+def decode(payload_type: Type[P], data: bytes | str) -> P:
+    """Decodes a JSON document into a payload.
+
+    Args:
+        payload_type (Type[Payload]): the payload type.
+        data (bytes | str): the JSON document.
+
+    Returns:
+        The payload.
+
+    Raises:
+        InvalidData: the document is not valid JSON or does not match the payload.
+    """
+    if msgspec is not None:
+        try:
+            decoder = _decoders[payload_type]
+        except KeyError:
+            decoder = _decoders[payload_type] = msgspec.json.Decoder(payload_type)
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as exc:
+            raise InvalidData(f"invalid {payload_type.__name__}: {exc}") from exc
+    try:
+        obj = codec.loads(data)
+    except ValueError as exc:
+        raise InvalidData(f"invalid {payload_type.__name__}: {exc}") from exc
+    return convert(payload_type, obj)
+
+
+def convert(payload_type: Type[P], obj: Any) -> P:
+    """Builds a payload from already decoded JSON.
+
+    Args:
+        payload_type (Type[Payload]): the payload type.
+        obj (Any): the decoded JSON.
+
+    Returns:
+        The payload.
+
+    Raises:
+        InvalidData: the data does not match the payload.
+    """
+    if msgspec is not None:
+        try:
+            return msgspec.convert(obj, payload_type)
+        except msgspec.ValidationError as exc:
+            raise InvalidData(f"invalid {payload_type.__name__}: {exc}") from exc
+    try:
+        return _converter(payload_type)(obj)
+    except _Mismatch as exc:
+        path = "$" + "".join(reversed(exc.path))
+        raise InvalidData(f"invalid {payload_type.__name__}: {exc} at {path}") from None
+
+
+_decoders: Dict[type, Any] = {}
+_converters: Dict[Any, Callable[[Any], Any]] = {}
+
+
+class _Mismatch(Exception):
+    """Raised by the fallback converters, the path is collected while unwinding."""
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+        self.path: list[str] = []
+
+
+def _converter(tp: Any) -> Callable[[Any], Any]:
+    """Converter of the decoded JSON of a fallback payload, built once per type."""
+    try:
+        return _converters[tp]
+    except KeyError:
+        pass
+    if isinstance(tp, type) and issubclass(tp, Payload):
+        conv = _payload_converter(tp)
+    elif get_origin(tp) is list:
+        conv = _list_converter(_converter(get_args(tp)[0]))
+    elif get_origin(tp) is Union or get_origin(tp) is types.UnionType:
+        members = [arg for arg in get_args(tp) if arg is not type(None)]
+        if all(member in (str, int, float, bool) for member in members):
+            conv = _scalar_converter(*members, nullable=len(members) < len(get_args(tp)))
+        else:
+            (inner,) = members
+            conv = _optional_converter(_converter(inner))
+    else:
+        conv = _scalar_converter(tp)
+    _converters[tp] = conv
+    return conv
+
+
+def _payload_converter(tp: type) -> Callable[[Any], Any]:
+    hints = get_type_hints(tp)
+    fields = [
+        (f.name, tp.__rename__.get(f.name, f.name), _converter(hints[f.name]), f)
+        for f in dataclasses.fields(tp)
+    ]
+
+    def conv(obj: Any) -> Any:
+        if type(obj) is not dict:
+            raise _Mismatch(f"expected object, got {type(obj).__name__}")
+        kwargs = {}
+        for name, key, field_conv, f in fields:
+            try:
+                value = obj[key]
+            except KeyError:
+                if f.default is dataclasses.MISSING and f.default_factory is dataclasses.MISSING:
+                    raise _Mismatch(f"missing required field {key!r}") from None
+                continue
+            try:
+                kwargs[name] = field_conv(value)
+            except _Mismatch as exc:
+                exc.path.append(f".{key}")
+                raise
+        return tp(**kwargs)
+
+    return conv
+
+
+def _list_converter(item_conv: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def conv(obj: Any) -> Any:
+        if type(obj) is not list:
+            raise _Mismatch(f"expected array, got {type(obj).__name__}")
+        result: list[Any] = []
+        append = result.append
+        try:
+            for item in obj:
+                append(item_conv(item))
+        except _Mismatch as exc:
+            exc.path.append(f"[{len(result)}]")
+            raise
+        return result
+
+    return conv
+
+
+def _optional_converter(inner_conv: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def conv(obj: Any) -> Any:
+        return None if obj is None else inner_conv(obj)
+
+    return conv
+
+
+def _scalar_converter(*accepted: type, nullable: bool = False) -> Callable[[Any], Any]:
+    expected = " | ".join(tp.__name__ for tp in accepted) + (" | null" if nullable else "")
+    if float in accepted:
+        accepted += (int,)
+
+    def conv(obj: Any) -> Any:
+        if type(obj) not in accepted and not (nullable and obj is None):
+            raise _Mismatch(f"expected {expected}, got {type(obj).__name__}")
+        return obj
+
+    return conv